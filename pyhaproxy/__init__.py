@@ -1,2 +1,4 @@
 #!/bin/env python
 # -*- coding: utf8 -*-
+
+__version__ = '0.3.7'
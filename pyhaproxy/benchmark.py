@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmarks of parsing big haproxy config files
+
+Run all of them, or only the named ones:
+    $ python -m pyhaproxy.benchmark [memo engines index lazy workers profile
+                                     import memory]
+
+The `import` one exits with an error when importing pyhaproxy.parse takes
+longer than IMPORT_TIME_BUDGET, which CI checks.
+"""
+from __future__ import print_function
+
+import subprocess
+import sys
+import time
+
+import pyhaproxy.parse as parse
+import pyhaproxy.pegnode as pegnode
+
+
+# the budget of `import pyhaproxy.parse` in a new interpreter, in seconds.
+# The short-lived commands which load a cached configuration pay for it
+IMPORT_TIME_BUDGET = 0.1
+
+
+def generate_config(backends=100, servers=50):
+    """Generate a config like the ones of a big fleet, most of the lines are
+    `server` lines of the backends
+
+    Returns:
+        str: the content of haproxy config file
+    """
+    lines = [
+        'global',
+        '    maxconn 4096',
+        '    daemon',
+        '',
+        'defaults',
+        '    mode http',
+        '    option httplog',
+        '    timeout connect 5000',
+        '',
+        'frontend www *:80',
+        '    acl is_api hdr(host) -i api.example.com',
+        '    use_backend backend0 if is_api',
+        '    default_backend backend1',
+        '',
+    ]
+    for backend_index in range(backends):
+        lines.extend([
+            'backend backend%d' % backend_index,
+            '    mode http',
+            '    option forwardfor  # keep the client address',
+            '    timeout server 30000',
+        ])
+        for server_index in range(servers):
+            lines.append(
+                '    server server%d 10.%d.%d.%d:80 '
+                'check inter 2000 rise 2 fall 3 maxconn 1024' % (
+                    server_index, backend_index // 250, backend_index % 250,
+                    server_index % 250))
+        lines.append('')
+    return '\n'.join(lines) + '\n'
+
+
+def measure(func, *args, **kwargs):
+    """Returns:
+        (float, int): the seconds taken by `func` and the peak of memory
+            allocated while it runs, in bytes
+    """
+    # Python 3.4+, imported here so the other benchmarks run without it
+    import tracemalloc
+
+    start = time.time()
+    func(*args, **kwargs)
+    elapsed = time.time() - start
+
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def bench_memo(filestring):
+    """Peak memory of the PEG parse with each memo policy"""
+    results = {}
+    for memo in pegnode.MEMO_POLICIES:
+        results[memo] = measure(pegnode.parse, filestring, memo=memo)
+    for memo in pegnode.MEMO_POLICIES:
+        elapsed, peak = results[memo]
+        print('memo=%-10s %7.3fs  peak %7.1f MB  (%.0f%% of memo=all)' % (
+            memo, elapsed, peak / 1024.0 / 1024,
+            100.0 * peak / results['all'][1]))
+
+
+def bench_engines(filestring):
+    """Time and peak memory of Parser.build_configuration with each engine
+    """
+    parser = parse.Parser(filestring=filestring)
+    for engine in ('peg', 'actions', 'fast'):
+        elapsed, peak = measure(parser.build_configuration, engine=engine)
+        print('engine=%-8s %7.3fs  peak %7.1f MB' % (
+            engine, elapsed, peak / 1024.0 / 1024))
+
+
+def bench_index(filestring):
+    """Time of Parser.section_index against a full parse"""
+    elapsed, _ = measure(parse.Parser(filestring=filestring).section_index)
+    print('section_index           %7.3fs' % elapsed)
+    elapsed, _ = measure(
+        parse.Parser(filestring=filestring).build_configuration)
+    print('build_configuration     %7.3fs' % elapsed)
+
+
+def bench_lazy(filestring):
+    """Time to read the servers of one backend, with and without lazy"""
+    for lazy in (False, True):
+        elapsed, peak = measure(lambda: parse.Parser(
+            filestring=filestring).build_configuration(
+                lazy=lazy).backend('backend50').servers())
+        print('lazy=%-5s %7.3fs  peak %7.1f MB' % (
+            lazy, elapsed, peak / 1024.0 / 1024))
+
+
+def bench_workers(filestring):
+    """Time of Parser.build_configuration in 1 to 4 processes"""
+    parser = parse.Parser(filestring=filestring)
+    for workers in (1, 2, 4):
+        start = time.time()
+        parser.build_configuration(workers=workers)
+        print('workers=%d %7.3fs' % (workers, time.time() - start))
+
+
+def bench_profile(filestring):
+    """Calls, memo cache hits and misses, failures, time and nodes of each
+    rule of the PEG parse, the slowest rules first
+    """
+    _, report = pegnode.parse(filestring, profile=True)
+    print('%-18s %8s %8s %8s %8s %8s %8s' % (
+        'rule', 'calls', 'hits', 'misses', 'failures', 'time', 'nodes'))
+    for rule, stats in sorted(report.items(),
+                              key=lambda item: -item[1]['time']):
+        print('%-18s %8d %8d %8d %8d %7.3fs %8d' % (
+            rule, stats['calls'], stats['hits'], stats['misses'],
+            stats['failures'], stats['time'], stats['nodes']))
+
+
+def import_times(module='pyhaproxy.parse', runs=5):
+    """Import `module` in new interpreters with `python -X importtime`, or
+    before Python 3.7, which has no `-X importtime`, time the import of
+    `module` alone
+
+    Returns:
+        {str: float}: the least seconds taken to import each module of
+            pyhaproxy, with the modules they import first
+    """
+    results = {}
+    for _ in range(runs):
+        if sys.version_info < (3, 7):
+            seconds = float(subprocess.check_output([
+                sys.executable, '-c',
+                'import time\n'
+                'start = time.time()\n'
+                'import %s\n'
+                'print(time.time() - start)\n' % module]))
+            results[module] = min(results.get(module, seconds), seconds)
+            continue
+        output = subprocess.check_output(
+            [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+            stderr=subprocess.STDOUT, universal_newlines=True)
+        # import time: self [us] | cumulative | imported package
+        for line in output.splitlines():
+            fields = line.split('|')
+            if len(fields) != 3 or not fields[2].strip().startswith(
+                    'pyhaproxy'):
+                continue
+            name = fields[2].strip()
+            seconds = int(fields[1]) / 1000000.0
+            results[name] = min(results.get(name, seconds), seconds)
+    return results
+
+
+def bench_import(filestring):
+    """Time of `import pyhaproxy.parse`, against IMPORT_TIME_BUDGET"""
+    results = import_times()
+    for name, seconds in sorted(results.items(), key=lambda item: item[1]):
+        print('%-20s %7.3fs' % (name, seconds))
+    if results['pyhaproxy.parse'] > IMPORT_TIME_BUDGET:
+        sys.exit('import pyhaproxy.parse took %.3fs, over the budget of '
+                 '%.3fs' % (results['pyhaproxy.parse'], IMPORT_TIME_BUDGET))
+
+
+def bench_memory(filestring):
+    """Memory held by the built configuration, per `server` line"""
+    import tracemalloc
+
+    server_count = len([
+        line for line in filestring.splitlines()
+        if line.strip().startswith('server ')])
+    parser = parse.Parser(filestring=filestring)
+    for engine in ('peg', 'fast'):
+        tracemalloc.start()
+        configuration = parser.build_configuration(engine=engine)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        servers = [server for backend in configuration.backends
+                   for server in backend.servers()]
+        tracemalloc.start()
+        server = parse.config.Server(
+            servers[0].name, servers[0].host, servers[0].port,
+            servers[0].attributes)
+        server_size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print('engine=%-5s %7.1f MB  %5d bytes per server line, %4d bytes '
+              'per Server object' % (
+                  engine, size / 1024.0 / 1024, size // server_count,
+                  server_size))
+        del configuration, servers, server
+
+
+BENCHMARKS = [
+    ('memo', bench_memo),
+    ('engines', bench_engines),
+    ('index', bench_index),
+    ('lazy', bench_lazy),
+    ('workers', bench_workers),
+    ('profile', bench_profile),
+    ('import', bench_import),
+    ('memory', bench_memory),
+]
+
+
+def main(argv):
+    names = argv or [name for name, _ in BENCHMARKS]
+    filestring = generate_config()
+    print('config: %d lines, %d bytes' % (
+        filestring.count('\n'), len(filestring)))
+    for name, bench in BENCHMARKS:
+        if name in names:
+            print('\n[%s]' % name)
+            bench(filestring)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""On-disk cache of the built config objects
+
+Each entry is a pickled `config.Configuration`, keyed by the hash of the
+config file content, the library version, the sources of the grammar, the
+Python version and the pickle protocol, so an entry is never used by
+another version of the parser or of Python.
+
+The entries are unpickled, which can run any code, so the cache directory
+must not be writable by other users.
+"""
+import hashlib
+import os
+import pickle
+import sys
+
+import pyhaproxy
+
+
+# the default size limit of the cache directory, in bytes
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+
+CACHE_FILE_SUFFIX = '.pickle'
+
+# the files which tell how the config objects are built from the text
+GRAMMAR_FILES = ('haproxy.peg', 'pegnode.py', 'parse.py', 'config.py')
+
+_grammar_digest = None
+
+
+def grammar_digest():
+    """Hash the sources of the grammar and the config objects, once per
+    process
+    """
+    global _grammar_digest
+    if _grammar_digest is None:
+        digest = hashlib.sha1(pyhaproxy.__version__.encode('utf-8'))
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        for filename in GRAMMAR_FILES:
+            filepath = os.path.join(package_dir, filename)
+            if os.path.exists(filepath):
+                with open(filepath, 'rb') as f:
+                    digest.update(f.read())
+        _grammar_digest = digest.hexdigest()
+    return _grammar_digest
+
+
+class ParseCache(object):
+    """A directory of pickled configurations, the least recently used ones
+    are removed when it grows over `max_size`
+
+    Attributes:
+        cache_dir (str): the directory of the cache files, it's created on
+            first store. It must not be writable by other users, the files
+            in it are unpickled
+        max_size (int): the size limit of the cache files, in bytes
+    """
+    def __init__(self, cache_dir, max_size=DEFAULT_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    def key(self, filestring, engine, builders=''):
+        """
+        Args:
+            filestring (str or bytes-like): the content of the config file
+            engine (str): the engine building the configuration
+            builders (str): tells apart the parsers which build other
+                config objects, eg: with registered line builders
+
+        Returns:
+            str: the key of the configuration built from `filestring`
+        """
+        digest = hashlib.sha1(grammar_digest().encode('utf-8'))
+        digest.update(engine.encode('utf-8'))
+        digest.update(builders.encode('utf-8'))
+        digest.update(('%d.%d:%d' % (
+            sys.version_info[:2] + (pickle.HIGHEST_PROTOCOL,))).encode(
+                'utf-8'))
+        if isinstance(filestring, type(u'')):
+            filestring = filestring.encode('utf-8')
+        digest.update(filestring)
+        return digest.hexdigest()
+
+    def load(self, key):
+        """Returns:
+            config.Configuration: the cached one, or None when it's missing
+                or can't be read
+        """
+        filepath = self.__filepath(key)
+        try:
+            with open(filepath, 'rb') as f:
+                configuration = pickle.load(f)
+        except Exception:
+            # a missing, truncated or stale entry is a miss, unpickling it
+            # can raise about anything
+            return None
+        # mark the entry as recently used, for the eviction
+        try:
+            os.utime(filepath, None)
+        except OSError:
+            pass
+        return configuration
+
+    def store(self, key, configuration):
+        """Write `configuration` to the cache, then evict the least recently
+        used entries over `max_size`
+        """
+        # imported here, the processes which only load from the cache don't
+        # pay for it
+        import tempfile
+
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        # write to a temporary file first, so a reader never sees half of it
+        fd, temp_filepath = tempfile.mkstemp(dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(configuration, f, pickle.HIGHEST_PROTOCOL)
+            os.rename(temp_filepath, self.__filepath(key))
+        except Exception:
+            os.remove(temp_filepath)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in
+        `max_size`
+        """
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith(CACHE_FILE_SUFFIX):
+                continue
+            filepath = os.path.join(self.cache_dir, filename)
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filepath))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, filepath in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(filepath)
+            except OSError:
+                continue
+            total_size -= size
+
+    def __filepath(self, key):
+        return os.path.join(self.cache_dir, key + CACHE_FILE_SUFFIX)
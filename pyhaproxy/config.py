@@ -1,20 +1,100 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import collections
+import copy
+import itertools
+import operator
+
+try:
+    from collections.abc import MutableSequence
+except ImportError:
+    # Python 2
+    from collections import MutableSequence
+try:
+    from sys import intern
+except ImportError:
+    # Python 2, where it's a builtin
+    pass
+
+
+# the most attribute tuples kept for sharing between servers, the table is
+# emptied when it's full, so configs of unique attributes don't grow it
+MAX_SHARED_ATTRIBUTES = 4096
+
+_shared_attributes = {}
+
+
+def intern_text(text):
+    """Returns:
+        str: the interned `text`, the equal texts of the config lines are
+            then one object
+    """
+    if type(text) is str:
+        return intern(text)
+    return text
+
+
+def share_attributes(attributes, keep=True):
+    """
+    Args:
+        attributes (iterable): the attributes of a server
+        keep (bool): keep the tuple for the next servers, when there's no
+            equal one yet. It's False for a change of a server, whose
+            attributes are only shared when they're equal to kept ones
+
+    Returns:
+        tuple: the stripped and interned `attributes`, which is the same
+            tuple for the servers with equal attributes
+    """
+    attributes = tuple(attributes)
+    # the table holds the tuples as given too, which are mostly stripped
+    # already, so the lookup is all it takes
+    shared = _shared_attributes.get(attributes)
+    if shared is None:
+        stripped = tuple(intern_text(attr.strip()) for attr in attributes)
+        shared = _shared_attributes.get(stripped)
+        if not keep:
+            return stripped if shared is None else shared
+        if shared is None:
+            if len(_shared_attributes) >= MAX_SHARED_ATTRIBUTES:
+                _shared_attributes.clear()
+            shared = _shared_attributes[stripped] = stripped
+        _shared_attributes[attributes] = shared
+    return shared
 
 
 class Configuration(object):
     """Represents a whole haproxy config file
 
+    The sections are looked up by name through indexes, which are built on
+    first lookup. Add, remove and rename the sections with the `add_*` and
+    `remove_*` methods and the `name` attribute, which keep the indexes up
+    to date. The section lists count their changes, so a list changed in
+    place is indexed again on next lookup.
+
     Attributes:
 
     """
     def __init__(self):
-        self.__defaults = []
-        self.__backends = []
-        self.__frontends = []
-        self.__listens = []
-        self.__userlists = []
+        self.__defaults = SectionList()
+        self.__backends = SectionList()
+        self.__frontends = SectionList()
+        self.__listens = SectionList()
+        self.__userlists = SectionList()
         self.__globall = None
+        self.__section_lists = {
+            Defaults: self.__defaults,
+            Backend: self.__backends,
+            Frontend: self.__frontends,
+            Listen: self.__listens,
+            Userlist: self.__userlists,
+        }
+        # {section type: {name: [section, ...]}}, the sections of each name
+        # in the order of the list, None until the first lookup
+        self.__indexes = {}
+        # {section type: sections._changes} when the index was last updated,
+        # so the lists changed in place are indexed again
+        self.__indexed_changes = {}
 
     @property
     def globall(self):
@@ -29,59 +109,504 @@ class Configuration(object):
         return self.__userlists
 
     def userlist(self, name):
-        for userlist in self.__userlists:
-            if userlist.name == name:
-                return userlist
+        return self.__find_section(Userlist, name)
+
+    def add_userlist(self, userlist):
+        self.__add_section(userlist, Userlist)
+
+    def remove_userlist(self, name):
+        self.__remove_section(Userlist, name)
 
     @property
     def listens(self):
         return self.__listens
 
     def listen(self, name):
-        for listen in self.__listens:
-            if listen.name == name:
-                return listen
+        return self.__find_section(Listen, name)
+
+    def add_listen(self, listen):
+        self.__add_section(listen, Listen)
+
+    def remove_listen(self, name):
+        self.__remove_section(Listen, name)
 
     @property
     def defaults(self):
         return self.__defaults
 
     def default(self, name):
-        for default in self.__defaults:
-            if default.name == name:
-                return default
+        return self.__find_section(Defaults, name)
+
+    def add_default(self, default):
+        self.__add_section(default, Defaults)
+
+    def remove_default(self, name):
+        self.__remove_section(Defaults, name)
 
     @property
     def backends(self):
         return self.__backends
 
     def backend(self, name):
-        for backend in self.__backends:
-            if backend.name == name:
-                return backend
+        return self.__find_section(Backend, name)
+
+    def add_backend(self, backend):
+        self.__add_section(backend, Backend)
+
+    def remove_backend(self, name):
+        self.__remove_section(Backend, name)
 
     @property
     def frontends(self):
         return self.__frontends
 
     def frontend(self, name):
-        for frontend in self.__frontends:
-            if frontend.name == name:
-                return frontend
+        return self.__find_section(Frontend, name)
+
+    def add_frontend(self, frontend):
+        self.__add_section(frontend, Frontend)
+
+    def remove_frontend(self, name):
+        self.__remove_section(Frontend, name)
+
+    def reindex(self):
+        """Index the sections again on next lookup"""
+        self.__indexes.clear()
+
+    def __fresh_index(self, section_type):
+        """Returns:
+            {str: [section, ...]}: the index of the sections of
+                `section_type`, None when it's missing or stale
+        """
+        index = self.__indexes.get(section_type)
+        if (index is not None and self.__indexed_changes[section_type] ==
+                self.__section_lists[section_type]._changes):
+            return index
+
+    def __index(self, section_type):
+        """Returns:
+            {str: [section, ...]}: the index of the sections of
+                `section_type`, built again when it's missing or stale
+        """
+        index = self.__fresh_index(section_type)
+        if index is None:
+            sections = self.__section_lists[section_type]
+            index = {}
+            for section in sections:
+                index.setdefault(section.name, []).append(section)
+                section._configuration = self
+            self.__indexes[section_type] = index
+            self.__indexed_changes[section_type] = sections._changes
+        return index
+
+    def __find_section(self, section_type, name):
+        named_sections = self.__index(section_type).get(name)
+        if named_sections:
+            return named_sections[0]
+
+    def __add_section(self, section, section_type):
+        if not isinstance(section, section_type):
+            raise Exception('config.%s is only supported' % section_type)
+        sections = self.__section_lists[section_type]
+        index = self.__fresh_index(section_type)
+        sections.append(section)
+        section._configuration = self
+        if index is not None:
+            index.setdefault(section.name, []).append(section)
+            self.__indexed_changes[section_type] = sections._changes
+
+    def __remove_section(self, section_type, name):
+        index = self.__index(section_type)
+        named_sections = index.get(name)
+        if not named_sections:
+            return
+        section = named_sections.pop(0)
+        if not named_sections:
+            del index[name]
+        sections = self.__section_lists[section_type]
+        sections.remove(section)
+        self.__indexed_changes[section_type] = sections._changes
+        section._configuration = None
+
+    def _rename_section(self, section, old_name):
+        """Move `section` in its index from `old_name` to its new name, it's
+        called by the section on renaming
+        """
+        section_type = self.__section_type(section)
+        index = self.__fresh_index(section_type)
+        if index is None:
+            return
+        named_sections = index.get(old_name, [])
+        if section not in named_sections:
+            # it's not in this configuration any more
+            return
+        named_sections.remove(section)
+        if not named_sections:
+            del index[old_name]
+        if section.name in index:
+            # keep the sections of the same name in the order of the list
+            self.__indexes[section_type] = None
+        else:
+            index[section.name] = [section]
+
+    def __section_type(self, section):
+        for section_type in self.__section_lists:
+            if isinstance(section, section_type):
+                return section_type
+
+
+class SectionList(list):
+    """The sections of a type in a configuration, a list which counts its
+    changes, so the configuration indexes it again by name after it's
+    changed in place, eg: sections[2:4] = new_sections
+    """
+    __slots__ = ('_changes',)
+
+    def __init__(self, sections=(), changes=0):
+        super(SectionList, self).__init__(sections)
+        self._changes = changes
+
+    def __changing(method):
+        """Wrap the list `method`, the change is counted"""
+        def change(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            self._changes += 1
+            return result
+        return change
+
+    __setitem__ = __changing(list.__setitem__)
+    __delitem__ = __changing(list.__delitem__)
+    __iadd__ = __changing(list.__iadd__)
+    __imul__ = __changing(list.__imul__)
+    append = __changing(list.append)
+    extend = __changing(list.extend)
+    insert = __changing(list.insert)
+    pop = __changing(list.pop)
+    remove = __changing(list.remove)
+    reverse = __changing(list.reverse)
+    sort = __changing(list.sort)
+    del __changing
+
+    def clear(self):
+        del self[:]
+
+    # Python 2 calls them for the slices without step
+    def __setslice__(self, start, stop, sections):
+        self.__setitem__(slice(start, stop), sections)
+
+    def __delslice__(self, start, stop):
+        self.__delitem__(slice(start, stop))
+
+    def __reduce__(self):
+        # the sections are appended on unpickling before the state is set
+        return SectionList, (list(self), self._changes)
+
+
+class ConfigBlock(MutableSequence):
+    """The config lines of a section, in order, with the indexes of its
+    lines by type and by key, which are built on first use
+
+    It's a list-like sequence, whose lines are kept in an OrderedDict, so
+    appending a line and removing it by identity are O(1) while the order
+    is kept. Getting or removing the line at a position is O(n), and the
+    other changes by position rebuild it in O(n). It isn't a list subclass,
+    but it's compared, added and multiplied with lists, which give lists.
+
+    Appending and removing keep the indexes up to date, any other change
+    drops them. After changing the key of a line in place, eg: the name of
+    a server, call `reindex`.
+    """
+    __slots__ = ('__lines', '__next_token', '__line_tokens', '__typed_lines',
+                 '__key_indexes')
+
+    def __init__(self, lines=()):
+        self.__reset(lines)
+
+    def __reset(self, lines):
+        lines = list(lines)
+        # {token: line}, the tokens increase in the order of the lines
+        self.__lines = collections.OrderedDict(zip(itertools.count(), lines))
+        self.__next_token = len(lines)
+        # {id(line): [token, ...]}, built on first removal
+        self.__line_tokens = None
+        self.reindex()
+
+    def __reduce__(self):
+        # the indexes are built again after unpickling
+        return (ConfigBlock, (list(self),))
+
+    def __len__(self):
+        return len(self.__lines)
+
+    def __iter__(self):
+        # over a copy, so the lines can be removed while iterating
+        return iter(list(self.__lines.values()))
+
+    def __reversed__(self):
+        return reversed(list(self))
+
+    def __contains__(self, line):
+        return line in self.__lines.values()
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return list(self)[position]
+        return self.__lines[self.__token_at(position)]
+
+    def __token_at(self, position):
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError('config block index out of range')
+        if position == len(self) - 1:
+            return next(reversed(self.__lines))
+        return next(itertools.islice(self.__lines, position, None))
+
+    def __setitem__(self, position, line):
+        lines = list(self)
+        lines[position] = line
+        self.__reset(lines)
+
+    def __delitem__(self, position):
+        if isinstance(position, slice):
+            lines = list(self)
+            del lines[position]
+            self.__reset(lines)
+        else:
+            self.__remove_token(self.__token_at(position))
+
+    def insert(self, position, line):
+        lines = list(self)
+        lines.insert(position, line)
+        self.__reset(lines)
+
+    def sort(self, *args, **kwargs):
+        self.__reset(sorted(self, *args, **kwargs))
+
+    def reverse(self):
+        self.__reset(reversed(list(self)))
+
+    def index(self, line, *args):
+        return list(self).index(line, *args)
+
+    def count(self, line):
+        return list(self).count(line)
+
+    # like a list, the result of `+` and `*` is a plain list
+    def __add__(self, lines):
+        if isinstance(lines, (ConfigBlock, list)):
+            return list(self) + list(lines)
+        return NotImplemented
+
+    def __radd__(self, lines):
+        if isinstance(lines, (ConfigBlock, list)):
+            return list(lines) + list(self)
+        return NotImplemented
+
+    def __mul__(self, count):
+        return list(self) * count
+
+    __rmul__ = __mul__
+
+    def __imul__(self, count):
+        self.__reset(list(self) * count)
+        return self
+
+    def __eq__(self, other):
+        if isinstance(other, (ConfigBlock, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'ConfigBlock(%r)' % list(self)
+
+    def lines(self, config_type):
+        """Returns:
+            [line, ...]: the lines which are `config_type` instances, in
+                order
+        """
+        return list(self.__lines_of(config_type).values())
+
+    def find(self, config_type, key_attributes, key):
+        """Returns:
+            the first line of `config_type` whose `key_attributes` are `key`,
+                a tuple of them for more than one attribute, or None
+        """
+        index_key = (config_type, key_attributes)
+        get_key = operator.attrgetter(*key_attributes)
+        key_index = self.__key_indexes.get(index_key)
+        if key_index is None:
+            key_index = self.__build_key_index(config_type, key_attributes)
+        keyed_tokens = key_index.get(key)
+        if keyed_tokens:
+            line = self.__lines[keyed_tokens[0]]
+            if get_key(line) == key:
+                return line
+            # the key of the line has been changed in place
+            keyed_tokens = self.__build_key_index(
+                config_type, key_attributes).get(key)
+            if keyed_tokens:
+                return self.__lines[keyed_tokens[0]]
+
+    def reindex(self):
+        """Drop the indexes, they're built again on next use"""
+        # {config_type: {token: line}}, the lines of each type in order
+        self.__typed_lines = {}
+        # {(config_type, key_attributes): {key: [token, ...]}}, the tokens
+        # of the lines with each key, in order
+        self.__key_indexes = {}
+
+    def __lines_of(self, config_type):
+        typed_lines = self.__typed_lines.get(config_type)
+        if typed_lines is None:
+            typed_lines = collections.OrderedDict(
+                (token, line) for token, line in self.__lines.items()
+                if isinstance(line, config_type))
+            self.__typed_lines[config_type] = typed_lines
+        return typed_lines
+
+    def __build_key_index(self, config_type, key_attributes):
+        get_key = operator.attrgetter(*key_attributes)
+        key_index = {}
+        for token, line in self.__lines_of(config_type).items():
+            key_index.setdefault(get_key(line), []).append(token)
+        self.__key_indexes[(config_type, key_attributes)] = key_index
+        return key_index
+
+    def __tokens(self):
+        if self.__line_tokens is None:
+            self.__line_tokens = {}
+            for token, line in self.__lines.items():
+                self.__line_tokens.setdefault(id(line), []).append(token)
+        return self.__line_tokens
+
+    def append(self, line):
+        token = self.__next_token
+        self.__next_token += 1
+        self.__lines[token] = line
+        if self.__line_tokens is not None:
+            self.__line_tokens.setdefault(id(line), []).append(token)
+        for config_type, typed_lines in self.__typed_lines.items():
+            if isinstance(line, config_type):
+                typed_lines[token] = line
+        for (config_type, key_attributes), key_index in (
+                self.__key_indexes.items()):
+            if isinstance(line, config_type):
+                key_index.setdefault(
+                    operator.attrgetter(*key_attributes)(line), []).append(
+                        token)
+
+    def extend(self, lines):
+        for line in lines:
+            self.append(line)
+
+    def __iadd__(self, lines):
+        self.extend(lines)
+        return self
+
+    def remove(self, line):
+        """Remove the first occurrence of the `line` object, in O(1)
+
+        Unlike list.remove, the line is found by identity, not by equality.
+        """
+        tokens = self.__tokens().get(id(line))
+        if not tokens:
+            raise ValueError('line not in config block')
+        self.__remove_token(tokens[0])
+
+    def pop(self, position=-1):
+        token = self.__token_at(position)
+        line = self.__lines[token]
+        self.__remove_token(token)
+        return line
+
+    def __remove_token(self, token):
+        line = self.__lines.pop(token)
+        if self.__line_tokens is not None:
+            tokens = self.__line_tokens[id(line)]
+            tokens.remove(token)
+            if not tokens:
+                del self.__line_tokens[id(line)]
+        for typed_lines in self.__typed_lines.values():
+            typed_lines.pop(token, None)
+        for (config_type, key_attributes), key_index in list(
+                self.__key_indexes.items()):
+            if not isinstance(line, config_type):
+                continue
+            key = operator.attrgetter(*key_attributes)(line)
+            keyed_tokens = key_index.get(key, [])
+            if token in keyed_tokens:
+                # by token, the same line can be in the block more than once
+                keyed_tokens.remove(token)
+                if not keyed_tokens:
+                    del key_index[key]
+            else:
+                # its key has been changed in place
+                del self.__key_indexes[(config_type, key_attributes)]
+
+    def clear(self):
+        self.__reset(())
 
 
 class HasConfigBlock(object):
+    """A section with config lines
 
-    def __init__(self, config_block):
+    Attributes:
+        lineno (int): the line number of the section header in the config
+            file, None when it's not parsed from one
+    """
+    def __init__(self, config_block, lineno=None):
         super(HasConfigBlock, self).__init__()
         self.config_block = config_block
+        self.lineno = lineno
+
+    @property
+    def config_block(self):
+        """the config lines of the section, as a ConfigBlock. It can be given
+        as a list of them, or as a callable returning them, which is then
+        called on first access. A given list is copied into the ConfigBlock,
+        so change the lines through `config_block` afterwards, the changes
+        of the list aren't seen by the section
+        """
+        if callable(self.__config_block):
+            self.__config_block = self.__as_config_block(
+                self.__config_block())
+        if self.__line_shift:
+            line_shift, self.__line_shift = self.__line_shift, 0
+            for line in self.__config_block:
+                if line.lineno is not None:
+                    line.lineno += line_shift
+        return self.__config_block
+
+    @config_block.setter
+    def config_block(self, config_block):
+        if not callable(config_block):
+            config_block = self.__as_config_block(config_block)
+        self.__config_block = config_block
+        self.__line_shift = 0
+
+    def _shift_lineno(self, line_shift):
+        """Shift the line number of the section by `line_shift`, the ones of
+        its config lines are shifted on next access to `config_block`, so a
+        lazy config block isn't parsed for it
+        """
+        if self.lineno is not None:
+            self.lineno += line_shift
+        self.__line_shift += line_shift
+
+    def __as_config_block(self, config_block):
+        if isinstance(config_block, ConfigBlock):
+            return config_block
+        return ConfigBlock(config_block)
 
     def __find_configs(self, config_type):
-        configs = []
-        for line in self.config_block:
-            if isinstance(line, config_type):
-                configs.append(line)
-        return configs
+        return list(self.config_block.lines(config_type))
 
     def __add_node(self, node, node_type):
         if not isinstance(node, node_type):
@@ -92,10 +617,8 @@ class HasConfigBlock(object):
         return self.__find_configs(Option)
 
     def option(self, keyword, value):
-        for line in self.config_block:
-            if isinstance(line, Option):
-                if line.keyword == keyword and line.value == value:
-                    return line
+        return self.config_block.find(
+            Option, ('keyword', 'value'), (keyword, value))
 
     def add_option(self, option):
         self.__add_node(option, Option)
@@ -109,10 +632,8 @@ class HasConfigBlock(object):
         return self.__find_configs(Config)
 
     def config(self, keyword, value):
-        for line in self.config_block:
-            if isinstance(line, Config):
-                if line.keyword == keyword and line.value == value:
-                    return line
+        return self.config_block.find(
+            Config, ('keyword', 'value'), (keyword, value))
 
     def add_config(self, config):
         self.__add_node(config, Config)
@@ -126,14 +647,21 @@ class HasConfigBlock(object):
         return self.__find_configs(Server)
 
     def server(self, name):
-        for line in self.config_block:
-            if isinstance(line, Server):
-                if line.name == name:
-                    return line
+        return self.config_block.find(Server, ('name',), name)
 
     def add_server(self, server):
         self.__add_node(server, Server)
 
+    def remove_servers(self, names):
+        """Remove the first server of each of `names`, in a single pass over
+        the servers
+        """
+        names = set(names)
+        for server in self.servers():
+            if server.name in names:
+                names.remove(server.name)
+                self.config_block.remove(server)
+
     def remove_server(self, name):
         server = self.server(name)
         if server:
@@ -143,10 +671,7 @@ class HasConfigBlock(object):
         return self.__find_configs(Bind)
 
     def bind(self, host, port):
-        for line in self.config_block:
-            if isinstance(line, Bind):
-                if line.host == host and line.port == port:
-                    return line
+        return self.config_block.find(Bind, ('host', 'port'), (host, port))
 
     def add_bind(self, bind):
         self.__add_node(bind, Bind)
@@ -160,10 +685,7 @@ class HasConfigBlock(object):
         return self.__find_configs(Acl)
 
     def acl(self, name):
-        for line in self.config_block:
-            if isinstance(line, Acl):
-                if line.name == name:
-                    return line
+        return self.config_block.find(Acl, ('name',), name)
 
     def add_acl(self, acl):
         self.__add_node(acl, Acl)
@@ -177,10 +699,7 @@ class HasConfigBlock(object):
         return self.__find_configs(User)
 
     def user(self, name):
-        for line in self.config_block:
-            if isinstance(line, User):
-                if line.name == name:
-                    return line
+        return self.config_block.find(User, ('name',), name)
 
     def add_user(self, user):
         self.__add_node(user, User)
@@ -194,10 +713,7 @@ class HasConfigBlock(object):
         return self.__find_configs(Group)
 
     def group(self, name):
-        for line in self.config_block:
-            if isinstance(line, Group):
-                if line.name == name:
-                    return line
+        return self.config_block.find(Group, ('name',), name)
 
     def add_group(self, group):
         self.__add_node(group, Group)
@@ -211,10 +727,7 @@ class HasConfigBlock(object):
         return self.__find_configs(UseBackend)
 
     def usebackend(self, name):
-        for line in self.config_block:
-            if isinstance(line, UseBackend):
-                if line.backend_name == name:
-                    return line
+        return self.config_block.find(UseBackend, ('backend_name',), name)
 
     def add_usebackend(self, usebackend):
         self.__add_node(usebackend, UseBackend)
@@ -225,51 +738,127 @@ class HasConfigBlock(object):
             self.config_block.remove(usebackend)
 
 
+class NamedConfigBlock(HasConfigBlock):
+    """A section with a name, the configuration holding it updates its
+    index when it's renamed
+
+    Attributes:
+        name (str): the name of the section
+    """
+    def __init__(self, name, config_block, lineno=None):
+        super(NamedConfigBlock, self).__init__(config_block, lineno)
+        # the Configuration holding it, set when it's added or indexed
+        self._configuration = None
+        self.__name = name
+
+    @property
+    def name(self):
+        return self.__name
+
+    @name.setter
+    def name(self, name):
+        old_name = self.__name
+        self.__name = name
+        if self._configuration is not None and name != old_name:
+            self._configuration._rename_section(self, old_name)
+
+
 class Global(HasConfigBlock):
     """Represens a `global` section
     """
     pass
 
 
-class Defaults(HasConfigBlock):
+class Defaults(NamedConfigBlock):
 
-    def __init__(self, name, config_block):
-        super(Defaults, self).__init__(config_block)
-        self.name = name
+    def __init__(self, name, config_block, lineno=None):
+        super(Defaults, self).__init__(name, config_block, lineno)
 
 
-class Backend(HasConfigBlock):
+class Backend(NamedConfigBlock):
 
-    def __init__(self, name, config_block):
-        super(Backend, self).__init__(config_block)
-        self.name = name
+    def __init__(self, name, config_block, lineno=None):
+        super(Backend, self).__init__(name, config_block, lineno)
 
 
-class Listen(HasConfigBlock):
-    def __init__(self, name, host, port, config_block):
-        super(Listen, self).__init__(config_block)
-        self.name = name
+class Listen(NamedConfigBlock):
+    def __init__(self, name, host, port, config_block, lineno=None):
+        super(Listen, self).__init__(name, config_block, lineno)
         self.host = host
         self.port = port
 
 
-class Frontend(HasConfigBlock):
-    def __init__(self, name, host, port, config_block):
-        super(Frontend, self).__init__(config_block)
-        self.name = name
+class Frontend(NamedConfigBlock):
+    def __init__(self, name, host, port, config_block, lineno=None):
+        super(Frontend, self).__init__(name, config_block, lineno)
         self.host = host
         self.port = port
 
 
-class Userlist(HasConfigBlock):
+class Userlist(NamedConfigBlock):
     """Represents the `userlist` section
 
     Attributes:
         name (str): Description
     """
-    def __init__(self, name, config_block):
-        super(Userlist, self).__init__(config_block)
-        self.name = name
+    def __init__(self, name, config_block, lineno=None):
+        super(Userlist, self).__init__(name, config_block, lineno)
+
+
+class ServerAttributes(list):
+    """The attributes of a server, a list read from the tuple which it
+    shares with the servers of equal attributes
+
+    A change of the list is stored in the server, so only this server gets
+    the new attributes. A copy of it is a plain list, which isn't bound to
+    the server, and so is the result of `+`.
+    """
+    __slots__ = ('__server',)
+
+    def __init__(self, server):
+        super(ServerAttributes, self).__init__(server._attributes)
+        self.__server = server
+
+    def __changing(method):
+        """Wrap the list `method`, the changed list is stored in the server
+        """
+        def change(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            self.__server._attributes = share_attributes(self, keep=False)
+            return result
+        return change
+
+    __setitem__ = __changing(list.__setitem__)
+    __delitem__ = __changing(list.__delitem__)
+    __iadd__ = __changing(list.__iadd__)
+    __imul__ = __changing(list.__imul__)
+    append = __changing(list.append)
+    extend = __changing(list.extend)
+    insert = __changing(list.insert)
+    pop = __changing(list.pop)
+    remove = __changing(list.remove)
+    reverse = __changing(list.reverse)
+    sort = __changing(list.sort)
+    del __changing
+
+    def clear(self):
+        del self[:]
+
+    # Python 2 calls them for the slices without step
+    def __setslice__(self, start, stop, attributes):
+        self.__setitem__(slice(start, stop), attributes)
+
+    def __delslice__(self, start, stop):
+        self.__delitem__(slice(start, stop))
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(list(self), memo)
+
+    def __reduce__(self):
+        return list, (list(self),)
 
 
 class Server(object):
@@ -279,18 +868,33 @@ class Server(object):
         name (str): Description
         host (str): Description
         port (str): Description
-        attributes (list): Description
+        attributes (ServerAttributes): the list of the attributes, the
+            servers of equal attributes share their storage. Each access
+            reads it again, and it can be set to a list
+        lineno (int): the line number in the config file, None when it's
+            not parsed from one
     """
-    def __init__(self, name, host, port, attributes=[]):
+    __slots__ = ('name', 'host', 'port', '_attributes', 'lineno')
+
+    def __init__(self, name, host, port, attributes=(), lineno=None):
         super(Server, self).__init__()
         self.name = name
         self.host = host
         self.port = port
-        self.attributes = [attr.strip() for attr in attributes]
+        self.attributes = attributes
+        self.lineno = lineno
+
+    @property
+    def attributes(self):
+        return ServerAttributes(self)
+
+    @attributes.setter
+    def attributes(self, attributes):
+        self._attributes = share_attributes(attributes)
 
     def __str__(self):
         return '<server_line: %s %s:%s %s>' % (
-            self.name, self.host, self.port, ' '.join(self.attributes))
+            self.name, self.host, self.port, ' '.join(self._attributes))
 
 
 class Config(object):
@@ -299,10 +903,15 @@ class Config(object):
     Attributes:
         keyword (srt):
         value (str):
+        lineno (int): the line number in the config file, None when it's
+            not parsed from one
     """
-    def __init__(self, keyword, value):
-        self.keyword = keyword
+    __slots__ = ('keyword', 'value', 'lineno')
+
+    def __init__(self, keyword, value, lineno=None):
+        self.keyword = intern_text(keyword)
         self.value = value
+        self.lineno = lineno
 
     def __str__(self):
         return '<config_line: config %s %s>' % (
@@ -315,10 +924,15 @@ class Option(object):
     Attributes:
         keyword (srt):
         value (str):
+        lineno (int): the line number in the config file, None when it's
+            not parsed from one
     """
-    def __init__(self, keyword, value):
-        self.keyword = keyword
+    __slots__ = ('keyword', 'value', 'lineno')
+
+    def __init__(self, keyword, value, lineno=None):
+        self.keyword = intern_text(keyword)
         self.value = value
+        self.lineno = lineno
 
     def __str__(self):
         return '<option_line: option %s %s>' % (
@@ -332,11 +946,16 @@ class Bind(object):
         host (srt):
         port (list):
         attributes (str):
+        lineno (int): the line number in the config file, None when it's
+            not parsed from one
     """
-    def __init__(self, host, port, attributes):
+    __slots__ = ('host', 'port', 'attributes', 'lineno')
+
+    def __init__(self, host, port, attributes, lineno=None):
         self.host = host
         self.port = port
         self.attributes = attributes or []
+        self.lineno = lineno
 
     def __str__(self):
         return '<bind_line: bind %s:%s %s>' % (
@@ -349,10 +968,15 @@ class Acl(object):
     Attributes:
         name (str):
         value (str):
+        lineno (int): the line number in the config file, None when it's
+            not parsed from one
     """
-    def __init__(self, name, value):
+    __slots__ = ('name', 'value', 'lineno')
+
+    def __init__(self, name, value, lineno=None):
         self.name = name
         self.value = value
+        self.lineno = lineno
 
     def __str__(self):
         return '<acl_line: acl %s %s>' % (self.name, self.value)
@@ -366,13 +990,18 @@ class User(object):
         passwd (str): Description
         passwd_type ('password' or 'insecure-password'): Description
         group_names (list(str)): Description
+        lineno (int): the line number in the config file, None when it's
+            not parsed from one
     """
-    def __init__(self, name, passwd, passwd_type, group_names):
+    __slots__ = ('name', 'passwd', 'passwd_type', 'group_names', 'lineno')
+
+    def __init__(self, name, passwd, passwd_type, group_names, lineno=None):
         super(User, self).__init__()
         self.name = name
         self.passwd = passwd
         self.passwd_type = passwd_type
         self.group_names = group_names or []
+        self.lineno = lineno
 
     def __str__(self):
         if self.group_names:
@@ -389,11 +1018,16 @@ class Group(object):
     Attributes:
         name (str): Description
         user_names (list(str)): Description
+        lineno (int): the line number in the config file, None when it's
+            not parsed from one
     """
-    def __init__(self, name, user_names):
+    __slots__ = ('name', 'user_names', 'lineno')
+
+    def __init__(self, name, user_names, lineno=None):
         super(Group, self).__init__()
         self.name = name
         self.user_names = user_names or []
+        self.lineno = lineno
 
     def __str__(self):
         if self.user_names:
@@ -412,13 +1046,19 @@ class UseBackend(object):
         backend_name (str): Description
         is_default (bool): Description
         operator (str): Description
+        lineno (int): the line number in the config file, None when it's
+            not parsed from one
     """
+    __slots__ = ('backend_name', 'operator', 'backend_condition', 'is_default',
+                 'lineno')
+
     def __init__(self, backend_name, operator,
-                 backend_condition, is_default=False):
+                 backend_condition, is_default=False, lineno=None):
         self.backend_name = backend_name
         self.operator = operator
         self.backend_condition = backend_condition
         self.is_default = is_default
+        self.lineno = lineno
 
     def __str__(self):
         backendtype = 'default_backend' if self.is_default else 'use_backend'
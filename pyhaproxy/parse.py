@@ -1,10 +1,140 @@
 #!/usr/bin/env python
 # -*- coding: utf8 -*-
 
+import codecs
+import functools
+import importlib
+import io
+import mmap
 import os
+import re
 
-import pyhaproxy.pegnode as pegnode
 import pyhaproxy.config as config
+import pyhaproxy.cache as cache
+
+
+class _Lazy(object):
+    """Stands for the object returned by `load()`, which is only called on
+    first attribute access, eg: a module or a compiled regex
+
+    Each attribute is then set on the instance, so the later accesses cost
+    the same as on the object itself.
+    """
+    def __init__(self, load):
+        self.__load = load
+        self.__loaded = None
+
+    def __getattr__(self, name):
+        if self.__loaded is None:
+            self.__loaded = self.__load()
+        value = getattr(self.__loaded, name)
+        setattr(self, name, value)
+        return value
+
+
+# The generated grammar is 4,000 lines with 39 regexes, it's imported when
+# the first file is parsed, so building a configuration from the cache, or
+# importing this module only to read one, doesn't pay for it
+pegnode = _Lazy(
+    functools.partial(importlib.import_module, 'pyhaproxy.pegnode'))
+
+# the same as pegnode.TEXT_TYPES, without importing the grammar
+TEXT_TYPES = (str, type(u''))
+
+
+def _regex(pattern, flags=0):
+    """A regex compiled on first use"""
+    return _Lazy(functools.partial(re.compile, pattern, flags))
+
+
+# Regexes of the `fast` engine, each one matches a whole line of the same
+# shape as the rule in haproxy.peg. The `(?!...)` guards stop the regex from
+# backtracking into a run of chars, which the PEG never does. They are
+# compiled on first use
+_NAME = r'[a-zA-z0-9\-\_\.:]+(?![a-zA-z0-9\-\_\.:])'
+_PROXY_NAME = r'[a-zA-Z0-9\-\_\.:]+(?![a-zA-Z0-9\-\_\.:])'
+_KEYWORD = (r'(?:(?:errorfile|timeout)[ \t]*|(?!errorfile|timeout))'
+            r'[a-z0-9\-\_\.]+(?![a-z0-9\-\_\.])')
+_SERVICE_ADDRESS = (r'(?P<host>\d+\.\d+\.\d+\.\d+|[a-zA-Z\-\.\d]+|\*)'
+                    r':?(?P<port>\d*)')
+_LINE_END = r'(?P<value>[^#\n]*)(?:#[^\n]*)?\n'
+
+TOKEN_REGEX = _regex(r'[ \t]*([^ \t\n#]*)')
+COMMENT_OR_BLANK_LINE_REGEX = _regex(r'[ \t]*(?:#[^\n]*)?\n')
+
+SECTION_HEADER_REGEXES = {
+    'global': _regex(r'[ \t]*global[ \t]*(?:#[^\n]*)?\n'),
+    'defaults': _regex(
+        r'[ \t]*defaults[ \t]*(?P<name>%s)?[ \t]*(?:#[^\n]*)?\n' %
+        _PROXY_NAME),
+    'userlist': _regex(
+        r'[ \t]*userlist[ \t]*(?P<name>%s)(?:#[^\n]*)?\n' % _PROXY_NAME),
+    'listen': _regex(
+        r'[ \t]*listen[ \t]*(?P<name>%s)[ \t]*(?:%s)?%s' % (
+            _PROXY_NAME, _SERVICE_ADDRESS, _LINE_END)),
+    'frontend': _regex(
+        r'[ \t]*frontend[ \t]*(?P<name>%s)[ \t]*(?:%s)?%s' % (
+            _PROXY_NAME, _SERVICE_ADDRESS, _LINE_END)),
+    'backend': _regex(
+        r'[ \t]*backend[ \t]*(?P<name>%s)[ \t]*%s' % (_PROXY_NAME, _LINE_END)),
+}
+
+SERVER_LINE_REGEX = _regex(
+    r'[ \t]*server [ \t]*(?P<name>%s)[ \t]*%s%s' % (
+        _NAME, _SERVICE_ADDRESS, _LINE_END))
+OPTION_LINE_REGEX = _regex(
+    r'[ \t]*option[ \t]*(?P<keyword>%s)[ \t]*%s' % (_KEYWORD, _LINE_END))
+BIND_LINE_REGEX = _regex(
+    r'[ \t]*bind[ \t]+%s[ \t]*%s' % (_SERVICE_ADDRESS, _LINE_END))
+ACL_LINE_REGEX = _regex(
+    r'[ \t]*acl[ \t]*(?P<name>%s)[ \t]*%s' % (_NAME, _LINE_END))
+BACKEND_LINE_REGEX = _regex(
+    r'[ \t]*(?P<backendtype>use_backend|default_backend)[ \t]*'
+    r'(?P<name>%s)[ \t]*(?P<operator>if|unless)?[ \t]*%s' % (
+        _NAME, _LINE_END))
+GROUP_LINE_REGEX = _regex(
+    r'[ \t]*group[ \t]*(?P<name>%s)[ \t]*(?:users[ \t]*)?%s' % (
+        _NAME, _LINE_END))
+USER_LINE_REGEX = _regex(
+    r'[ \t]*user[ \t]*(?P<name>%s)[ \t]*'
+    r'(?P<passwd_type>password|insecure-password)[ \t]*'
+    r'(?P<password>[^#\n ]+)[ \t]*(?:groups[ \t]*)?%s' % (_NAME, _LINE_END))
+CONFIG_LINE_REGEX = _regex(
+    r'[ \t]*(?P<keyword>%s)[ \t]*%s' % (_KEYWORD, _LINE_END))
+
+# the literals starting the section headers and typed config lines, a token
+# which starts with one of them but differs from it is left to the PEG
+SECTION_KEYWORDS = (
+    'global', 'defaults', 'userlist', 'listen', 'frontend', 'backend')
+LINE_KEYWORDS = (
+    'server', 'option', 'bind', 'acl', 'use_backend', 'default_backend',
+    'group', 'user')
+RESERVED_PREFIXES = SECTION_KEYWORDS + LINE_KEYWORDS
+
+# the lines which start a section, with the type and the name of it. The
+# PEG grammar never reads those lines as config lines, but for some
+# `userlist...` lines read as `user` lines
+SECTION_HEADER_LINE_REGEX = _regex(
+    r'^[ \t]*(%s)[ \t]*([a-zA-Z0-9\-\_\.:]*)' % '|'.join(SECTION_KEYWORDS),
+    re.M)
+
+# the size of each read of `Parser.iter_sections`
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# the file is split into that many chunks per process for
+# `Parser.build_configuration(workers=N)`, so the processes stay busy when
+# the sections are of different sizes
+PARALLEL_CHUNKS_PER_WORKER = 4
+
+# the method of config.Configuration which adds each section type, the
+# `global` section is set to its `globall` attribute
+SECTION_ADDERS = {
+    config.Defaults: 'add_default',
+    config.Userlist: 'add_userlist',
+    config.Listen: 'add_listen',
+    config.Frontend: 'add_frontend',
+    config.Backend: 'add_backend',
+}
 
 
 class Parser(object):
@@ -12,47 +142,534 @@ class Parser(object):
 
     Attributes:
         filepath (str): the absolute path of haproxy config file
-        filestring (str): the content of haproxy config file
+        filestring (str): the content of haproxy config file, it's read
+            from `filepath` on first access. It can also be bytes-like
+            (bytes, bytearray, mmap or memoryview) utf-8 text, which the
+            'peg' and 'actions' engines parse in place, on Python 3 only
+        use_mmap (bool): `filepath` is memory-mapped rather than read, so
+            the processes parsing the same file share its pages in the page
+            cache, `filestring` is then the mmap. Python 3 only
+        cache (cache.ParseCache): the on-disk cache of the configurations
+            built by `build_configuration`, None when `cache_dir` is not
+            given. The cache files are unpickled, so `cache_dir` must not be
+            writable by other users
     """
-    def __init__(self, filepath='/etc/haproxy/haproxy.cfg', filestring=None):
-        if filestring:
-            self.filestring = filestring
-        elif filepath:
-            self.filestring = self.__read_string_from_file(filepath)
-        else:
+    def __init__(self, filepath='/etc/haproxy/haproxy.cfg', filestring=None,
+                 cache_dir=None, cache_size=cache.DEFAULT_CACHE_SIZE,
+                 use_mmap=False):
+        if not (filestring or filepath):
             raise Exception('please validate your input')
+        if use_mmap and bytes is str:
+            raise Exception('use_mmap is only supported on Python 3')
+        self.filepath = filepath
+        self.use_mmap = use_mmap
+        self.__filestring = filestring or None
+        self.__section_index = None
+        # the line number of the header of each section of `section_index`
+        self.__section_linenos = None
+        # the line starts of the input of the peg-tree being built, for the
+        # line numbers of the config objects
+        self.__line_index = None
+        self.cache = None
+        if cache_dir:
+            self.cache = cache.ParseCache(cache_dir, cache_size)
+
+    @property
+    def filestring(self):
+        if self.__filestring is None:
+            self.__filestring = self.__read_string_from_file(self.filepath)
+        return self.__filestring
 
-    def build_configuration(self):
+    @filestring.setter
+    def filestring(self, filestring):
+        self.__filestring = filestring
+        self.__section_index = None
+        self.__section_linenos = None
+
+    def build_configuration(self, engine='peg', lazy=False, workers=None,
+                            recover=False):
         """Parse the haproxy config file
 
+        Args:
+            engine ('peg', 'actions' or 'fast'): 'peg' parses the whole file
+                with the PEG grammar, then walks the peg-tree. 'actions'
+                builds the objects in a single pass, by the grammar actions,
+                without the peg-tree. 'fast' tokenizes it line by line and
+                only falls back to the PEG grammar for the lines it can't
+                classify. They all build the same objects
+            lazy (bool): only parse the section headers, the config block
+                of each section is parsed when it's first accessed, so the
+                errors in it are raised then
+            workers (int): parse the sections in that many processes
+            recover (bool): don't stop at the first error, a line which
+                can't be parsed is skipped, and so is the whole section of a
+                section header which can't, the errors are returned with
+                the configuration of the rest of the file
+
+        With `cache_dir` given, the configuration is loaded from the cache
+        when the file content is the same, a lazy one is never cached, nor
+        one with errors.
+
         Raises:
-            Exception: when there are unsupported section
+            Exception: when there are unsupported section or engine, or
+                line builders are registered and the engine isn't 'peg',
+                or `recover` is given
 
         Returns:
-            config.Configuration: haproxy config object
+            config.Configuration: haproxy config object, or with `recover`,
+                (config.Configuration, [pegnode.ParseError or Exception, ...])
+                the parse errors in the order of the file, then the ones of
+                the sections which can't be built
         """
+        if lazy and workers:
+            raise Exception('lazy and workers can not be used together')
+        if recover and (lazy or workers):
+            raise Exception('recover can not be used with lazy or workers')
+        if (not isinstance(self.filestring, TEXT_TYPES) and
+                (engine == 'fast' or lazy or workers or recover)):
+            raise Exception('bytes-like filestring is only supported by the '
+                            'peg and actions engines, without lazy, workers '
+                            'or recover')
+        errors = [] if recover else None
+        if self.cache is not None and not lazy:
+            key = self.cache.key(
+                self.filestring, engine, self.__builders_name())
+            configuration = self.cache.load(key)
+            if configuration is None:
+                configuration = self.__build_configuration(
+                    engine, lazy, workers, errors)
+                if not errors:
+                    self.cache.store(key, configuration)
+        else:
+            configuration = self.__build_configuration(
+                engine, lazy, workers, errors)
+        if recover:
+            return configuration, errors
+        return configuration
+
+    def __build_configuration(self, engine, lazy, workers, errors=None):
+        if lazy:
+            sections = self.__build_sections_lazy(self.filestring, engine)
+        elif errors is not None:
+            sections = self.__build_sections_recovering(
+                self.filestring, engine, errors)
+        elif workers and workers > 1:
+            sections = self.__build_sections_parallel(
+                self.filestring, engine, workers)
+        else:
+            sections = self.__build_sections(self.filestring, engine)
         configuration = config.Configuration()
-        pegtree = pegnode.parse(self.filestring)
+        for section in sections:
+            self.__add_section(configuration, section)
+        return configuration
+
+    def iter_sections(self, fileobj=None, engine='peg',
+                      chunk_size=STREAM_CHUNK_SIZE, first_lineno=1):
+        """Parse the haproxy config file section by section
+
+        The file is read in chunks and split at the section headers, so
+        only one section is held in memory at a time.
+
+        Args:
+            fileobj (file): the haproxy config file to read, `filepath` is
+                opened when it's None
+            engine (str): same as in `build_configuration`
+            chunk_size (int): the size of each read from `fileobj`
+            first_lineno (int): the line number of the first line of
+                `fileobj`, the line numbers of the config objects count
+                from it
+
+        Raises:
+            pegnode.ParseError: when a section can't be parsed
+
+        Yields:
+            config.Global, config.Defaults, ...: the sections, in the order
+                they are in the file
+        """
+        if fileobj is not None:
+            chunks = _read_chunks(fileobj, chunk_size)
+        elif isinstance(self.__filestring, type(u'')):
+            chunks = _read_chunks(io.StringIO(self.__filestring), chunk_size)
+        elif isinstance(self.__filestring, str):
+            # the text read from the file on Python 2
+            chunks = _read_chunks(io.BytesIO(self.__filestring), chunk_size)
+        elif self.__filestring is not None:
+            # bytes-like, eg: an mmap, which is sliced chunk by chunk rather
+            # than copied whole
+            chunks = _decode_chunks(self.__filestring, chunk_size)
+        elif os.path.exists(self.filepath):
+            with open(self.filepath) as fileobj:
+                for section in self.iter_sections(
+                        fileobj, engine, chunk_size, first_lineno):
+                    yield section
+            return
+        else:
+            return
+
+        section_lines, rest, lineno = [], '', first_lineno
+        for chunk in chunks:
+            lines = (rest + chunk).split('\n')
+            rest = lines.pop()
+            for line in lines:
+                if section_lines and self.__is_section_header(line):
+                    for section in self.__build_sections(
+                            '\n'.join(section_lines) + '\n', engine,
+                            lineno):
+                        yield section
+                    lineno += len(section_lines)
+                    section_lines = []
+                section_lines.append(line)
+
+        if rest and self.__is_section_header(rest):
+            # the last line has no line break, it's parsed on its own
+            for section in self.__build_sections(
+                    '\n'.join(section_lines) + '\n', engine, lineno):
+                yield section
+            lineno += len(section_lines)
+            section_lines = []
+        section_lines.append(rest)
+        for section in self.__build_sections(
+                '\n'.join(section_lines), engine, lineno):
+            yield section
+
+    def __is_section_header(self, line):
+        """Tell if the line (without line break) starts a section"""
+        match = SECTION_HEADER_LINE_REGEX.match(line)
+        return match is not None and not self.__is_user_line(
+            line + '\n', match)
+
+    def __is_user_line(self, filestring, header_match):
+        return (header_match.group(1) == 'userlist' and
+                USER_LINE_REGEX.match(filestring, header_match.start())
+                is not None)
+
+    def section_index(self):
+        """Find the sections with a single regex scan of the file, without
+        parsing them
+
+        Returns:
+            [(section_type, name, start_offset, end_offset), ...]: in the
+                order they are in the file, name is None for `global`, and
+                filestring[start_offset:end_offset] is the whole section
+        """
+        if self.__section_index is None:
+            self.__section_index, self.__section_linenos = (
+                self.__scan_sections(self.filestring))
+        return self.__section_index
+
+    def __scan_sections(self, filestring, first_lineno=1):
+        """Returns:
+            ([(section_type, name, start_offset, end_offset), ...],
+             [lineno, ...]): the section index of `filestring`, and the
+                line number of each section header, counting from
+                `first_lineno`
+        """
+        section_index, linenos = [], []
+        lineno, line_start = first_lineno, 0
+        for match in SECTION_HEADER_LINE_REGEX.finditer(filestring):
+            if self.__is_user_line(filestring, match):
+                continue
+            lineno += filestring.count('\n', line_start, match.start())
+            line_start = match.start()
+            linenos.append(lineno)
+            if section_index:
+                section_type, name, start, _ = section_index[-1]
+                section_index[-1] = (section_type, name, start, match.start())
+            section_type, name = match.groups()
+            if section_type == 'global':
+                name = None
+            section_index.append(
+                (section_type, name, match.start(), len(filestring)))
+        return section_index, linenos
+
+    def reparse(self, previous_configuration, edit_start, edit_end,
+                new_text, engine='peg'):
+        """Replace filestring[edit_start:edit_end] with `new_text`, and only
+        parse again the sections which overlap the edit
+
+        Args:
+            previous_configuration (config.Configuration): built from the
+                current `filestring` by this parser, it's updated in place
+            edit_start (int): the offset where the edit starts
+            edit_end (int): the offset where the replaced text ends
+            new_text (str): the text replacing the range
+            engine (str): same as in `build_configuration`
+
+        Raises:
+            Exception: when the edit is out of `filestring`, or it's
+                bytes-like
+
+        Returns:
+            config.Configuration: `previous_configuration`, in which the
+                sections out of the edit are still the same objects, the
+                line numbers of the ones after it are shifted
+        """
+        filestring = self.filestring
+        if not isinstance(filestring, TEXT_TYPES):
+            raise Exception('reparse does not support bytes-like filestring')
+        if not 0 <= edit_start <= edit_end <= len(filestring):
+            raise Exception('edit out of range: %d-%d' % (
+                edit_start, edit_end))
+        section_index = self.section_index()
+        section_linenos = self.__section_linenos
+        new_filestring = (
+            filestring[:edit_start] + new_text + filestring[edit_end:])
+
+        # the sections touching the edit, from the first to the one after
+        # the last, the text out of them is left as it is
+        first, after = 0, 0
+        for position, (_, _, start, end) in enumerate(section_index):
+            if end < edit_start:
+                first = position + 1
+            if start <= edit_end:
+                after = position + 1
+        if section_index and edit_start >= section_index[0][2]:
+            region_start = section_index[first][2]
+        else:
+            # the lines before the first section are edited
+            first, region_start = 0, 0
+        if after:
+            region_end = section_index[after - 1][3]
+        elif section_index:
+            region_end = section_index[0][2]
+        else:
+            region_end = len(filestring)
+        shift = len(new_text) - (edit_end - edit_start)
+        region_lineno = section_linenos[first] if region_start else 1
+        region_text = new_filestring[region_start:region_end + shift]
+        region_index, region_linenos = self.__scan_sections(
+            region_text, region_lineno)
+        while region_start and (
+                not region_index or region_index[0][2] != 0):
+            # the edited header isn't one any more, its lines belong to
+            # the section before
+            if first:
+                first -= 1
+                region_start = section_index[first][2]
+                region_lineno = section_linenos[first]
+            else:
+                region_start, region_lineno = 0, 1
+            region_text = new_filestring[region_start:region_end + shift]
+            region_index, region_linenos = self.__scan_sections(
+                region_text, region_lineno)
+
+        # build the sections of the region and splice them into the index
+        # and the configuration, in place of the old ones. The line numbers
+        # are kept with the index, so the ones after the region are shifted
+        # rather than counted again over the whole file
+        new_sections = self.__build_sections(
+            region_text, engine, region_lineno)
+        line_shift = new_text.count('\n') - filestring.count(
+            '\n', edit_start, edit_end)
+        self.__filestring = new_filestring
+        region_index = [
+            (section_type, name, start + region_start, end + region_start)
+            for section_type, name, start, end in region_index]
+        self.__section_index = section_index[:first] + region_index + [
+            (section_type, name, start + shift, end + shift)
+            for section_type, name, start, end in section_index[after:]]
+        self.__section_linenos = section_linenos[:first] + region_linenos + [
+            lineno + line_shift for lineno in section_linenos[after:]]
+        self.__splice_sections(
+            previous_configuration, section_index, first, after,
+            new_sections, engine, line_shift)
+        return previous_configuration
+
+    def __splice_sections(self, configuration, old_index, first, after,
+                          new_sections, engine, line_shift):
+        """Replace the sections of old_index[first:after] in `configuration`
+        with `new_sections`, which are now at the same place of the new index,
+        and shift the line numbers of the sections after them by `line_shift`
+        """
+        section_lists = [
+            ('defaults', config.Defaults, configuration.defaults),
+            ('userlist', config.Userlist, configuration.userlists),
+            ('listen', config.Listen, configuration.listens),
+            ('frontend', config.Frontend, configuration.frontends),
+            ('backend', config.Backend, configuration.backends),
+        ]
+        for section_type, section_class, sections in section_lists:
+            position = len([
+                entry for entry in old_index[:first]
+                if entry[0] == section_type])
+            count = len([
+                entry for entry in old_index[first:after]
+                if entry[0] == section_type])
+            region_sections = [
+                section for section in new_sections
+                if isinstance(section, section_class)]
+            sections[position:position + count] = region_sections
+            if line_shift:
+                for section in sections[position + len(region_sections):]:
+                    section._shift_lineno(line_shift)
+
+        # the last `global` section wins, it's built again when the one
+        # before the edit takes over from an edited one
+        global_positions = [
+            position for position, entry in enumerate(self.__section_index)
+            if entry[0] == 'global']
+        old_global_positions = [
+            position for position, entry in enumerate(old_index)
+            if entry[0] == 'global']
+        region_end = len(self.__section_index) - (len(old_index) - after)
+        if not global_positions:
+            configuration.globall = None
+        elif first <= global_positions[-1] < region_end:
+            configuration.globall = [
+                section for section in new_sections
+                if isinstance(section, config.Global)][-1]
+        elif first <= old_global_positions[-1] < after:
+            _, _, start, end = self.__section_index[global_positions[-1]]
+            configuration.globall = self.__build_sections(
+                self.__filestring[start:end], engine,
+                self.__section_linenos[global_positions[-1]])[0]
+        elif line_shift and global_positions[-1] >= region_end:
+            configuration.globall._shift_lineno(line_shift)
+
+    def __build_sections(self, filestring, engine, first_lineno=1):
+        """Parse the sections of `filestring` with the `engine`, the line
+        numbers of the config objects count from `first_lineno`
+
+        Raises:
+            Exception: when there are unsupported engine
+
+        Returns:
+            [config.Global, config.Defaults, ...]: in the order they are in
+                `filestring`
+        """
+        if engine != 'peg':
+            self.__check_line_builders(engine)
+        if engine == 'fast':
+            return self.__build_sections_fast(filestring, first_lineno)
+        elif engine == 'actions':
+            return self.__build_sections_actions(filestring, first_lineno)
+        elif engine != 'peg':
+            raise Exception('unsupported parsing engine: %s' % engine)
+
+        sections = []
+        pegtree = pegnode.parse(filestring, first_lineno=first_lineno)
+        self.__line_index = pegnode.LineIndex(filestring, first_lineno)
+        section_builders = self.section_builders
         for section_node in pegtree:
-            if isinstance(section_node, pegnode.GlobalSection):
-                configuration.globall = self.build_global(section_node)
-            elif isinstance(section_node, pegnode.FrontendSection):
-                configuration.frontends.append(
-                    self.build_frontend(section_node))
-            elif isinstance(section_node, pegnode.DefaultsSection):
-                configuration.defaults.append(
-                    self.build_defaults(section_node))
-            elif isinstance(section_node, pegnode.ListenSection):
-                configuration.listens.append(
-                    self.build_listen(section_node))
-            elif isinstance(section_node, pegnode.UserlistSection):
-                configuration.userlists.append(
-                    self.build_userlist(section_node))
-            elif isinstance(section_node, pegnode.BackendSection):
-                configuration.backends.append(
-                    self.build_backend(section_node))
+            # the comment and blank lines have no builder
+            builder = section_builders.get(type(section_node).__name__)
+            if builder is not None:
+                sections.append(builder(self, section_node))
+        return sections
 
-        return configuration
+    def __builders_name(self):
+        """Returns:
+            str: the name of the parser type, and of the line builders
+                registered on it, for the cache key, the config objects
+                they build can differ from the ones of `Parser`
+        """
+        parser_type = type(self)
+        names = ['%s.%s' % (parser_type.__module__, getattr(
+            parser_type, '__qualname__', parser_type.__name__))]
+        for node_name, builder in sorted(self.line_builders.items()):
+            if builder is not self.__grammar_line_builders.get(node_name):
+                names.append('%s=%s.%s' % (
+                    node_name, getattr(builder, '__module__', ''),
+                    getattr(builder, '__name__', '')))
+        return ' '.join(names)
+
+    def __check_line_builders(self, engine):
+        """The 'actions' and 'fast' engines build the config lines without
+        the peg-tree, so they can't use the registered line builders
+
+        Raises:
+            Exception: when line builders are registered
+        """
+        if self.line_builders != self.__grammar_line_builders:
+            raise Exception('registered line builders are only supported by '
+                            'the peg engine, not with %s' % engine)
+
+    def __build_sections_recovering(self, filestring, engine, errors):
+        """Parse `filestring` with the `engine`, and when it fails, parse it
+        again line by line like the `fast` engine, appending to `errors`
+        the lines it can't parse
+        """
+        if engine not in ('peg', 'actions', 'fast'):
+            raise Exception('unsupported parsing engine: %s' % engine)
+        # the lines are built again by the `fast` engine on failure
+        self.__check_line_builders('recover')
+        try:
+            return self.__build_sections(filestring, engine)
+        except Exception:
+            return self.__build_sections_fast(filestring, 1, errors)
+
+    def __build_sections_lazy(self, filestring, engine):
+        """Build the sections from `section_index` and their headers, and
+        leave the config blocks to be parsed on first access. The sections
+        whose host and port come from a `bind` line are parsed right away
+        """
+        section_index = self.section_index()
+        # the lines before the first section, they are comments or errors
+        sections = self.__build_sections(
+            filestring[:section_index[0][2] if section_index else None],
+            engine)
+        for (section_type, _, start, end), lineno in zip(
+                section_index, self.__section_linenos):
+            match = SECTION_HEADER_REGEXES[section_type].match(
+                filestring, start)
+            header = match and self.__read_header_match(
+                section_type, match, lineno)
+            if header is None or (section_type in ('listen', 'frontend') and
+                                  header[2] is None):
+                sections.extend(self.__build_sections(
+                    filestring[start:end], engine, lineno))
+                continue
+            sections.append(self.__build_section(header, functools.partial(
+                self.__load_config_block, filestring, start, end, engine,
+                lineno)))
+        return sections
+
+    def __build_sections_parallel(self, filestring, engine, workers):
+        """Split `filestring` at the section headers into chunks of about the
+        same size, and parse them in a pool of `workers` processes
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunk_size = len(filestring) // (workers * PARALLEL_CHUNKS_PER_WORKER)
+        # the lines before the first section go with the first chunk
+        chunks, linenos, chunk_start, chunk_lineno = [], [], 0, 1
+        section_index = self.section_index()
+        section_linenos = self.__section_linenos
+        for position, (_, _, start, end) in enumerate(section_index):
+            if end - chunk_start >= chunk_size:
+                chunks.append(filestring[chunk_start:end])
+                linenos.append(chunk_lineno)
+                chunk_start = end
+                # the next chunk starts with the next section
+                if position + 1 < len(section_linenos):
+                    chunk_lineno = section_linenos[position + 1]
+        if chunk_start < len(filestring):
+            chunks.append(filestring[chunk_start:])
+            linenos.append(chunk_lineno)
+        if len(chunks) < 2:
+            return self.__build_sections(filestring, engine)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            sections = []
+            for chunk_sections in executor.map(
+                    _build_sections, [type(self)] * len(chunks), chunks,
+                    [engine] * len(chunks),
+                    linenos):
+                sections.extend(chunk_sections)
+            return sections
+
+    def __load_config_block(self, filestring, start, end, engine, lineno):
+        """Parse the section in filestring[start:end], which starts at line
+        `lineno`, for its config block
+        """
+        return self.__build_sections(
+            filestring[start:end], engine, lineno)[0].config_block
+
+    def __add_section(self, configuration, section):
+        if isinstance(section, config.Global):
+            configuration.globall = section
+        else:
+            getattr(configuration, SECTION_ADDERS[type(section)])(section)
 
     def build_global(self, global_node):
 
@@ -66,7 +683,17 @@ class Parser(object):
         """
         config_block_lines = self.__build_config_block(
             global_node.config_block)
-        return config.Global(config_block=config_block_lines)
+        return config.Global(config_block=config_block_lines,
+                             lineno=self.__lineno(global_node))
+
+    def __lineno(self, node):
+        """Returns:
+            int: the line number of the node, in the file being parsed
+        """
+        if self.__line_index is None or self.__line_index.input is not (
+                node.input):
+            self.__line_index = pegnode.LineIndex(node.input)
+        return self.__line_index.lineno(node.offset)
 
     def __build_config_block(self, config_block_node):
         """parse `config_block` in each section
@@ -78,33 +705,12 @@ class Parser(object):
             [line_node1, line_node2, ...]
         """
         node_lists = []
-
+        line_builders = self.line_builders
         for line_node in config_block_node:
-            if isinstance(line_node, pegnode.ConfigLine):
-                node_lists.append(self.__build_config(line_node))
-            elif isinstance(line_node, pegnode.OptionLine):
-                node_lists.append(self.__build_option(line_node))
-            elif isinstance(line_node, pegnode.ServerLine):
-                node_lists.append(
-                    self.__build_server(line_node))
-            elif isinstance(line_node, pegnode.BindLine):
-                node_lists.append(
-                    self.__build_bind(line_node))
-            elif isinstance(line_node, pegnode.AclLine):
-                node_lists.append(
-                    self.__build_acl(line_node))
-            elif isinstance(line_node, pegnode.BackendLine):
-                node_lists.append(
-                    self.__build_usebackend(line_node))
-            elif isinstance(line_node, pegnode.UserLine):
-                node_lists.append(
-                    self.__build_user(line_node))
-            elif isinstance(line_node, pegnode.GroupLine):
-                node_lists.append(
-                    self.__build_group(line_node))
-            else:
-                # may blank_line, comment_line
-                pass
+            # may blank_line, comment_line, which have no builder
+            builder = line_builders.get(type(line_node).__name__)
+            if builder is not None:
+                node_lists.append(builder(self, line_node))
         return node_lists
 
     def build_defaults(self, defaults_node):
@@ -121,7 +727,8 @@ class Parser(object):
             defaults_node.config_block)
         return config.Defaults(
             name=proxy_name,
-            config_block=config_block_lines)
+            config_block=config_block_lines,
+            lineno=self.__lineno(defaults_node))
 
     def build_userlist(self, userlist_node):
         """parse `userlist` sections, and return a config.Userlist"""
@@ -130,7 +737,8 @@ class Parser(object):
             userlist_node.config_block)
         return config.Userlist(
             name=proxy_name,
-            config_block=config_block_lines)
+            config_block=config_block_lines,
+            lineno=self.__lineno(userlist_node))
 
     def build_listen(self, listen_node):
         """parse `listen` sections, and return a config.Listen
@@ -149,23 +757,15 @@ class Parser(object):
             listen_node.config_block)
 
         # parse host and port
-        host, port = '', ''
         if isinstance(service_address_node, pegnode.ServiceAddress):
             host = service_address_node.host.text
             port = service_address_node.port.text
         else:
-            # use `bind` in config lines to fill in host and port
-            # just use the first
-            for line in config_block_lines:
-                if isinstance(line, config.Bind):
-                    host, port = line.host, line.port
-                    break
-            else:
-                raise Exception(
-                    'Not specify host and port in `listen` definition')
+            host, port = self.__bind_address(config_block_lines, 'listen')
         return config.Listen(
             name=proxy_name, host=host, port=port,
-            config_block=config_block_lines)
+            config_block=config_block_lines,
+            lineno=self.__lineno(listen_node))
 
     def build_frontend(self, frontend_node):
         """parse `frontend` sections, and return a config.Frontend
@@ -187,23 +787,15 @@ class Parser(object):
             frontend_node.config_block)
 
         # parse host and port
-        host, port = '', ''
         if isinstance(service_address_node, pegnode.ServiceAddress):
             host = service_address_node.host.text
             port = service_address_node.port.text
         else:
-            # use `bind` in config lines to fill in host and port
-            # just use the first
-            for line in config_block_lines:
-                if isinstance(line, config.Bind):
-                    host, port = line.host, line.port
-                    break
-            else:
-                raise Exception(
-                    'Not specify host and port in `frontend` definition')
+            host, port = self.__bind_address(config_block_lines, 'frontend')
         return config.Frontend(
             name=proxy_name, host=host, port=port,
-            config_block=config_block_lines)
+            config_block=config_block_lines,
+            lineno=self.__lineno(frontend_node))
 
     def build_backend(self, backend_node):
         """parse `backend` sections
@@ -217,7 +809,248 @@ class Parser(object):
         proxy_name = backend_node.backend_header.proxy_name.text
         config_block_lines = self.__build_config_block(
             backend_node.config_block)
-        return config.Backend(name=proxy_name, config_block=config_block_lines)
+        return config.Backend(name=proxy_name, config_block=config_block_lines,
+                              lineno=self.__lineno(backend_node))
+
+    def __bind_address(self, config_block_lines, section_type):
+        """use `bind` in config lines to fill in host and port, just use
+        the first one
+
+        Raises:
+            Exception: when there is no `bind` line
+        """
+        for line in config_block_lines:
+            if isinstance(line, config.Bind):
+                return line.host, line.port
+        raise Exception(
+            'Not specify host and port in `%s` definition' % section_type)
+
+    def __build_sections_actions(self, filestring, first_lineno):
+        """Parse `filestring` with the grammar `Actions`, which build the
+        config objects while parsing
+        """
+        actions = Actions(pegnode.LineIndex(filestring, first_lineno))
+        return [self.__build_section(header, config_block_lines)
+                for header, config_block_lines in pegnode.parse(
+                    filestring, actions=actions, first_lineno=first_lineno)]
+
+    def __build_sections_fast(self, filestring, first_lineno, errors=None):
+        """Tokenize `filestring` line by line
+
+        The first keyword of each line tells its type, and a regex of the
+        same shape as the rule in haproxy.peg picks the fields. Lines which
+        don't match are handed to the PEG grammar.
+
+        With `errors` given, the errors are appended to it instead of raised,
+        and the parsing goes on after the line, or for a section header
+        after the section, and so do the sections which can't be built.
+
+        Raises:
+            pegnode.ParseError: when the PEG grammar can't parse a line either
+        """
+        offset = 0
+        line_index = pegnode.LineIndex(filestring, first_lineno)
+        actions = Actions(line_index)
+        peg_parser = pegnode.Parser(
+            filestring, actions, None, first_lineno=first_lineno)
+        # [(header, config_block_lines), ...], the objects are built after
+        # the whole file is tokenized, so a ParseError wins like in the PEG
+        sections, config_block_lines = [], []
+
+        while offset < len(filestring):
+            token = TOKEN_REGEX.match(filestring, offset).group(1)
+            # in a section, the PEG reads some `userlist...` lines as `user`
+            # lines, which are left to it
+            if token in SECTION_HEADER_REGEXES and not (
+                    sections and token == 'userlist' and
+                    USER_LINE_REGEX.match(filestring, offset)):
+                match = SECTION_HEADER_REGEXES[token].match(filestring, offset)
+                if match:
+                    config_block_lines = []
+                    sections.append((self.__read_header_match(
+                        token, match, line_index.lineno(offset)),
+                        config_block_lines))
+                    offset = match.end()
+                    continue
+            elif not token:
+                match = COMMENT_OR_BLANK_LINE_REGEX.match(filestring, offset)
+                if match:
+                    offset = match.end()
+                    continue
+            elif sections:
+                line, end = self.__build_line_fast(
+                    filestring, token, offset, line_index.lineno(offset))
+                if line is not None:
+                    config_block_lines.append(line)
+                    offset = end
+                    continue
+
+            # fall back to the PEG grammar for this line only, as a config
+            # line first, then as a section header
+            if sections:
+                line, end = peg_parser.read('block_line', offset)
+                if end > offset:
+                    # comment and blank lines have no config object
+                    if line is not None:
+                        config_block_lines.append(line)
+                    offset = end
+                    continue
+            for section_type in SECTION_KEYWORDS:
+                if token.startswith(section_type):
+                    header_node, end = peg_parser.read(
+                        section_type + '_header', offset)
+                    if header_node is not None:
+                        config_block_lines = []
+                        sections.append((
+                            actions.header(section_type, header_node),
+                            config_block_lines))
+                        offset = end
+                        break
+            else:
+                if errors is None:
+                    raise peg_parser.error()
+                errors.append(peg_parser.error())
+                peg_parser.reset_failure()
+                offset = self.__skip_failed_line(filestring, token, offset)
+
+        if errors is None:
+            return [self.__build_section(header, config_block_lines)
+                    for header, config_block_lines in sections]
+        built_sections = []
+        for header, config_block_lines in sections:
+            try:
+                built_sections.append(
+                    self.__build_section(header, config_block_lines))
+            except Exception as e:
+                errors.append(e)
+        return built_sections
+
+    def __skip_failed_line(self, filestring, token, offset):
+        """Returns:
+            int: the offset after the line at `offset`, or when it's a
+                section header, the offset of the next section
+        """
+        line_end = filestring.find('\n', offset)
+        if line_end < 0:
+            return len(filestring)
+        if not token.startswith(SECTION_KEYWORDS):
+            return line_end + 1
+        for match in SECTION_HEADER_LINE_REGEX.finditer(
+                filestring, line_end + 1):
+            if not self.__is_user_line(filestring, match):
+                return match.start()
+        return len(filestring)
+
+    def __read_header_match(self, section_type, match, lineno):
+        """Returns:
+            (section_type, name, (host, port) or None, lineno)
+        """
+        if section_type == 'global':
+            return section_type, None, None, lineno
+        service_address = None
+        if section_type in ('listen', 'frontend') and match.group('host'):
+            service_address = match.group('host'), match.group('port')
+        # the empty name is of the type of the text, as with the peg engine
+        name = match.group('name') or match.string[:0]
+        return section_type, name, service_address, lineno
+
+    def __build_section(self, header, config_block_lines):
+        section_type, name, service_address, lineno = header
+        if section_type == 'global':
+            return config.Global(config_block=config_block_lines,
+                                 lineno=lineno)
+        elif section_type == 'defaults':
+            return config.Defaults(
+                name=name, config_block=config_block_lines, lineno=lineno)
+        elif section_type == 'userlist':
+            return config.Userlist(
+                name=name, config_block=config_block_lines, lineno=lineno)
+        elif section_type == 'backend':
+            return config.Backend(
+                name=name, config_block=config_block_lines, lineno=lineno)
+
+        host, port = service_address or self.__bind_address(
+            config_block_lines, section_type)
+        if section_type == 'listen':
+            return config.Listen(
+                name=name, host=host, port=port,
+                config_block=config_block_lines, lineno=lineno)
+        return config.Frontend(
+            name=name, host=host, port=port,
+            config_block=config_block_lines, lineno=lineno)
+
+    def __build_line_fast(self, filestring, token, offset, lineno):
+        """Build the config line starting at `offset` by its first keyword
+
+        Returns:
+            (config line, end offset), the line is None when the fast
+                regexes can't tell the line type
+        """
+        line = None
+        if token == 'server':
+            match = SERVER_LINE_REGEX.match(filestring, offset)
+            if match:
+                line = config.Server(
+                    name=match.group('name'), host=match.group('host'),
+                    port=match.group('port'),
+                    attributes=match.group('value').split(' \t'),
+                    lineno=lineno)
+        elif token == 'option':
+            match = OPTION_LINE_REGEX.match(filestring, offset)
+            if match:
+                line = config.Option(keyword=match.group('keyword'),
+                                     value=match.group('value'),
+                                     lineno=lineno)
+        elif token == 'bind':
+            match = BIND_LINE_REGEX.match(filestring, offset)
+            if match:
+                line = config.Bind(
+                    host=match.group('host'), port=match.group('port'),
+                    attributes=match.group('value').split(' \t'),
+                    lineno=lineno)
+        elif token == 'acl':
+            match = ACL_LINE_REGEX.match(filestring, offset)
+            if match:
+                line = config.Acl(name=match.group('name'),
+                                  value=match.group('value'), lineno=lineno)
+        elif token in ('use_backend', 'default_backend'):
+            match = BACKEND_LINE_REGEX.match(filestring, offset)
+            if match:
+                line = config.UseBackend(
+                    backend_name=match.group('name'),
+                    operator=match.group('operator') or filestring[:0],
+                    backend_condition=match.group('value'),
+                    is_default=(token == 'default_backend'),
+                    lineno=lineno)
+        elif token == 'group':
+            match = GROUP_LINE_REGEX.match(filestring, offset)
+            if match:
+                users_fragment = match.group('value')
+                line = config.Group(
+                    name=match.group('name'),
+                    user_names=(users_fragment.split(',')
+                                if users_fragment else []),
+                    lineno=lineno)
+        elif token == 'user':
+            match = USER_LINE_REGEX.match(filestring, offset)
+            if match:
+                groups_fragment = match.group('value')
+                line = config.User(
+                    name=match.group('name'),
+                    passwd=match.group('password'),
+                    passwd_type=match.group('passwd_type'),
+                    group_names=(groups_fragment.split(',')
+                                 if groups_fragment else []),
+                    lineno=lineno)
+        elif not token.startswith(RESERVED_PREFIXES):
+            match = CONFIG_LINE_REGEX.match(filestring, offset)
+            if match:
+                line = config.Config(keyword=match.group('keyword'),
+                                     value=match.group('value'),
+                                     lineno=lineno)
+        if line is None:
+            return None, offset
+        return line, match.end()
 
     def __build_server(self, server_node):
         server_name = server_node.server_name.text
@@ -229,27 +1062,31 @@ class Parser(object):
         server_attributes = server_node.value.text.split(' \t')
         return config.Server(
             name=server_name, host=host, port=port,
-            attributes=server_attributes)
+            attributes=server_attributes, lineno=self.__lineno(server_node))
 
     def __build_config(self, config_node):
         return config.Config(keyword=config_node.keyword.text,
-                             value=config_node.value.text)
+                             value=config_node.value.text,
+                             lineno=self.__lineno(config_node))
 
     def __build_option(self, option_node):
         return config.Option(keyword=option_node.keyword.text,
-                             value=option_node.value.text)
+                             value=option_node.value.text,
+                             lineno=self.__lineno(option_node))
 
     def __build_bind(self, bind_node):
         service_address = bind_node.service_address
         return config.Bind(
             host=service_address.host.text,
             port=service_address.port.text,
-            attributes=bind_node.value.text.split(' \t'))
+            attributes=bind_node.value.text.split(' \t'),
+            lineno=self.__lineno(bind_node))
 
     def __build_acl(self, acl_node):
         acl_name = acl_node.acl_name.text
         acl_value = acl_node.value.text
-        return config.Acl(name=acl_name, value=acl_value)
+        return config.Acl(name=acl_name, value=acl_value,
+                          lineno=self.__lineno(acl_node))
 
     def __build_usebackend(self, usebackend_node):
         operator = usebackend_node.operator.text
@@ -259,7 +1096,8 @@ class Parser(object):
             backend_name=usebackend_node.backend_name.text,
             operator=operator,
             backend_condition=usebackend_node.backend_condition.text,
-            is_default=(backendtype == 'default_backend'))
+            is_default=(backendtype == 'default_backend'),
+            lineno=self.__lineno(usebackend_node))
 
     def __build_user(self, user_node):
         groups_fragment = user_node.groups_fragment.text
@@ -268,18 +1106,220 @@ class Parser(object):
             name=user_node.user_name.text,
             passwd=user_node.password.text,
             passwd_type=user_node.passwd_type.text,
-            group_names=group_names)
+            group_names=group_names,
+            lineno=self.__lineno(user_node))
 
     def __build_group(self, group_node):
         users_fragment = group_node.users_fragment.text
         user_names = users_fragment.split(',') if users_fragment else []
         return config.Group(
             name=group_node.group_name.text,
-            user_names=user_names)
+            user_names=user_names,
+            lineno=self.__lineno(group_node))
+
+    def close(self):
+        """Unmap the file mapped by `use_mmap`, it's mapped again when
+        `filestring` is accessed
+        """
+        if isinstance(self.__filestring, mmap.mmap):
+            self.__filestring.close()
+            self.filestring = None
 
     def __read_string_from_file(self, filepath):
         filestring = ''
         if os.path.exists(filepath):
+            if self.use_mmap:
+                return self.__map_file(filepath)
             with open(filepath) as f:
                 filestring = f.read()
         return filestring
+
+    def __map_file(self, filepath):
+        with open(filepath, 'rb') as f:
+            # an empty file can't be mapped
+            if not os.fstat(f.fileno()).st_size:
+                return b''
+            # the mapping stays valid after the file is closed
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # the builders of the sections and of the config lines of the peg-tree,
+    # by the name of the node type: builder(parser, node) returns the config
+    # object. The names keep the grammar from being imported with this module
+    section_builders = {
+        'GlobalSection': build_global,
+        'DefaultsSection': build_defaults,
+        'UserlistSection': build_userlist,
+        'ListenSection': build_listen,
+        'FrontendSection': build_frontend,
+        'BackendSection': build_backend,
+    }
+    line_builders = {
+        'ConfigLine': __build_config,
+        'OptionLine': __build_option,
+        'ServerLine': __build_server,
+        'BindLine': __build_bind,
+        'AclLine': __build_acl,
+        'BackendLine': __build_usebackend,
+        'UserLine': __build_user,
+        'GroupLine': __build_group,
+    }
+    # the builders of the grammar, which the other engines build the same
+    # lines as
+    __grammar_line_builders = dict(line_builders)
+
+    @classmethod
+    def register_line_builder(cls, node_type, builder):
+        """Build the config lines of the `node_type` nodes of the peg-tree
+        by `builder(parser, node)`, with the 'peg' engine. The other engines
+        and `recover` raise once a builder is registered
+
+        The registry is copied to `cls` first, so registering on a subclass
+        leaves the ones of its bases alone.
+        """
+        if 'line_builders' not in vars(cls):
+            cls.line_builders = dict(cls.line_builders)
+        cls.line_builders[node_type.__name__] = builder
+
+
+def _read_chunks(fileobj, chunk_size):
+    """Yield the text of `fileobj`, `chunk_size` at a time"""
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def _decode_chunks(buffer, chunk_size):
+    """Yield the utf-8 text of the bytes-like `buffer`, decoded from slices
+    of `chunk_size` bytes, a char split between two slices is decoded with
+    the second one
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for offset in range(0, len(buffer), chunk_size):
+        chunk = decoder.decode(buffer[offset:offset + chunk_size])
+        if chunk:
+            yield chunk
+    decoder.decode(b'', final=True)
+
+
+def _build_sections(parser_type, filestring, engine, first_lineno):
+    """Parse the sections of `filestring` in a worker process of
+    `Parser.build_configuration(workers=N)`, by a `parser_type` parser, so
+    the builders registered on it are used
+    """
+    return list(parser_type(filestring=filestring).iter_sections(
+        engine=engine, first_lineno=first_lineno))
+
+
+class Actions(object):
+    """The grammar actions for `pegnode.parse`, each one builds the config
+    object of a rule right from its elements, so no peg-tree is kept.
+
+    The sections are returned as (header, config_block_lines), the header
+    being (section_type, name, (host, port) or None, lineno), and the comment
+    and blank lines as None.
+
+    Attributes:
+        line_index (pegnode.LineIndex): the line starts of the parsed input,
+            for the line numbers of the config objects
+    """
+    def __init__(self, line_index):
+        self.line_index = line_index
+
+    def configuration(self, input, offset, end, elements):
+        return [section for section in elements if section is not None]
+
+    def global_section(self, input, offset, end, elements):
+        return self.header('global', elements[0]), elements[1]
+
+    def defaults_section(self, input, offset, end, elements):
+        return self.header('defaults', elements[0]), elements[1]
+
+    def userlist_section(self, input, offset, end, elements):
+        return self.header('userlist', elements[0]), elements[1]
+
+    def listen_section(self, input, offset, end, elements):
+        return self.header('listen', elements[0]), elements[1]
+
+    def frontend_section(self, input, offset, end, elements):
+        return self.header('frontend', elements[0]), elements[1]
+
+    def backend_section(self, input, offset, end, elements):
+        return self.header('backend', elements[0]), elements[1]
+
+    def header(self, section_type, header_node):
+        """Returns:
+            (section_type, name, (host, port) or None, lineno)
+        """
+        lineno = self.line_index.lineno(header_node.offset)
+        if section_type == 'global':
+            return section_type, None, None, lineno
+        service_address = None
+        if section_type in ('listen', 'frontend'):
+            service_address_node = header_node.service_address
+            if isinstance(service_address_node, pegnode.ServiceAddress):
+                service_address = (service_address_node.host.text,
+                                   service_address_node.port.text)
+        return (section_type, header_node.proxy_name.text, service_address,
+                lineno)
+
+    def config_block(self, input, offset, end, elements):
+        return [line for line in elements if line is not None]
+
+    def server_line(self, input, offset, end, elements):
+        service_address = elements[5]
+        return config.Server(
+            name=elements[3].text,
+            host=service_address.host.text, port=service_address.port.text,
+            attributes=elements[6].text.split(' \t'),
+            lineno=self.line_index.lineno(offset))
+
+    def option_line(self, input, offset, end, elements):
+        return config.Option(keyword=elements[3].text, value=elements[5].text,
+                             lineno=self.line_index.lineno(offset))
+
+    def bind_line(self, input, offset, end, elements):
+        service_address = elements[3]
+        return config.Bind(
+            host=service_address.host.text, port=service_address.port.text,
+            attributes=elements[5].text.split(' \t'),
+            lineno=self.line_index.lineno(offset))
+
+    def acl_line(self, input, offset, end, elements):
+        return config.Acl(name=elements[3].text, value=elements[5].text,
+                          lineno=self.line_index.lineno(offset))
+
+    def backend_line(self, input, offset, end, elements):
+        return config.UseBackend(
+            backend_name=elements[3].text,
+            operator=elements[5].text,
+            backend_condition=elements[7].text,
+            is_default=(elements[1].text == 'default_backend'),
+            lineno=self.line_index.lineno(offset))
+
+    def group_line(self, input, offset, end, elements):
+        users_fragment = elements[6].text
+        return config.Group(
+            name=elements[3].text,
+            user_names=users_fragment.split(',') if users_fragment else [],
+            lineno=self.line_index.lineno(offset))
+
+    def user_line(self, input, offset, end, elements):
+        groups_fragment = elements[10].text
+        return config.User(
+            name=elements[3].text,
+            passwd=elements[7].text,
+            passwd_type=elements[5].text,
+            group_names=groups_fragment.split(',') if groups_fragment else [],
+            lineno=self.line_index.lineno(offset))
+
+    def config_line(self, input, offset, end, elements):
+        return config.Config(keyword=elements[2].text, value=elements[4].text,
+                             lineno=self.line_index.lineno(offset))
+
+    def comment_line(self, input, offset, end, elements):
+        return None
+
+    def blank_line(self, input, offset, end, elements):
+        return None
@@ -0,0 +1,1292 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Compile haproxy.peg into the parser module pegnode.py
+
+    $ python -m pyhaproxy.pegcompile            # write pegnode.py
+    $ python -m pyhaproxy.pegcompile --check    # exit 1 when it's outdated
+
+It reads the canopy grammar syntax, and emits the same kind of recursive
+descent parser as canopy does, with these optimizations:
+
+    * a run of a char class (`[ \\t]*`, `char*`) is matched by one regex
+    * `![...] .` is read as the negated char class
+    * the identical regexes are compiled once
+    * the rules which only read a terminal are inlined where they are
+      referenced, but for the memoized ones
+    * a choice of rules is dispatched on the first char of its input, after
+      the leading whitespace which all of its alternatives read
+
+The nodes of the sequences with named elements are built by a class named
+after the rule, eg: ServerLine for `server_line`, and each named element is
+an attribute of it. An element is named after the rule it references, or
+by a `label:` before it.
+"""
+from __future__ import print_function
+
+import io
+import os
+import re
+import sys
+
+
+GRAMMAR_FILEPATH = os.path.join(os.path.dirname(__file__), 'haproxy.peg')
+MODULE_FILEPATH = os.path.join(os.path.dirname(__file__), 'pegnode.py')
+
+# the rules memoized by the `selective` memo policy, only these ones are
+# tried more than once at the same offset when an alternative fails
+MEMO_RULES = [
+    'global_section', 'defaults_section', 'userlist_section',
+    'listen_section', 'frontend_section', 'backend_section',
+    'global_header', 'userlist_header', 'defaults_header', 'listen_header',
+    'frontend_header', 'backend_header',
+    'server_line', 'option_line', 'bind_line', 'acl_line', 'backend_line',
+    'group_line', 'user_line', 'config_line', 'comment_line', 'blank_line',
+]
+
+# the chars which the dispatch tables are built for, the other ones try all
+# the alternatives of a choice
+DISPATCH_CHARS = [chr(code) for code in range(128)]
+
+
+class GrammarError(Exception):
+    pass
+
+
+# The expressions of the grammar
+
+class Choice(object):
+    def __init__(self, alternatives):
+        self.alternatives = alternatives
+
+
+class Sequence(object):
+    def __init__(self, elements):
+        self.elements = elements
+
+
+class Label(object):
+    def __init__(self, name, expression):
+        self.name = name
+        self.expression = expression
+
+
+class Lookahead(object):
+    def __init__(self, positive, expression):
+        self.positive = positive
+        self.expression = expression
+
+
+class Optional(object):
+    def __init__(self, expression):
+        self.expression = expression
+
+
+class Repeat(object):
+    def __init__(self, expression, minimum):
+        self.expression = expression
+        self.minimum = minimum
+
+
+class Reference(object):
+    def __init__(self, name):
+        self.name = name
+
+
+class Literal(object):
+    def __init__(self, text):
+        self.text = text
+
+
+class CharClass(object):
+    """A char class, `expected` is recorded when it does not match, and
+    `expected_in_run` when a run of it ends
+    """
+    def __init__(self, pattern, expected, expected_in_run):
+        self.pattern = pattern
+        self.expected = expected
+        self.expected_in_run = expected_in_run
+
+
+class Run(object):
+    """A run of a char class, matched by a single regex"""
+    def __init__(self, char_class, minimum):
+        self.char_class = char_class
+        self.minimum = minimum
+
+
+class AnyChar(object):
+    pass
+
+
+TERMINALS = (Literal, CharClass, Run, AnyChar)
+
+
+# Reading the grammar
+
+TOKEN_REGEX = re.compile(r'''
+    \s*(?:
+        (?P<arrow><-)
+      | (?P<string>"(?:[^"\\]|\\.)*")
+      | (?P<class>\[(?:[^\]\\]|\\.)*\])
+      | (?P<name>[a-zA-Z_][a-zA-Z0-9_]*)
+      | (?P<symbol>[/()?*+&!:.])
+    )''', re.X)
+
+
+def tokenize(text):
+    tokens, offset = [], 0
+    text = text.rstrip()
+    while offset < len(text):
+        match = TOKEN_REGEX.match(text, offset)
+        if match is None:
+            raise GrammarError('unexpected char at %d: %r' % (
+                offset, text[offset:offset + 20]))
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        offset = match.end()
+    return tokens
+
+
+class GrammarReader(object):
+    """Read the rules of a grammar in the canopy syntax
+
+    Returns:
+        (grammar name, [(rule name, expression), ...])
+    """
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def read(self):
+        if self.tokens[:1] != [('name', 'grammar')]:
+            raise GrammarError('the grammar must start with its name')
+        self.position = 2
+        rules = []
+        while self.position < len(self.tokens):
+            name = self.expect('name')
+            self.expect('arrow')
+            rules.append((name, self.read_choice()))
+        return self.tokens[1][1], rules
+
+    def peek(self, offset=0):
+        position = self.position + offset
+        if position < len(self.tokens):
+            return self.tokens[position]
+        return None, None
+
+    def expect(self, kind, value=None):
+        token_kind, token_value = self.peek()
+        if token_kind != kind or value not in (None, token_value):
+            raise GrammarError('expected %s, got %r' % (
+                value or kind, token_value))
+        self.position += 1
+        return token_value
+
+    def read_choice(self):
+        alternatives = [self.read_sequence()]
+        while self.peek() == ('symbol', '/'):
+            self.position += 1
+            alternatives.append(self.read_sequence())
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return Choice(alternatives)
+
+    def read_sequence(self):
+        elements = []
+        while True:
+            kind, value = self.peek()
+            if kind is None or (kind == 'symbol' and value in '/)'):
+                break
+            if kind == 'name' and self.peek(1)[0] == 'arrow':
+                break
+            elements.append(self.read_labeled())
+        if not elements:
+            raise GrammarError('empty sequence')
+        if len(elements) == 1:
+            return elements[0]
+        return Sequence(elements)
+
+    def read_labeled(self):
+        if self.peek()[0] == 'name' and self.peek(1) == ('symbol', ':'):
+            name = self.expect('name')
+            self.position += 1
+            return Label(name, self.read_prefixed())
+        return self.read_prefixed()
+
+    def read_prefixed(self):
+        kind, value = self.peek()
+        if kind == 'symbol' and value in '&!':
+            self.position += 1
+            return Lookahead(value == '&', self.read_prefixed())
+        return self.read_suffixed()
+
+    def read_suffixed(self):
+        expression = self.read_primary()
+        kind, value = self.peek()
+        if kind == 'symbol' and value in '?*+':
+            self.position += 1
+            if value == '?':
+                return Optional(expression)
+            return Repeat(expression, 0 if value == '*' else 1)
+        return expression
+
+    def read_primary(self):
+        kind, value = self.peek()
+        self.position += 1
+        if kind == 'name':
+            return Reference(value)
+        elif kind == 'string':
+            return Literal(value[1:-1])
+        elif kind == 'class':
+            return CharClass(value, value, value)
+        elif (kind, value) == ('symbol', '.'):
+            return AnyChar()
+        elif (kind, value) == ('symbol', '('):
+            expression = self.read_choice()
+            self.expect('symbol', ')')
+            return expression
+        raise GrammarError('unexpected %r' % value)
+
+
+# Optimizing the grammar
+
+def optimize(rules):
+    """Rewrite the expressions of `rules` in place, see the module docstring
+    """
+    bodies = dict(rules)
+
+    def rewrite(expression):
+        if isinstance(expression, Choice):
+            expression.alternatives = [
+                rewrite(alternative)
+                for alternative in expression.alternatives]
+        elif isinstance(expression, Sequence):
+            expression.elements = [
+                rewrite(element) for element in expression.elements]
+            elements = expression.elements
+            if (len(elements) == 2 and
+                    isinstance(elements[0], Lookahead) and
+                    not elements[0].positive and
+                    isinstance(elements[0].expression, CharClass) and
+                    not elements[0].expression.pattern.startswith('[^') and
+                    isinstance(elements[1], AnyChar)):
+                # `![\n] .` is `[^\n]`, which stops a run without expecting
+                # anything, like the negative lookahead does
+                return CharClass(
+                    '[^' + elements[0].expression.pattern[1:],
+                    '<any char>', None)
+        elif isinstance(expression, (Label, Lookahead, Optional)):
+            expression.expression = rewrite(expression.expression)
+        elif isinstance(expression, Repeat):
+            inner = rewrite(expression.expression)
+            if isinstance(inner, Reference):
+                body = bodies[inner.name]
+                if isinstance(body, CharClass):
+                    inner = body
+            if isinstance(inner, CharClass):
+                return Run(inner, expression.minimum)
+            expression.expression = inner
+        return expression
+
+    # the referenced rules first, so `char*` sees the optimized `char`
+    for _ in range(2):
+        for position, (name, body) in enumerate(rules):
+            body = rewrite(body)
+            rules[position] = (name, body)
+            bodies[name] = body
+    return rules
+
+
+def first_chars(expression, bodies, visiting=()):
+    """The first chars the `expression` may start with
+
+    Returns:
+        ({char: set of literals, or None for any keyword}, nullable), or
+            None when they can't be told
+    """
+    if isinstance(expression, Literal):
+        if not expression.text:
+            return {}, True
+        if expression.text[0] not in DISPATCH_CHARS:
+            return None
+        return {expression.text[0]: set([expression.text])}, False
+    elif isinstance(expression, (CharClass, Run)):
+        char_class = (expression.char_class
+                      if isinstance(expression, Run) else expression)
+        regex = re.compile(char_class.pattern)
+        return (dict((char, None) for char in DISPATCH_CHARS
+                     if regex.match(char)),
+                isinstance(expression, Run) and expression.minimum == 0)
+    elif isinstance(expression, AnyChar):
+        return dict((char, None) for char in DISPATCH_CHARS), False
+    elif isinstance(expression, Lookahead):
+        return {}, True
+    elif isinstance(expression, (Label, Optional)):
+        result = first_chars(expression.expression, bodies, visiting)
+        if result is None:
+            return None
+        return result[0], (isinstance(expression, Optional) or result[1])
+    elif isinstance(expression, Repeat):
+        result = first_chars(expression.expression, bodies, visiting)
+        if result is None:
+            return None
+        return result[0], expression.minimum == 0 or result[1]
+    elif isinstance(expression, Reference):
+        if expression.name in visiting:
+            return None
+        return first_chars(bodies[expression.name], bodies,
+                           visiting + (expression.name,))
+
+    if isinstance(expression, Choice):
+        expressions, is_choice = expression.alternatives, True
+    else:
+        expressions, is_choice = expression.elements, False
+    chars, nullable = {}, not is_choice
+    for element in expressions:
+        result = first_chars(element, bodies, visiting)
+        if result is None:
+            return None
+        merge_chars(chars, result[0])
+        if is_choice:
+            nullable = nullable or result[1]
+        elif not result[1]:
+            return chars, False
+    return chars, nullable
+
+
+def merge_chars(chars, other):
+    for char, literals in other.items():
+        if literals is None or (char in chars and chars[char] is None):
+            chars[char] = None
+        else:
+            chars[char] = chars.get(char, set()) | literals
+
+
+def strip_leading(expression, skip, bodies):
+    """The elements of `expression` after its leading reference to `skip`
+
+    Returns:
+        [expression, ...], or None when it doesn't start with `skip`
+    """
+    if isinstance(expression, Reference):
+        if expression.name == skip:
+            return []
+        return strip_leading(bodies[expression.name], skip, bodies)
+    elif isinstance(expression, Label):
+        return strip_leading(expression.expression, skip, bodies)
+    elif isinstance(expression, Sequence):
+        rest = strip_leading(expression.elements[0], skip, bodies)
+        if rest is not None:
+            return rest + expression.elements[1:]
+    return None
+
+
+def leading_reference(expression, bodies):
+    while isinstance(expression, (Reference, Sequence, Label)):
+        if isinstance(expression, Reference):
+            body = bodies[expression.name]
+            if isinstance(body, Run) and body.minimum == 0:
+                return expression.name
+            expression = body
+        elif isinstance(expression, Sequence):
+            expression = expression.elements[0]
+        else:
+            expression = expression.expression
+    return None
+
+
+def dispatch_plan(choice, bodies):
+    """Tell how to dispatch a choice of rules on its first char
+
+    Returns:
+        (skip rule or None, [(rule, [(first_chars, literals), ...]), ...]),
+            or None when the choice can't be dispatched
+    """
+    if not all(isinstance(alternative, Reference)
+               for alternative in choice.alternatives):
+        return None
+    skips = set(leading_reference(alternative, bodies)
+                for alternative in choice.alternatives)
+    skip = skips.pop() if len(skips) == 1 else None
+
+    plan = []
+    for alternative in choice.alternatives:
+        if skip is None:
+            elements = [alternative]
+        else:
+            elements = strip_leading(alternative, skip, bodies)
+        result = first_chars(Sequence(elements), bodies) if elements else None
+        if result is None or result[1]:
+            return None
+        # group the chars which have the same literals
+        groups = []
+        for char in DISPATCH_CHARS:
+            if char not in result[0]:
+                continue
+            literals = result[0][char]
+            if literals is not None:
+                literals = tuple(sorted(literals))
+            for group in groups:
+                if group[1] == literals:
+                    group[0].append(char)
+                    break
+            else:
+                groups.append(([char], literals))
+        plan.append((alternative.name, [
+            (''.join(group_chars), literals)
+            for group_chars, literals in groups]))
+    return skip, plan
+
+
+# Emitting the parser
+
+def class_name(rule):
+    return ''.join(word.capitalize() for word in rule.split('_'))
+
+
+def element_names(sequence):
+    """Returns:
+        [(attribute name, element index), ...]: the last element of a name
+            wins
+    """
+    names = {}
+    for index, element in enumerate(sequence.elements):
+        if isinstance(element, Label):
+            names[element.name] = index
+        elif isinstance(element, Reference):
+            names[element.name] = index
+        elif (isinstance(element, Optional) and
+                isinstance(element.expression, Reference)):
+            names[element.expression.name] = index
+    return sorted(names.items(), key=lambda item: (item[1], item[0]))
+
+
+class Writer(object):
+    def __init__(self):
+        self.lines = []
+        self.depth = 0
+
+    def line(self, text=''):
+        self.lines.append(('    ' * self.depth + text) if text else '')
+
+    def indent(self):
+        self.depth += 1
+
+    def dedent(self):
+        self.depth -= 1
+
+
+class ParserCompiler(object):
+    """Emit the module from the optimized rules"""
+    def __init__(self, rules):
+        self.rules = rules
+        self.bodies = dict(rules)
+        self.root = rules[0][0]
+        self.regexes = []
+        self.node_classes = []
+        self.node_types = []
+        self.dispatch_tables = []
+        self.counters = None
+        self.rule = None
+
+    def compile(self):
+        methods = Writer()
+        methods.depth = 1
+        for rule, body in self.rules:
+            self.compile_rule(methods, rule, body)
+
+        writer = Writer()
+        writer.lines.append(MODULE_HEADER)
+        for name, names in self.node_classes:
+            self.emit_node_class(writer, name, names)
+        writer.lines.append(NODE_TYPES_HEADER)
+        for rule, node_type in self.node_types:
+            writer.line("    '%s': %s," % (rule, node_type))
+        writer.line('}')
+        writer.lines.append(MEMO_RULES_HEADER)
+        self.emit_words(writer, MEMO_RULES)
+        writer.line('])')
+        writer.lines.append(MEMO_POLICIES_AND_NOCACHE)
+        writer.line('class Grammar(object):')
+        for position, pattern in enumerate(self.regexes):
+            writer.line('    REGEX_%d = re.compile(%s)' % (
+                position + 1, quote(pattern)))
+        writer.lines.append(READ_DISPATCHED)
+        writer.lines.extend(methods.lines)
+        writer.lines.append(DISPATCH_TABLE_HEADER)
+        for name, plan in self.dispatch_tables:
+            writer.line('%s = dispatch_table([' % name)
+            for rule, groups in plan:
+                groups = ['(%s, %s)' % (quote(chars), quote(literals))
+                          for chars, literals in groups]
+                line = "    ('%s', [%s])," % (rule, ', '.join(groups))
+                if len(line) <= 79:
+                    writer.line(line)
+                    continue
+                writer.line("    ('%s', [" % rule)
+                for group in groups:
+                    writer.line('        %s,' % group)
+                writer.line('    ]),')
+            writer.line('])')
+            writer.line()
+        writer.lines.append(MODULE_FOOTER)
+        return '\n'.join(writer.lines) + '\n'
+
+    def emit_node_class(self, writer, name, names):
+        writer.line()
+        writer.line()
+        writer.line('class %s(TreeNode):' % name)
+        slots = ', '.join("'%s'" % attribute for attribute, _ in names)
+        if len(names) == 1:
+            slots += ','
+        if len('    __slots__ = (%s)' % slots) <= 79:
+            writer.line('    __slots__ = (%s)' % slots)
+        else:
+            writer.line('    __slots__ = (')
+            writer.depth = 1
+            self.emit_words(writer, [attribute for attribute, _ in names])
+            writer.depth = 0
+            writer.line('    )')
+        writer.line()
+        writer.line('    def __init__(self, input, offset, end, elements):')
+        writer.line('        super(%s, self).__init__(input, offset, end, '
+                    'elements)' % name)
+        for attribute, index in names:
+            writer.line('        self.%s = elements[%d]' % (attribute, index))
+
+    def emit_words(self, writer, words):
+        line = ''
+        for word in words:
+            item = "'%s'," % word
+            if line and len('    ' * writer.depth + '    ' + line + ' ' +
+                            item) > 79:
+                writer.line('    ' + line)
+                line = ''
+            line = (line + ' ' + item) if line else item
+        if line:
+            writer.line('    ' + line)
+
+    def regex(self, pattern):
+        if pattern not in self.regexes:
+            self.regexes.append(pattern)
+        return 'self.REGEX_%d' % (self.regexes.index(pattern) + 1)
+
+    def var(self, kind):
+        number = self.counters.get(kind, 0)
+        self.counters[kind] = number + 1
+        return '%s%d' % (kind, number)
+
+    def compile_rule(self, writer, rule, body):
+        self.rule, self.counters = rule, {}
+        address = self.var('address')
+        index = self.var('index')
+        writer.line('def _read_%s(self):' % rule)
+        writer.indent()
+        writer.line('%s, %s = FAILURE, self._offset' % (address, index))
+        writer.line("cached = self._cache['%s'].get(%s)" % (rule, index))
+        writer.line('if cached:')
+        writer.line('    self._offset = cached[1]')
+        writer.line('    return cached[0]')
+        if isinstance(body, (Sequence, Repeat)):
+            if isinstance(body, Sequence) and element_names(body):
+                self.node_classes.append(
+                    (class_name(rule), element_names(body)))
+                self.node_types.append((rule, class_name(rule)))
+            else:
+                self.node_types.append((rule, 'TreeNode'))
+            node_type = "self._nodes['%s']" % rule
+        else:
+            node_type = None
+        self.compile_expression(writer, body, address, node_type)
+        writer.line("self._cache['%s'][%s] = (%s, self._offset)" % (
+            rule, index, address))
+        writer.line('return %s' % address)
+        writer.dedent()
+        writer.line()
+
+    def compile_expression(self, writer, expression, address,
+                           node_type=None):
+        if isinstance(expression, Label):
+            expression = expression.expression
+        method = getattr(self, 'compile_' + type(expression).__name__)
+        if isinstance(expression, (Sequence, Repeat)):
+            method(writer, expression, address, node_type)
+        else:
+            method(writer, expression, address)
+
+    def expect(self, writer, expected):
+        writer.line('if self._offset > self._failure:')
+        writer.line('    self._failure = self._offset')
+        writer.line('    self._expected = []')
+        writer.line('if self._offset == self._failure:')
+        writer.line('    self._expected.append(%s)' % quote(expected))
+
+    def compile_Reference(self, writer, expression, address):
+        body = self.bodies[expression.name]
+        if isinstance(body, TERMINALS) and expression.name not in MEMO_RULES:
+            self.compile_expression(writer, body, address)
+        else:
+            writer.line('%s = self._read_%s()' % (address, expression.name))
+
+    def compile_Literal(self, writer, expression, address):
+        # a regex rather than str.startswith, which bytes-like inputs such as
+        # mmap do not have
+        size = len(expression.text)
+        writer.line('if %s.match(self._input, self._offset):' % self.regex(
+            regex_escape(expression.text)))
+        writer.line('    %s = TreeNode(self._input, self._offset, '
+                    'self._offset + %d)' % (address, size))
+        writer.line('    self._offset = self._offset + %d' % size)
+        writer.line('else:')
+        writer.indent()
+        writer.line('%s = FAILURE' % address)
+        self.expect(writer, '"%s"' % expression.text)
+        writer.dedent()
+
+    def compile_CharClass(self, writer, expression, address):
+        match = self.var('match')
+        writer.line('%s = %s.match(self._input, self._offset)' % (
+            match, self.regex(expression.pattern)))
+        writer.line('if %s:' % match)
+        writer.line('    %s = TreeNode(self._input, self._offset, '
+                    'self._offset + 1)' % address)
+        writer.line('    self._offset = self._offset + 1')
+        writer.line('else:')
+        writer.indent()
+        writer.line('%s = FAILURE' % address)
+        self.expect(writer, expression.expected)
+        writer.dedent()
+
+    def compile_AnyChar(self, writer, expression, address):
+        writer.line('if self._offset < self._input_size:')
+        writer.line('    %s = TreeNode(self._input, self._offset, '
+                    'self._offset + 1)' % address)
+        writer.line('    self._offset = self._offset + 1')
+        writer.line('else:')
+        writer.indent()
+        writer.line('%s = FAILURE' % address)
+        self.expect(writer, '<any char>')
+        writer.dedent()
+
+    def compile_Run(self, writer, expression, address):
+        char_class = expression.char_class
+        index, match = self.var('index'), self.var('match')
+        regex = self.regex(char_class.pattern + (
+            '*' if expression.minimum == 0 else '+'))
+        writer.line('%s = self._offset' % index)
+        if expression.minimum == 0 and char_class.expected_in_run is None:
+            writer.line('self._offset = %s.match(self._input, %s).end()' % (
+                regex, index))
+            writer.line('%s = TreeNode(self._input, %s, self._offset)' % (
+                address, index))
+            return
+        writer.line('%s = %s.match(self._input, %s)' % (match, regex, index))
+        writer.line('if %s:' % match)
+        writer.line('    self._offset = %s.end()' % match)
+        if char_class.expected_in_run is not None:
+            self.expect(writer, char_class.expected_in_run)
+        writer.line('if %s:' % match)
+        writer.line('    %s = TreeNode(self._input, %s, self._offset)' % (
+            address, index))
+        writer.line('else:')
+        writer.line('    %s = FAILURE' % address)
+
+    def compile_Optional(self, writer, expression, address):
+        index = self.var('index')
+        writer.line('%s = self._offset' % index)
+        self.compile_expression(writer, expression.expression, address)
+        writer.line('if %s is FAILURE:' % address)
+        writer.line('    %s = TreeNode(self._input, %s, %s)' % (
+            address, index, index))
+        writer.line('    self._offset = %s' % index)
+
+    def compile_Lookahead(self, writer, expression, address):
+        index, inner = self.var('index'), self.var('address')
+        writer.line('%s = self._offset' % index)
+        self.compile_expression(writer, expression.expression, inner)
+        writer.line('self._offset = %s' % index)
+        writer.line('if %s is %sFAILURE:' % (
+            inner, 'not ' if expression.positive else ''))
+        writer.line('    %s = TreeNode(self._input, self._offset, '
+                    'self._offset)' % address)
+        writer.line('else:')
+        writer.line('    %s = FAILURE' % address)
+
+    def compile_Choice(self, writer, expression, address):
+        plan = dispatch_plan(expression, self.bodies)
+        if plan is not None:
+            skip, alternatives = plan
+            name = '%s_DISPATCH' % self.rule.upper()
+            if any(table[0] == name for table in self.dispatch_tables):
+                name = '%s_%d_DISPATCH' % (
+                    self.rule.upper(), len(self.dispatch_tables))
+            skip_regex = 'None'
+            if skip is not None:
+                skip_regex = self.regex(
+                    self.bodies[skip].char_class.pattern + '*')
+            self.dispatch_tables.append((name, alternatives))
+            writer.line('%s = self._read_dispatched(%s, %s)' % (
+                address, skip_regex, name))
+            return
+
+        index = self.var('index')
+        writer.line('%s = self._offset' % index)
+        for position, alternative in enumerate(expression.alternatives):
+            if position:
+                writer.line('if %s is FAILURE:' % address)
+                writer.indent()
+                writer.line('self._offset = %s' % index)
+            self.compile_expression(writer, alternative, address)
+        writer.line('if %s is FAILURE:' % address)
+        writer.line('    self._offset = %s' % index)
+        writer.depth -= len(expression.alternatives) - 1
+
+    def compile_Sequence(self, writer, expression, address, node_type=None):
+        index, elements = self.var('index'), self.var('elements')
+        if node_type is None:
+            names = element_names(expression)
+            node_type = 'TreeNode'
+            if names:
+                node_type = 'TreeNode%d' % (len(self.node_classes) + 1)
+                self.node_classes.append((node_type, names))
+        writer.line('%s, %s = self._offset, []' % (index, elements))
+        for position, element in enumerate(expression.elements):
+            element_address = self.var('address')
+            self.compile_expression(writer, element, element_address)
+            writer.line('if %s is not FAILURE:' % element_address)
+            writer.indent()
+            writer.line('%s.append(%s)' % (elements, element_address))
+        for _ in expression.elements:
+            writer.dedent()
+            writer.line('else:')
+            writer.line('    %s = None' % elements)
+            writer.line('    self._offset = %s' % index)
+        writer.line('if %s is None:' % elements)
+        writer.line('    %s = FAILURE' % address)
+        writer.line('else:')
+        writer.line('    %s = %s(self._input, %s, self._offset, %s)' % (
+            address, node_type, index, elements))
+
+    def compile_Repeat(self, writer, expression, address, node_type=None):
+        remaining, index = self.var('remaining'), self.var('index')
+        elements, element_address = self.var('elements'), self.var('address')
+        writer.line('%s, %s, %s, %s = %d, self._offset, [], True' % (
+            remaining, index, elements, element_address, expression.minimum))
+        writer.line('while %s is not FAILURE:' % element_address)
+        writer.indent()
+        self.compile_expression(writer, expression.expression,
+                                element_address)
+        writer.line('if %s is not FAILURE:' % element_address)
+        writer.line('    %s.append(%s)' % (elements, element_address))
+        writer.line('    %s -= 1' % remaining)
+        if self.rule == self.root and node_type is not None:
+            # the elements of the root rule are never parsed again
+            writer.line("    if self._memo == 'selective':")
+            writer.line('        self._forget(self._offset)')
+        writer.dedent()
+        writer.line('if %s <= 0:' % remaining)
+        writer.line('    %s = %s(self._input, %s, self._offset, %s)' % (
+            address, node_type or 'TreeNode', index, elements))
+        writer.line('else:')
+        writer.line('    %s = FAILURE' % address)
+        writer.line('    self._offset = %s' % index)
+
+
+def regex_escape(text):
+    """re.escape, but only for the metacharacters, which it escapes alone
+    since Python 3.7 only
+    """
+    return ''.join('\\' + char if char in '.^$*+?{}[]\\|()' else char
+                   for char in text)
+
+
+def quote(value):
+    """The Python literal of a str, tuple of str or None, the same on
+    Python 2 and 3
+    """
+    if value is None:
+        return 'None'
+    if isinstance(value, tuple):
+        if len(value) == 1:
+            return '(%s,)' % quote(value[0])
+        return '(%s)' % ', '.join(quote(item) for item in value)
+    escapes = {'\\': '\\\\', "'": "\\'", '\n': '\\n', '\t': '\\t'}
+    return "'%s'" % ''.join(
+        escapes.get(char) or (char if ' ' <= char <= '~' else
+                              '\\x%02x' % ord(char))
+        for char in value)
+
+
+def generate(grammar_text):
+    """Returns:
+        str: the source of the parser module of `grammar_text`
+    """
+    _, rules = GrammarReader(grammar_text).read()
+    return ParserCompiler(optimize(rules)).compile()
+
+
+def read_file(filepath):
+    with io.open(filepath, encoding='utf-8') as f:
+        return f.read()
+
+
+def main(argv):
+    source = generate(read_file(GRAMMAR_FILEPATH))
+    if '--check' in argv:
+        if read_file(MODULE_FILEPATH) != source:
+            print('%s is out of date, run `python -m pyhaproxy.pegcompile`'
+                  % MODULE_FILEPATH)
+            return 1
+        return 0
+    with io.open(MODULE_FILEPATH, 'w', encoding='utf-8') as f:
+        f.write(source)
+    return 0
+
+
+MODULE_HEADER = '''\
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Generated from haproxy.peg by `python -m pyhaproxy.pegcompile`, do not edit
+
+from collections import defaultdict
+import bisect
+import re
+import time
+
+
+# the inputs which are parsed as text, the others are bytes-like: bytes,
+# bytearray, mmap or memoryview, read as utf-8
+TEXT_TYPES = (str, type(u''))
+
+
+class TreeNode(object):
+    """A node of the parsed tree, it only keeps the offsets of its text in
+    the shared input, the text is sliced when it is accessed, and decoded
+    when the input is bytes-like
+    """
+    __slots__ = ('input', 'offset', 'end', 'elements')
+
+    def __init__(self, input, offset, end, elements=None):
+        self.input = input
+        self.offset = offset
+        self.end = end
+        self.elements = elements or ()
+
+    @property
+    def text(self):
+        text = self.input[self.offset:self.end]
+        if not isinstance(text, TEXT_TYPES):
+            text = bytes(text).decode('utf-8')
+        return text
+
+    def __iter__(self):
+        for el in self.elements:
+            yield el'''
+
+NODE_TYPES_HEADER = '''
+
+class ParseError(SyntaxError):
+    """
+    Attributes:
+        position ((int, int)): the line number and the column, from 0, of
+            the failure, as `LineIndex.position` gives
+    """
+    position = None
+
+
+FAILURE = object()
+
+# the node type built by each rule from its elements, an `actions` object
+# replaces them with its methods of the same name, which are called like
+# the node types: action(input, offset, end, elements)
+NODE_TYPES = {'''
+
+MEMO_RULES_HEADER = '''
+# the rules memoized by the `selective` memo policy, only these ones are
+# tried more than once at the same offset when an alternative fails
+MEMO_RULES = frozenset(['''
+
+MEMO_POLICIES_AND_NOCACHE = '''
+MEMO_POLICIES = ('all', 'selective', 'none')
+
+
+class NoCache(dict):
+    """The cache of a rule which is not memoized, it never stores anything
+    """
+    def __setitem__(self, key, value):
+        pass
+
+'''
+
+READ_DISPATCHED = '''
+    def _read_dispatched(self, skip, table):
+        """Read the first alternative of an ordered choice which matches at
+        the offset
+
+        Only the rules whose literal starts the keyword after the leading
+        whitespace matched by `skip` are tried. When none of them matches,
+        the failures they recorded are undone and all the alternatives are
+        tried in order, without the cache, so the expected tokens of the
+        error are the same as without dispatching.
+        """
+        index0 = self._offset
+        failure, expected = self._failure, self._expected
+        expected_size = len(expected)
+        keyword_offset = index0
+        if skip is not None:
+            keyword_offset = skip.match(self._input, index0).end()
+        entries = ()
+        if keyword_offset < self._input_size:
+            entries = table.get(self._input[keyword_offset], ())
+        for literals, read in entries:
+            if literals and not literals.match(self._input, keyword_offset):
+                continue
+            address0 = getattr(self, read)()
+            if address0 is not FAILURE:
+                return address0
+            self._offset = index0
+
+        del expected[expected_size:]
+        self._failure, self._expected = failure, expected
+        cache, self._cache = self._cache, defaultdict(NoCache)
+        try:
+            for read in table.reads:
+                address0 = getattr(self, read)()
+                if address0 is not FAILURE:
+                    return address0
+                self._offset = index0
+        finally:
+            self._cache = cache
+        return FAILURE
+'''
+
+DISPATCH_TABLE_HEADER = '''
+
+class DispatchTable(dict):
+    """Map the first char of the input (after the leading whitespace) to the
+    alternatives of an ordered choice which may match it, the char is keyed
+    both as a str and as the int that indexing a bytes-like input gives
+
+    The alternatives are the names of their `_read_<rule>` methods, which
+    are looked up on the parser, so a subclass can wrap them.
+
+    Attributes:
+        reads (['_read_<rule>', ...]): all the alternatives, in order
+    """
+    def __init__(self, reads):
+        super(DispatchTable, self).__init__()
+        self.reads = reads
+
+
+def dispatch_table(alternatives):
+    """Args:
+        alternatives ([(rule, [(first_chars, literals), ...]), ...]): in the
+            order of the choice, `literals` is the tuple the input starts
+            with, None when any input starting with `first_chars` may match
+
+    Returns:
+        DispatchTable: {char: [(literals regex, '_read_<rule>'), ...]}
+    """
+    table = DispatchTable([])
+    for rule, groups in alternatives:
+        read = '_read_' + rule
+        table.reads.append(read)
+        for chars, literals in groups:
+            text_literals = bytes_literals = None
+            if literals is not None:
+                pattern = '|'.join(re.escape(literal) for literal in literals)
+                text_literals = re.compile(pattern)
+                bytes_literals = re.compile(pattern.encode('utf-8'))
+            for char in chars:
+                table.setdefault(char, []).append((text_literals, read))
+                table.setdefault(ord(char), []).append(
+                    (bytes_literals, read))
+    return table
+
+'''
+
+MODULE_FOOTER = '''
+BYTES_REGEXES = {}
+
+
+def bytes_regexes():
+    """Returns:
+        dict: {'REGEX_<n>': the Grammar regex compiled for bytes-like inputs}
+    """
+    if not BYTES_REGEXES:
+        for name, regex in vars(Grammar).items():
+            if name.startswith('REGEX_'):
+                BYTES_REGEXES[name] = re.compile(
+                    regex.pattern.encode('utf-8'))
+    return BYTES_REGEXES
+
+
+class Parser(Grammar):
+    """The `input` is a str, or a bytes-like object (bytes, bytearray, mmap
+    or memoryview) of utf-8 text, which is matched in place by the regexes
+    compiled for bytes, and only the text of the nodes which are read is
+    decoded. On Python 2, bytes is str and parsed as text, the other
+    bytes-like objects raise TypeError
+
+    The `memo` policy tells which rule results are kept in the packrat cache:
+        'all': every rule at every offset, until the parser is dropped
+        'selective': only the rules in MEMO_RULES, and the entries before
+            the end of the last parsed section are dropped
+        'none': nothing, alternatives are parsed again after a failure
+
+    The line numbers of the errors count from `first_lineno`, for an input
+    which is a part of a bigger file.
+    """
+    def __init__(self, input, actions, types, memo='selective',
+                 first_lineno=1):
+        if memo not in MEMO_POLICIES:
+            raise ValueError('unsupported memo policy: %s' % memo)
+        self._input = input
+        self._input_size = len(input)
+        if not isinstance(input, TEXT_TYPES):
+            if bytes is str:
+                # bytes is str on Python 2, which is parsed as the text
+                raise TypeError('bytes-like input is only supported on '
+                                'Python 3, got %s' % type(input).__name__)
+            self.__dict__.update(bytes_regexes())
+        self._actions = actions
+        self._types = types
+        self._offset = 0
+        self._nodes = dict(NODE_TYPES)
+        if actions is not None:
+            for rule in NODE_TYPES:
+                if hasattr(actions, rule):
+                    self._nodes[rule] = getattr(actions, rule)
+        self._memo = memo
+        if memo == 'all':
+            self._cache = defaultdict(dict)
+        else:
+            self._cache = defaultdict(NoCache)
+        if memo == 'selective':
+            for rule in MEMO_RULES:
+                self._cache[rule] = {}
+        self._failure = 0
+        self._expected = []
+        self._first_lineno = first_lineno
+        self._line_index = None
+
+    def parse(self):
+        tree = self._read_configuration()
+        if tree is not FAILURE and self._offset == self._input_size:
+            return tree
+        raise self.error()
+
+    def read(self, rule, offset):
+        """Read a single `rule` at `offset` of the input
+
+        Unlike `parse`, the rest of the input is left alone, so callers can
+        parse fragments (eg: one section header) of a bigger config.
+
+        Returns:
+            (TreeNode, int): the node and the offset it ends at, the node is
+                None when the rule does not match
+        """
+        self._offset = offset
+        node = getattr(self, '_read_' + rule)()
+        if node is FAILURE:
+            return None, offset
+        return node, self._offset
+
+    def error(self):
+        if not self._expected:
+            self._failure = self._offset
+            self._expected.append('<EOF>')
+        # rules which are not memoized record their failures once per try
+        expected = []
+        for item in self._expected:
+            if item not in expected:
+                expected.append(item)
+        error = ParseError(format_error(
+            self._input, self._failure, expected, self.line_index))
+        error.position = self.line_index.position(self._failure)
+        return error
+
+    def reset_failure(self):
+        """Forget the failures recorded so far, so that the next error only
+        reports the ones after
+        """
+        self._failure = 0
+        self._expected = []
+
+    @property
+    def line_index(self):
+        """LineIndex: the line starts of the input, built on first access
+        """
+        if self._line_index is None:
+            self._line_index = LineIndex(self._input, self._first_lineno)
+        return self._line_index
+
+    def _forget(self, offset):
+        """Drop the cached results before `offset`, the input up to there
+        is committed and never parsed again
+        """
+        for rule_cache in self._cache.values():
+            for index in [index for index in rule_cache if index < offset]:
+                del rule_cache[index]
+
+
+LINE_BREAK_REGEXES = (re.compile('\\n'), re.compile(b'\\n'))
+
+
+class LineIndex(object):
+    """The offsets where the lines of an input start, built in one pass, to
+    turn an offset into its line and column by a binary search
+
+    Attributes:
+        input (str or bytes-like): the indexed input
+        first_lineno (int): the line number of the first line of `input`,
+            for an input which is a part of a bigger file
+        starts ([int, ...]): the offset of each line
+    """
+    __slots__ = ('input', 'first_lineno', 'starts')
+
+    def __init__(self, input, first_lineno=1):
+        self.input = input
+        self.first_lineno = first_lineno
+        regex = LINE_BREAK_REGEXES[not isinstance(input, TEXT_TYPES)]
+        self.starts = [0]
+        self.starts.extend(match.end() for match in regex.finditer(input))
+
+    def lineno(self, offset):
+        """Returns:
+            int: the line number of `offset`
+        """
+        return bisect.bisect_right(self.starts, offset) + self.first_lineno - 1
+
+    def position(self, offset):
+        """Returns:
+            (int, int): the line number of `offset` and its column, from 0,
+                in chars for a str input and in bytes for a bytes-like one
+        """
+        index = bisect.bisect_right(self.starts, offset) - 1
+        return index + self.first_lineno, offset - self.starts[index]
+
+    def line(self, lineno):
+        """Returns:
+            str or bytes-like: the text of the line, without its line break
+        """
+        index = lineno - self.first_lineno
+        end = len(self.input)
+        if index + 1 < len(self.starts):
+            end = self.starts[index + 1] - 1
+        return self.input[self.starts[index]:end]
+
+
+class RuleProfile(object):
+    """The counters of a rule in a profiled parse
+
+    Attributes:
+        calls (int): the calls of `_read_<rule>`
+        hits (int): the calls answered by the memo cache
+        misses (int): the calls which parsed the input
+        failures (int): the calls which didn't match
+        time (float): the seconds spent in the rule, with the rules it reads
+        nodes (int): the nodes built by the node type or action of the rule
+    """
+    __slots__ = ('calls', 'hits', 'misses', 'failures', 'time', 'nodes')
+
+    def __init__(self):
+        self.calls = self.hits = self.misses = self.failures = self.nodes = 0
+        self.time = 0.0
+
+    def as_dict(self):
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+
+class ProfilingParser(Parser):
+    """A Parser which profiles each rule, the `_read_<rule>` methods and the
+    node types are wrapped on the instance, so the plain Parser pays nothing
+
+    Attributes:
+        profile ({rule: RuleProfile}): the counters of every rule
+    """
+    timer = getattr(time, 'perf_counter', time.time)
+
+    def __init__(self, input, actions, types, memo='selective',
+                 first_lineno=1):
+        super(ProfilingParser, self).__init__(
+            input, actions, types, memo, first_lineno)
+        self.profile = {}
+        for name in dir(Grammar):
+            if name.startswith('_read_') and name != '_read_dispatched':
+                rule = name[len('_read_'):]
+                self.profile[rule] = RuleProfile()
+                setattr(self, name, self._profiled_read(
+                    rule, getattr(self, name)))
+        for rule, node_type in list(self._nodes.items()):
+            self._nodes[rule] = self._profiled_node_type(
+                self.profile[rule], node_type)
+
+    def _profiled_read(self, rule, read):
+        profile, timer = self.profile[rule], self.timer
+
+        def profiled_read():
+            profile.calls += 1
+            if self._offset in self._cache[rule]:
+                profile.hits += 1
+            else:
+                profile.misses += 1
+            start = timer()
+            try:
+                address = read()
+            finally:
+                profile.time += timer() - start
+            if address is FAILURE:
+                profile.failures += 1
+            return address
+        return profiled_read
+
+    def _profiled_node_type(self, profile, node_type):
+        def profiled_node_type(input, offset, end, elements):
+            profile.nodes += 1
+            return node_type(input, offset, end, elements)
+        return profiled_node_type
+
+    def report(self):
+        """Returns:
+            {rule: {'calls': int, 'hits': int, 'misses': int, 'failures':
+                int, 'time': float, 'nodes': int}}: the rules which were
+                called
+        """
+        return dict((rule, profile.as_dict())
+                    for rule, profile in self.profile.items()
+                    if profile.calls)
+
+
+def format_error(input, offset, expected, line_index=None):
+    """Returns:
+        str: the message of the error at `offset`, the line number and the
+            line of the input, with a caret under the offset
+    """
+    line_index = line_index or LineIndex(input)
+    lineno, column = line_index.position(offset)
+    line = line_index.line(lineno)
+    if not isinstance(line, TEXT_TYPES):
+        # only the line of the error is decoded, the column counts chars
+        column = len(bytes(line[:column]).decode('utf-8', 'replace'))
+        line = bytes(line).decode('utf-8', 'replace')
+    return 'Line %d: expected %s\\n%s\\n%s^' % (
+        lineno, ', '.join(expected), line, ' ' * column)
+
+
+def parse(input, actions=None, types=None, memo='selective', profile=False,
+          first_lineno=1):
+    """The line numbers of the errors count from `first_lineno`
+
+    Returns:
+        TreeNode: the tree of the input, or the value of the `configuration`
+            action, and with `profile`, (tree, ProfilingParser.report())
+    """
+    if profile:
+        parser = ProfilingParser(input, actions, types, memo, first_lineno)
+        return parser.parse(), parser.report()
+    parser = Parser(input, actions, types, memo, first_lineno)
+    return parser.parse()'''
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
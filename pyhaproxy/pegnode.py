@@ -1,15 +1,37 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+# Generated from haproxy.peg by `python -m pyhaproxy.pegcompile`, do not edit
 
 from collections import defaultdict
+import bisect
 import re
+import time
+
+
+# the inputs which are parsed as text, the others are bytes-like: bytes,
+# bytearray, mmap or memoryview, read as utf-8
+TEXT_TYPES = (str, type(u''))
 
 
 class TreeNode(object):
-    def __init__(self, text, offset, elements=None):
-        self.text = text
+    """A node of the parsed tree, it only keeps the offsets of its text in
+    the shared input, the text is sliced when it is accessed, and decoded
+    when the input is bytes-like
+    """
+    __slots__ = ('input', 'offset', 'end', 'elements')
+
+    def __init__(self, input, offset, end, elements=None):
+        self.input = input
         self.offset = offset
-        self.elements = elements or []
+        self.end = end
+        self.elements = elements or ()
+
+    @property
+    def text(self):
+        text = self.input[self.offset:self.end]
+        if not isinstance(text, TEXT_TYPES):
+            text = bytes(text).decode('utf-8')
+        return text
 
     def __iter__(self):
         for el in self.elements:
@@ -17,243 +39,457 @@ class TreeNode(object):
 
 
 class GlobalSection(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(GlobalSection, self).__init__(text, offset, elements)
+    __slots__ = ('global_header', 'config_block')
+
+    def __init__(self, input, offset, end, elements):
+        super(GlobalSection, self).__init__(input, offset, end, elements)
         self.global_header = elements[0]
         self.config_block = elements[1]
 
 
 class DefaultsSection(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(DefaultsSection, self).__init__(text, offset, elements)
+    __slots__ = ('defaults_header', 'config_block')
+
+    def __init__(self, input, offset, end, elements):
+        super(DefaultsSection, self).__init__(input, offset, end, elements)
         self.defaults_header = elements[0]
         self.config_block = elements[1]
 
 
 class UserlistSection(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(UserlistSection, self).__init__(text, offset, elements)
+    __slots__ = ('userlist_header', 'config_block')
+
+    def __init__(self, input, offset, end, elements):
+        super(UserlistSection, self).__init__(input, offset, end, elements)
         self.userlist_header = elements[0]
         self.config_block = elements[1]
 
 
 class ListenSection(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(ListenSection, self).__init__(text, offset, elements)
+    __slots__ = ('listen_header', 'config_block')
+
+    def __init__(self, input, offset, end, elements):
+        super(ListenSection, self).__init__(input, offset, end, elements)
         self.listen_header = elements[0]
         self.config_block = elements[1]
 
 
 class FrontendSection(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(FrontendSection, self).__init__(text, offset, elements)
+    __slots__ = ('frontend_header', 'config_block')
+
+    def __init__(self, input, offset, end, elements):
+        super(FrontendSection, self).__init__(input, offset, end, elements)
         self.frontend_header = elements[0]
         self.config_block = elements[1]
 
 
 class BackendSection(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(BackendSection, self).__init__(text, offset, elements)
+    __slots__ = ('backend_header', 'config_block')
+
+    def __init__(self, input, offset, end, elements):
+        super(BackendSection, self).__init__(input, offset, end, elements)
         self.backend_header = elements[0]
         self.config_block = elements[1]
 
 
 class GlobalHeader(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(GlobalHeader, self).__init__(text, offset, elements)
+    __slots__ = ('whitespace', 'comment_text', 'line_break')
+
+    def __init__(self, input, offset, end, elements):
+        super(GlobalHeader, self).__init__(input, offset, end, elements)
         self.whitespace = elements[2]
+        self.comment_text = elements[3]
         self.line_break = elements[4]
 
 
 class UserlistHeader(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(UserlistHeader, self).__init__(text, offset, elements)
+    __slots__ = ('whitespace', 'proxy_name', 'comment_text', 'line_break')
+
+    def __init__(self, input, offset, end, elements):
+        super(UserlistHeader, self).__init__(input, offset, end, elements)
         self.whitespace = elements[2]
         self.proxy_name = elements[3]
+        self.comment_text = elements[4]
         self.line_break = elements[5]
 
 
 class DefaultsHeader(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(DefaultsHeader, self).__init__(text, offset, elements)
+    __slots__ = ('proxy_name', 'whitespace', 'comment_text', 'line_break')
+
+    def __init__(self, input, offset, end, elements):
+        super(DefaultsHeader, self).__init__(input, offset, end, elements)
+        self.proxy_name = elements[3]
         self.whitespace = elements[4]
+        self.comment_text = elements[5]
         self.line_break = elements[6]
-        self.proxy_name = elements[3]
 
 
 class ListenHeader(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(ListenHeader, self).__init__(text, offset, elements)
-        self.whitespace = elements[4]
+    __slots__ = (
+        'proxy_name', 'whitespace', 'service_address', 'value', 'comment_text',
+        'line_break',
+    )
+
+    def __init__(self, input, offset, end, elements):
+        super(ListenHeader, self).__init__(input, offset, end, elements)
         self.proxy_name = elements[3]
-        self.line_break = elements[8]
+        self.whitespace = elements[4]
         self.service_address = elements[5]
+        self.value = elements[6]
+        self.comment_text = elements[7]
+        self.line_break = elements[8]
 
 
 class FrontendHeader(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(FrontendHeader, self).__init__(text, offset, elements)
-        self.whitespace = elements[4]
+    __slots__ = (
+        'proxy_name', 'whitespace', 'service_address', 'value', 'comment_text',
+        'line_break',
+    )
+
+    def __init__(self, input, offset, end, elements):
+        super(FrontendHeader, self).__init__(input, offset, end, elements)
         self.proxy_name = elements[3]
-        self.line_break = elements[8]
+        self.whitespace = elements[4]
         self.service_address = elements[5]
+        self.value = elements[6]
+        self.comment_text = elements[7]
+        self.line_break = elements[8]
 
 
 class BackendHeader(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(BackendHeader, self).__init__(text, offset, elements)
-        self.whitespace = elements[4]
+    __slots__ = (
+        'proxy_name', 'whitespace', 'value', 'comment_text', 'line_break',
+    )
+
+    def __init__(self, input, offset, end, elements):
+        super(BackendHeader, self).__init__(input, offset, end, elements)
         self.proxy_name = elements[3]
+        self.whitespace = elements[4]
+        self.value = elements[5]
+        self.comment_text = elements[6]
         self.line_break = elements[7]
 
 
 class ServerLine(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(ServerLine, self).__init__(text, offset, elements)
-        self.whitespace = elements[4]
+    __slots__ = (
+        'server_name', 'whitespace', 'service_address', 'value',
+        'comment_text', 'line_break',
+    )
+
+    def __init__(self, input, offset, end, elements):
+        super(ServerLine, self).__init__(input, offset, end, elements)
         self.server_name = elements[3]
+        self.whitespace = elements[4]
         self.service_address = elements[5]
-        self.line_break = elements[8]
         self.value = elements[6]
+        self.comment_text = elements[7]
+        self.line_break = elements[8]
 
 
 class OptionLine(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(OptionLine, self).__init__(text, offset, elements)
-        self.whitespace = elements[4]
-        self.whitespaceplus = elements[2]
+    __slots__ = (
+        'keyword', 'whitespace', 'value', 'comment_text', 'line_break',
+    )
+
+    def __init__(self, input, offset, end, elements):
+        super(OptionLine, self).__init__(input, offset, end, elements)
         self.keyword = elements[3]
-        self.line_break = elements[7]
+        self.whitespace = elements[4]
         self.value = elements[5]
+        self.comment_text = elements[6]
+        self.line_break = elements[7]
 
 
 class BindLine(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(BindLine, self).__init__(text, offset, elements)
-        self.whitespace = elements[4]
+    __slots__ = (
+        'whitespaceplus', 'service_address', 'whitespace', 'value',
+        'comment_text', 'line_break',
+    )
+
+    def __init__(self, input, offset, end, elements):
+        super(BindLine, self).__init__(input, offset, end, elements)
+        self.whitespaceplus = elements[2]
         self.service_address = elements[3]
-        self.line_break = elements[7]
+        self.whitespace = elements[4]
         self.value = elements[5]
+        self.comment_text = elements[6]
+        self.line_break = elements[7]
 
 
 class AclLine(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(AclLine, self).__init__(text, offset, elements)
-        self.whitespace = elements[4]
+    __slots__ = (
+        'acl_name', 'whitespace', 'value', 'comment_text', 'line_break',
+    )
+
+    def __init__(self, input, offset, end, elements):
+        super(AclLine, self).__init__(input, offset, end, elements)
         self.acl_name = elements[3]
-        self.line_break = elements[7]
+        self.whitespace = elements[4]
         self.value = elements[5]
+        self.comment_text = elements[6]
+        self.line_break = elements[7]
 
 
 class BackendLine(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(BackendLine, self).__init__(text, offset, elements)
-        self.whitespace = elements[6]
+    __slots__ = (
+        'backendtype', 'backend_name', 'operator', 'whitespace',
+        'backend_condition', 'comment_text', 'line_break',
+    )
+
+    def __init__(self, input, offset, end, elements):
+        super(BackendLine, self).__init__(input, offset, end, elements)
+        self.backendtype = elements[1]
         self.backend_name = elements[3]
-        self.line_break = elements[9]
         self.operator = elements[5]
+        self.whitespace = elements[6]
         self.backend_condition = elements[7]
-        self.backendtype = elements[1]
+        self.comment_text = elements[8]
+        self.line_break = elements[9]
 
 
 class GroupLine(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(GroupLine, self).__init__(text, offset, elements)
-        self.whitespace = elements[4]
+    __slots__ = (
+        'group_name', 'whitespace', 'users_fragment', 'comment_text',
+        'line_break',
+    )
+
+    def __init__(self, input, offset, end, elements):
+        super(GroupLine, self).__init__(input, offset, end, elements)
         self.group_name = elements[3]
-        self.line_break = elements[8]
+        self.whitespace = elements[4]
         self.users_fragment = elements[6]
+        self.comment_text = elements[7]
+        self.line_break = elements[8]
 
 
 class TreeNode19(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(TreeNode19, self).__init__(text, offset, elements)
+    __slots__ = ('whitespace',)
+
+    def __init__(self, input, offset, end, elements):
+        super(TreeNode19, self).__init__(input, offset, end, elements)
         self.whitespace = elements[1]
 
 
 class UserLine(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(UserLine, self).__init__(text, offset, elements)
-        self.whitespace = elements[8]
+    __slots__ = (
+        'user_name', 'passwd_type', 'password', 'whitespace',
+        'groups_fragment', 'comment_text', 'line_break',
+    )
+
+    def __init__(self, input, offset, end, elements):
+        super(UserLine, self).__init__(input, offset, end, elements)
         self.user_name = elements[3]
+        self.passwd_type = elements[5]
         self.password = elements[7]
-        self.line_break = elements[12]
+        self.whitespace = elements[8]
         self.groups_fragment = elements[10]
-        self.passwd_type = elements[5]
+        self.comment_text = elements[11]
+        self.line_break = elements[12]
 
 
 class TreeNode21(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(TreeNode21, self).__init__(text, offset, elements)
+    __slots__ = ('whitespace',)
+
+    def __init__(self, input, offset, end, elements):
+        super(TreeNode21, self).__init__(input, offset, end, elements)
         self.whitespace = elements[1]
 
 
 class ConfigLine(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(ConfigLine, self).__init__(text, offset, elements)
-        self.whitespace = elements[3]
+    __slots__ = (
+        'keyword', 'whitespace', 'value', 'comment_text', 'line_break',
+    )
+
+    def __init__(self, input, offset, end, elements):
+        super(ConfigLine, self).__init__(input, offset, end, elements)
         self.keyword = elements[2]
-        self.line_break = elements[6]
+        self.whitespace = elements[3]
         self.value = elements[4]
+        self.comment_text = elements[5]
+        self.line_break = elements[6]
 
 
 class CommentLine(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(CommentLine, self).__init__(text, offset, elements)
+    __slots__ = ('whitespace', 'comment_text', 'line_break')
+
+    def __init__(self, input, offset, end, elements):
+        super(CommentLine, self).__init__(input, offset, end, elements)
         self.whitespace = elements[0]
         self.comment_text = elements[1]
         self.line_break = elements[2]
 
 
 class BlankLine(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(BlankLine, self).__init__(text, offset, elements)
+    __slots__ = ('whitespace', 'line_break')
+
+    def __init__(self, input, offset, end, elements):
+        super(BlankLine, self).__init__(input, offset, end, elements)
         self.whitespace = elements[0]
         self.line_break = elements[1]
 
 
-class Keyword(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(Keyword, self).__init__(text, offset, elements)
+class TreeNode25(TreeNode):
+    __slots__ = ('whitespace',)
+
+    def __init__(self, input, offset, end, elements):
+        super(TreeNode25, self).__init__(input, offset, end, elements)
         self.whitespace = elements[1]
 
 
 class ServiceAddress(TreeNode):
-    def __init__(self, text, offset, elements):
-        super(ServiceAddress, self).__init__(text, offset, elements)
+    __slots__ = ('host', 'port')
+
+    def __init__(self, input, offset, end, elements):
+        super(ServiceAddress, self).__init__(input, offset, end, elements)
         self.host = elements[0]
         self.port = elements[2]
 
 
 class ParseError(SyntaxError):
-    pass
+    """
+    Attributes:
+        position ((int, int)): the line number and the column, from 0, of
+            the failure, as `LineIndex.position` gives
+    """
+    position = None
 
 
 FAILURE = object()
 
+# the node type built by each rule from its elements, an `actions` object
+# replaces them with its methods of the same name, which are called like
+# the node types: action(input, offset, end, elements)
+NODE_TYPES = {
+    'configuration': TreeNode,
+    'global_section': GlobalSection,
+    'defaults_section': DefaultsSection,
+    'userlist_section': UserlistSection,
+    'listen_section': ListenSection,
+    'frontend_section': FrontendSection,
+    'backend_section': BackendSection,
+    'global_header': GlobalHeader,
+    'userlist_header': UserlistHeader,
+    'defaults_header': DefaultsHeader,
+    'listen_header': ListenHeader,
+    'frontend_header': FrontendHeader,
+    'backend_header': BackendHeader,
+    'config_block': TreeNode,
+    'server_line': ServerLine,
+    'option_line': OptionLine,
+    'bind_line': BindLine,
+    'acl_line': AclLine,
+    'backend_line': BackendLine,
+    'group_line': GroupLine,
+    'user_line': UserLine,
+    'config_line': ConfigLine,
+    'comment_line': CommentLine,
+    'blank_line': BlankLine,
+    'comment_text': TreeNode,
+    'keyword': TreeNode,
+    'service_address': ServiceAddress,
+    'ipv4_host': TreeNode,
+}
+
+# the rules memoized by the `selective` memo policy, only these ones are
+# tried more than once at the same offset when an alternative fails
+MEMO_RULES = frozenset([
+    'global_section', 'defaults_section', 'userlist_section', 'listen_section',
+    'frontend_section', 'backend_section', 'global_header', 'userlist_header',
+    'defaults_header', 'listen_header', 'frontend_header', 'backend_header',
+    'server_line', 'option_line', 'bind_line', 'acl_line', 'backend_line',
+    'group_line', 'user_line', 'config_line', 'comment_line', 'blank_line',
+])
+
+MEMO_POLICIES = ('all', 'selective', 'none')
+
+
+class NoCache(dict):
+    """The cache of a rule which is not memoized, it never stores anything
+    """
+    def __setitem__(self, key, value):
+        pass
+
 
 class Grammar(object):
-    REGEX_1 = re.compile('^[\\n]')
-    REGEX_2 = re.compile('^[a-z0-9\\-\\_\\.]')
-    REGEX_3 = re.compile('^[a-zA-z0-9\\-\\_\\.:]')
-    REGEX_4 = re.compile('^[a-zA-z0-9\\-\\_\\.:]')
-    REGEX_5 = re.compile('^[a-zA-z0-9\\-\\_\\.:]')
-    REGEX_6 = re.compile('^[a-zA-z0-9\\-\\_\\.:]')
-    REGEX_7 = re.compile('^[a-zA-z0-9\\-\\_\\.:]')
-    REGEX_8 = re.compile('^[^#\\n ]')
-    REGEX_9 = re.compile('^[^#\\n]')
-    REGEX_10 = re.compile('^[:]')
-    REGEX_11 = re.compile('^[\\d]')
-    REGEX_12 = re.compile('^[\\d]')
-    REGEX_13 = re.compile('^[\\d]')
-    REGEX_14 = re.compile('^[\\d]')
-    REGEX_15 = re.compile('^[\\d]')
-    REGEX_16 = re.compile('^[a-zA-Z\\-\\.\\d]')
-    REGEX_17 = re.compile('^[a-zA-Z0-9\\-\\_\\.:]')
-    REGEX_18 = re.compile('^[^#\\n]')
-    REGEX_19 = re.compile('^[\\n]')
-    REGEX_20 = re.compile('^[ \\t]')
-    REGEX_21 = re.compile('^[ \\t]')
+    REGEX_1 = re.compile('[ \\t]*')
+    REGEX_2 = re.compile('global')
+    REGEX_3 = re.compile('[\\n]')
+    REGEX_4 = re.compile('userlist')
+    REGEX_5 = re.compile('[a-zA-Z0-9\\-\\_\\.:]+')
+    REGEX_6 = re.compile('defaults')
+    REGEX_7 = re.compile('listen')
+    REGEX_8 = re.compile('[^#\\n]+')
+    REGEX_9 = re.compile('frontend')
+    REGEX_10 = re.compile('backend')
+    REGEX_11 = re.compile('server ')
+    REGEX_12 = re.compile('[a-zA-z0-9\\-\\_\\.:]+')
+    REGEX_13 = re.compile('option')
+    REGEX_14 = re.compile('bind')
+    REGEX_15 = re.compile('[ \\t]+')
+    REGEX_16 = re.compile('acl')
+    REGEX_17 = re.compile('use_backend')
+    REGEX_18 = re.compile('default_backend')
+    REGEX_19 = re.compile('if')
+    REGEX_20 = re.compile('unless')
+    REGEX_21 = re.compile('group')
+    REGEX_22 = re.compile('users')
+    REGEX_23 = re.compile('user')
+    REGEX_24 = re.compile('password')
+    REGEX_25 = re.compile('insecure-password')
+    REGEX_26 = re.compile('[^#\\n ]+')
+    REGEX_27 = re.compile('groups')
+    REGEX_28 = re.compile('#')
+    REGEX_29 = re.compile('[^\\n]*')
+    REGEX_30 = re.compile('errorfile')
+    REGEX_31 = re.compile('timeout')
+    REGEX_32 = re.compile('[a-z0-9\\-\\_\\.]+')
+    REGEX_33 = re.compile('[:]')
+    REGEX_34 = re.compile('[\\d]*')
+    REGEX_35 = re.compile('[\\d]+')
+    REGEX_36 = re.compile('\\.')
+    REGEX_37 = re.compile('[a-zA-Z\\-\\.\\d]+')
+    REGEX_38 = re.compile('\\*')
+    REGEX_39 = re.compile('[^\\n]')
+
+    def _read_dispatched(self, skip, table):
+        """Read the first alternative of an ordered choice which matches at
+        the offset
+
+        Only the rules whose literal starts the keyword after the leading
+        whitespace matched by `skip` are tried. When none of them matches,
+        the failures they recorded are undone and all the alternatives are
+        tried in order, without the cache, so the expected tokens of the
+        error are the same as without dispatching.
+        """
+        index0 = self._offset
+        failure, expected = self._failure, self._expected
+        expected_size = len(expected)
+        keyword_offset = index0
+        if skip is not None:
+            keyword_offset = skip.match(self._input, index0).end()
+        entries = ()
+        if keyword_offset < self._input_size:
+            entries = table.get(self._input[keyword_offset], ())
+        for literals, read in entries:
+            if literals and not literals.match(self._input, keyword_offset):
+                continue
+            address0 = getattr(self, read)()
+            if address0 is not FAILURE:
+                return address0
+            self._offset = index0
+
+        del expected[expected_size:]
+        self._failure, self._expected = failure, expected
+        cache, self._cache = self._cache, defaultdict(NoCache)
+        try:
+            for read in table.reads:
+                address0 = getattr(self, read)()
+                if address0 is not FAILURE:
+                    return address0
+                self._offset = index0
+        finally:
+            self._cache = cache
+        return FAILURE
 
     def _read_configuration(self):
         address0, index0 = FAILURE, self._offset
@@ -263,39 +499,17 @@ class Grammar(object):
             return cached[0]
         remaining0, index1, elements0, address1 = 0, self._offset, [], True
         while address1 is not FAILURE:
-            index2 = self._offset
-            address1 = self._read_comment_line()
-            if address1 is FAILURE:
-                self._offset = index2
-                address1 = self._read_blank_line()
-                if address1 is FAILURE:
-                    self._offset = index2
-                    address1 = self._read_global_section()
-                    if address1 is FAILURE:
-                        self._offset = index2
-                        address1 = self._read_defaults_section()
-                        if address1 is FAILURE:
-                            self._offset = index2
-                            address1 = self._read_userlist_section()
-                            if address1 is FAILURE:
-                                self._offset = index2
-                                address1 = self._read_listen_section()
-                                if address1 is FAILURE:
-                                    self._offset = index2
-                                    address1 = self._read_frontend_section()
-                                    if address1 is FAILURE:
-                                        self._offset = index2
-                                        address1 = self._read_backend_section()
-                                        if address1 is FAILURE:
-                                            self._offset = index2
+            address1 = self._read_dispatched(self.REGEX_1, CONFIGURATION_DISPATCH)
             if address1 is not FAILURE:
                 elements0.append(address1)
                 remaining0 -= 1
+                if self._memo == 'selective':
+                    self._forget(self._offset)
         if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['configuration'](self._input, index1, self._offset, elements0)
         else:
             address0 = FAILURE
+            self._offset = index1
         self._cache['configuration'][index0] = (address0, self._offset)
         return address0
 
@@ -306,11 +520,9 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
         address1 = self._read_global_header()
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
             address2 = self._read_config_block()
             if address2 is not FAILURE:
                 elements0.append(address2)
@@ -323,8 +535,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = GlobalSection(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['global_section'](self._input, index1, self._offset, elements0)
         self._cache['global_section'][index0] = (address0, self._offset)
         return address0
 
@@ -335,11 +546,9 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
         address1 = self._read_defaults_header()
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
             address2 = self._read_config_block()
             if address2 is not FAILURE:
                 elements0.append(address2)
@@ -352,8 +561,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = DefaultsSection(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['defaults_section'](self._input, index1, self._offset, elements0)
         self._cache['defaults_section'][index0] = (address0, self._offset)
         return address0
 
@@ -364,11 +572,9 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
         address1 = self._read_userlist_header()
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
             address2 = self._read_config_block()
             if address2 is not FAILURE:
                 elements0.append(address2)
@@ -381,8 +587,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = UserlistSection(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['userlist_section'](self._input, index1, self._offset, elements0)
         self._cache['userlist_section'][index0] = (address0, self._offset)
         return address0
 
@@ -393,11 +598,9 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
         address1 = self._read_listen_header()
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
             address2 = self._read_config_block()
             if address2 is not FAILURE:
                 elements0.append(address2)
@@ -410,8 +613,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = ListenSection(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['listen_section'](self._input, index1, self._offset, elements0)
         self._cache['listen_section'][index0] = (address0, self._offset)
         return address0
 
@@ -422,11 +624,9 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
         address1 = self._read_frontend_header()
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
             address2 = self._read_config_block()
             if address2 is not FAILURE:
                 elements0.append(address2)
@@ -439,8 +639,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = FrontendSection(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['frontend_section'](self._input, index1, self._offset, elements0)
         self._cache['frontend_section'][index0] = (address0, self._offset)
         return address0
 
@@ -451,11 +650,9 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
         address1 = self._read_backend_header()
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
             address2 = self._read_config_block()
             if address2 is not FAILURE:
                 elements0.append(address2)
@@ -468,8 +665,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = BackendSection(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['backend_section'](self._input, index1, self._offset, elements0)
         self._cache['backend_section'][index0] = (address0, self._offset)
         return address0
 
@@ -480,16 +676,23 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 6]
-            if chunk0 == 'global':
-                address2 = TreeNode(self._input[self._offset:self._offset + 6], self._offset)
+            if self.REGEX_2.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 6)
                 self._offset = self._offset + 6
             else:
                 address2 = FAILURE
@@ -500,20 +703,39 @@ class Grammar(object):
                     self._expected.append('"global"')
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_whitespace()
+                index3 = self._offset
+                match1 = self.REGEX_1.match(self._input, index3)
+                if match1:
+                    self._offset = match1.end()
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[ \\t]')
+                if match1:
+                    address3 = TreeNode(self._input, index3, self._offset)
+                else:
+                    address3 = FAILURE
                 if address3 is not FAILURE:
                     elements0.append(address3)
-                    address4 = FAILURE
-                    index2 = self._offset
+                    index4 = self._offset
                     address4 = self._read_comment_text()
                     if address4 is FAILURE:
-                        address4 = TreeNode(self._input[index2:index2], index2)
-                        self._offset = index2
+                        address4 = TreeNode(self._input, index4, index4)
+                        self._offset = index4
                     if address4 is not FAILURE:
                         elements0.append(address4)
-                        address5 = FAILURE
-                        address5 = self._read_line_break()
+                        match2 = self.REGEX_3.match(self._input, self._offset)
+                        if match2:
+                            address5 = TreeNode(self._input, self._offset, self._offset + 1)
+                            self._offset = self._offset + 1
+                        else:
+                            address5 = FAILURE
+                            if self._offset > self._failure:
+                                self._failure = self._offset
+                                self._expected = []
+                            if self._offset == self._failure:
+                                self._expected.append('[\\n]')
                         if address5 is not FAILURE:
                             elements0.append(address5)
                         else:
@@ -534,8 +756,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = GlobalHeader(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['global_header'](self._input, index1, self._offset, elements0)
         self._cache['global_header'][index0] = (address0, self._offset)
         return address0
 
@@ -546,16 +767,23 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 8]
-            if chunk0 == 'userlist':
-                address2 = TreeNode(self._input[self._offset:self._offset + 8], self._offset)
+            if self.REGEX_4.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 8)
                 self._offset = self._offset + 8
             else:
                 address2 = FAILURE
@@ -566,24 +794,54 @@ class Grammar(object):
                     self._expected.append('"userlist"')
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_whitespace()
+                index3 = self._offset
+                match1 = self.REGEX_1.match(self._input, index3)
+                if match1:
+                    self._offset = match1.end()
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[ \\t]')
+                if match1:
+                    address3 = TreeNode(self._input, index3, self._offset)
+                else:
+                    address3 = FAILURE
                 if address3 is not FAILURE:
                     elements0.append(address3)
-                    address4 = FAILURE
-                    address4 = self._read_proxy_name()
+                    index4 = self._offset
+                    match2 = self.REGEX_5.match(self._input, index4)
+                    if match2:
+                        self._offset = match2.end()
+                    if self._offset > self._failure:
+                        self._failure = self._offset
+                        self._expected = []
+                    if self._offset == self._failure:
+                        self._expected.append('[a-zA-Z0-9\\-\\_\\.:]')
+                    if match2:
+                        address4 = TreeNode(self._input, index4, self._offset)
+                    else:
+                        address4 = FAILURE
                     if address4 is not FAILURE:
                         elements0.append(address4)
-                        address5 = FAILURE
-                        index2 = self._offset
+                        index5 = self._offset
                         address5 = self._read_comment_text()
                         if address5 is FAILURE:
-                            address5 = TreeNode(self._input[index2:index2], index2)
-                            self._offset = index2
+                            address5 = TreeNode(self._input, index5, index5)
+                            self._offset = index5
                         if address5 is not FAILURE:
                             elements0.append(address5)
-                            address6 = FAILURE
-                            address6 = self._read_line_break()
+                            match3 = self.REGEX_3.match(self._input, self._offset)
+                            if match3:
+                                address6 = TreeNode(self._input, self._offset, self._offset + 1)
+                                self._offset = self._offset + 1
+                            else:
+                                address6 = FAILURE
+                                if self._offset > self._failure:
+                                    self._failure = self._offset
+                                    self._expected = []
+                                if self._offset == self._failure:
+                                    self._expected.append('[\\n]')
                             if address6 is not FAILURE:
                                 elements0.append(address6)
                             else:
@@ -607,8 +865,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = UserlistHeader(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['userlist_header'](self._input, index1, self._offset, elements0)
         self._cache['userlist_header'][index0] = (address0, self._offset)
         return address0
 
@@ -619,16 +876,23 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 8]
-            if chunk0 == 'defaults':
-                address2 = TreeNode(self._input[self._offset:self._offset + 8], self._offset)
+            if self.REGEX_6.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 8)
                 self._offset = self._offset + 8
             else:
                 address2 = FAILURE
@@ -639,32 +903,73 @@ class Grammar(object):
                     self._expected.append('"defaults"')
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_whitespace()
+                index3 = self._offset
+                match1 = self.REGEX_1.match(self._input, index3)
+                if match1:
+                    self._offset = match1.end()
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[ \\t]')
+                if match1:
+                    address3 = TreeNode(self._input, index3, self._offset)
+                else:
+                    address3 = FAILURE
                 if address3 is not FAILURE:
                     elements0.append(address3)
-                    address4 = FAILURE
-                    index2 = self._offset
-                    address4 = self._read_proxy_name()
+                    index4 = self._offset
+                    index5 = self._offset
+                    match2 = self.REGEX_5.match(self._input, index5)
+                    if match2:
+                        self._offset = match2.end()
+                    if self._offset > self._failure:
+                        self._failure = self._offset
+                        self._expected = []
+                    if self._offset == self._failure:
+                        self._expected.append('[a-zA-Z0-9\\-\\_\\.:]')
+                    if match2:
+                        address4 = TreeNode(self._input, index5, self._offset)
+                    else:
+                        address4 = FAILURE
                     if address4 is FAILURE:
-                        address4 = TreeNode(self._input[index2:index2], index2)
-                        self._offset = index2
+                        address4 = TreeNode(self._input, index4, index4)
+                        self._offset = index4
                     if address4 is not FAILURE:
                         elements0.append(address4)
-                        address5 = FAILURE
-                        address5 = self._read_whitespace()
+                        index6 = self._offset
+                        match3 = self.REGEX_1.match(self._input, index6)
+                        if match3:
+                            self._offset = match3.end()
+                        if self._offset > self._failure:
+                            self._failure = self._offset
+                            self._expected = []
+                        if self._offset == self._failure:
+                            self._expected.append('[ \\t]')
+                        if match3:
+                            address5 = TreeNode(self._input, index6, self._offset)
+                        else:
+                            address5 = FAILURE
                         if address5 is not FAILURE:
                             elements0.append(address5)
-                            address6 = FAILURE
-                            index3 = self._offset
+                            index7 = self._offset
                             address6 = self._read_comment_text()
                             if address6 is FAILURE:
-                                address6 = TreeNode(self._input[index3:index3], index3)
-                                self._offset = index3
+                                address6 = TreeNode(self._input, index7, index7)
+                                self._offset = index7
                             if address6 is not FAILURE:
                                 elements0.append(address6)
-                                address7 = FAILURE
-                                address7 = self._read_line_break()
+                                match4 = self.REGEX_3.match(self._input, self._offset)
+                                if match4:
+                                    address7 = TreeNode(self._input, self._offset, self._offset + 1)
+                                    self._offset = self._offset + 1
+                                else:
+                                    address7 = FAILURE
+                                    if self._offset > self._failure:
+                                        self._failure = self._offset
+                                        self._expected = []
+                                    if self._offset == self._failure:
+                                        self._expected.append('[\\n]')
                                 if address7 is not FAILURE:
                                     elements0.append(address7)
                                 else:
@@ -691,8 +996,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = DefaultsHeader(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['defaults_header'](self._input, index1, self._offset, elements0)
         self._cache['defaults_header'][index0] = (address0, self._offset)
         return address0
 
@@ -703,16 +1007,23 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 6]
-            if chunk0 == 'listen':
-                address2 = TreeNode(self._input[self._offset:self._offset + 6], self._offset)
+            if self.REGEX_7.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 6)
                 self._offset = self._offset + 6
             else:
                 address2 = FAILURE
@@ -723,44 +1034,95 @@ class Grammar(object):
                     self._expected.append('"listen"')
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_whitespace()
+                index3 = self._offset
+                match1 = self.REGEX_1.match(self._input, index3)
+                if match1:
+                    self._offset = match1.end()
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[ \\t]')
+                if match1:
+                    address3 = TreeNode(self._input, index3, self._offset)
+                else:
+                    address3 = FAILURE
                 if address3 is not FAILURE:
                     elements0.append(address3)
-                    address4 = FAILURE
-                    address4 = self._read_proxy_name()
+                    index4 = self._offset
+                    match2 = self.REGEX_5.match(self._input, index4)
+                    if match2:
+                        self._offset = match2.end()
+                    if self._offset > self._failure:
+                        self._failure = self._offset
+                        self._expected = []
+                    if self._offset == self._failure:
+                        self._expected.append('[a-zA-Z0-9\\-\\_\\.:]')
+                    if match2:
+                        address4 = TreeNode(self._input, index4, self._offset)
+                    else:
+                        address4 = FAILURE
                     if address4 is not FAILURE:
                         elements0.append(address4)
-                        address5 = FAILURE
-                        address5 = self._read_whitespace()
+                        index5 = self._offset
+                        match3 = self.REGEX_1.match(self._input, index5)
+                        if match3:
+                            self._offset = match3.end()
+                        if self._offset > self._failure:
+                            self._failure = self._offset
+                            self._expected = []
+                        if self._offset == self._failure:
+                            self._expected.append('[ \\t]')
+                        if match3:
+                            address5 = TreeNode(self._input, index5, self._offset)
+                        else:
+                            address5 = FAILURE
                         if address5 is not FAILURE:
                             elements0.append(address5)
-                            address6 = FAILURE
-                            index2 = self._offset
+                            index6 = self._offset
                             address6 = self._read_service_address()
                             if address6 is FAILURE:
-                                address6 = TreeNode(self._input[index2:index2], index2)
-                                self._offset = index2
+                                address6 = TreeNode(self._input, index6, index6)
+                                self._offset = index6
                             if address6 is not FAILURE:
                                 elements0.append(address6)
-                                address7 = FAILURE
-                                index3 = self._offset
-                                address7 = self._read_value()
+                                index7 = self._offset
+                                index8 = self._offset
+                                match4 = self.REGEX_8.match(self._input, index8)
+                                if match4:
+                                    self._offset = match4.end()
+                                if self._offset > self._failure:
+                                    self._failure = self._offset
+                                    self._expected = []
+                                if self._offset == self._failure:
+                                    self._expected.append('[^#\\n]')
+                                if match4:
+                                    address7 = TreeNode(self._input, index8, self._offset)
+                                else:
+                                    address7 = FAILURE
                                 if address7 is FAILURE:
-                                    address7 = TreeNode(self._input[index3:index3], index3)
-                                    self._offset = index3
+                                    address7 = TreeNode(self._input, index7, index7)
+                                    self._offset = index7
                                 if address7 is not FAILURE:
                                     elements0.append(address7)
-                                    address8 = FAILURE
-                                    index4 = self._offset
+                                    index9 = self._offset
                                     address8 = self._read_comment_text()
                                     if address8 is FAILURE:
-                                        address8 = TreeNode(self._input[index4:index4], index4)
-                                        self._offset = index4
+                                        address8 = TreeNode(self._input, index9, index9)
+                                        self._offset = index9
                                     if address8 is not FAILURE:
                                         elements0.append(address8)
-                                        address9 = FAILURE
-                                        address9 = self._read_line_break()
+                                        match5 = self.REGEX_3.match(self._input, self._offset)
+                                        if match5:
+                                            address9 = TreeNode(self._input, self._offset, self._offset + 1)
+                                            self._offset = self._offset + 1
+                                        else:
+                                            address9 = FAILURE
+                                            if self._offset > self._failure:
+                                                self._failure = self._offset
+                                                self._expected = []
+                                            if self._offset == self._failure:
+                                                self._expected.append('[\\n]')
                                         if address9 is not FAILURE:
                                             elements0.append(address9)
                                         else:
@@ -793,8 +1155,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = ListenHeader(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['listen_header'](self._input, index1, self._offset, elements0)
         self._cache['listen_header'][index0] = (address0, self._offset)
         return address0
 
@@ -805,16 +1166,23 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 8]
-            if chunk0 == 'frontend':
-                address2 = TreeNode(self._input[self._offset:self._offset + 8], self._offset)
+            if self.REGEX_9.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 8)
                 self._offset = self._offset + 8
             else:
                 address2 = FAILURE
@@ -825,44 +1193,95 @@ class Grammar(object):
                     self._expected.append('"frontend"')
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_whitespace()
+                index3 = self._offset
+                match1 = self.REGEX_1.match(self._input, index3)
+                if match1:
+                    self._offset = match1.end()
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[ \\t]')
+                if match1:
+                    address3 = TreeNode(self._input, index3, self._offset)
+                else:
+                    address3 = FAILURE
                 if address3 is not FAILURE:
                     elements0.append(address3)
-                    address4 = FAILURE
-                    address4 = self._read_proxy_name()
+                    index4 = self._offset
+                    match2 = self.REGEX_5.match(self._input, index4)
+                    if match2:
+                        self._offset = match2.end()
+                    if self._offset > self._failure:
+                        self._failure = self._offset
+                        self._expected = []
+                    if self._offset == self._failure:
+                        self._expected.append('[a-zA-Z0-9\\-\\_\\.:]')
+                    if match2:
+                        address4 = TreeNode(self._input, index4, self._offset)
+                    else:
+                        address4 = FAILURE
                     if address4 is not FAILURE:
                         elements0.append(address4)
-                        address5 = FAILURE
-                        address5 = self._read_whitespace()
+                        index5 = self._offset
+                        match3 = self.REGEX_1.match(self._input, index5)
+                        if match3:
+                            self._offset = match3.end()
+                        if self._offset > self._failure:
+                            self._failure = self._offset
+                            self._expected = []
+                        if self._offset == self._failure:
+                            self._expected.append('[ \\t]')
+                        if match3:
+                            address5 = TreeNode(self._input, index5, self._offset)
+                        else:
+                            address5 = FAILURE
                         if address5 is not FAILURE:
                             elements0.append(address5)
-                            address6 = FAILURE
-                            index2 = self._offset
+                            index6 = self._offset
                             address6 = self._read_service_address()
                             if address6 is FAILURE:
-                                address6 = TreeNode(self._input[index2:index2], index2)
-                                self._offset = index2
+                                address6 = TreeNode(self._input, index6, index6)
+                                self._offset = index6
                             if address6 is not FAILURE:
                                 elements0.append(address6)
-                                address7 = FAILURE
-                                index3 = self._offset
-                                address7 = self._read_value()
+                                index7 = self._offset
+                                index8 = self._offset
+                                match4 = self.REGEX_8.match(self._input, index8)
+                                if match4:
+                                    self._offset = match4.end()
+                                if self._offset > self._failure:
+                                    self._failure = self._offset
+                                    self._expected = []
+                                if self._offset == self._failure:
+                                    self._expected.append('[^#\\n]')
+                                if match4:
+                                    address7 = TreeNode(self._input, index8, self._offset)
+                                else:
+                                    address7 = FAILURE
                                 if address7 is FAILURE:
-                                    address7 = TreeNode(self._input[index3:index3], index3)
-                                    self._offset = index3
+                                    address7 = TreeNode(self._input, index7, index7)
+                                    self._offset = index7
                                 if address7 is not FAILURE:
                                     elements0.append(address7)
-                                    address8 = FAILURE
-                                    index4 = self._offset
+                                    index9 = self._offset
                                     address8 = self._read_comment_text()
                                     if address8 is FAILURE:
-                                        address8 = TreeNode(self._input[index4:index4], index4)
-                                        self._offset = index4
+                                        address8 = TreeNode(self._input, index9, index9)
+                                        self._offset = index9
                                     if address8 is not FAILURE:
                                         elements0.append(address8)
-                                        address9 = FAILURE
-                                        address9 = self._read_line_break()
+                                        match5 = self.REGEX_3.match(self._input, self._offset)
+                                        if match5:
+                                            address9 = TreeNode(self._input, self._offset, self._offset + 1)
+                                            self._offset = self._offset + 1
+                                        else:
+                                            address9 = FAILURE
+                                            if self._offset > self._failure:
+                                                self._failure = self._offset
+                                                self._expected = []
+                                            if self._offset == self._failure:
+                                                self._expected.append('[\\n]')
                                         if address9 is not FAILURE:
                                             elements0.append(address9)
                                         else:
@@ -895,8 +1314,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = FrontendHeader(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['frontend_header'](self._input, index1, self._offset, elements0)
         self._cache['frontend_header'][index0] = (address0, self._offset)
         return address0
 
@@ -907,16 +1325,23 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 7]
-            if chunk0 == 'backend':
-                address2 = TreeNode(self._input[self._offset:self._offset + 7], self._offset)
+            if self.REGEX_10.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 7)
                 self._offset = self._offset + 7
             else:
                 address2 = FAILURE
@@ -927,36 +1352,88 @@ class Grammar(object):
                     self._expected.append('"backend"')
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_whitespace()
-                if address3 is not FAILURE:
-                    elements0.append(address3)
-                    address4 = FAILURE
-                    address4 = self._read_proxy_name()
+                index3 = self._offset
+                match1 = self.REGEX_1.match(self._input, index3)
+                if match1:
+                    self._offset = match1.end()
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[ \\t]')
+                if match1:
+                    address3 = TreeNode(self._input, index3, self._offset)
+                else:
+                    address3 = FAILURE
+                if address3 is not FAILURE:
+                    elements0.append(address3)
+                    index4 = self._offset
+                    match2 = self.REGEX_5.match(self._input, index4)
+                    if match2:
+                        self._offset = match2.end()
+                    if self._offset > self._failure:
+                        self._failure = self._offset
+                        self._expected = []
+                    if self._offset == self._failure:
+                        self._expected.append('[a-zA-Z0-9\\-\\_\\.:]')
+                    if match2:
+                        address4 = TreeNode(self._input, index4, self._offset)
+                    else:
+                        address4 = FAILURE
                     if address4 is not FAILURE:
                         elements0.append(address4)
-                        address5 = FAILURE
-                        address5 = self._read_whitespace()
+                        index5 = self._offset
+                        match3 = self.REGEX_1.match(self._input, index5)
+                        if match3:
+                            self._offset = match3.end()
+                        if self._offset > self._failure:
+                            self._failure = self._offset
+                            self._expected = []
+                        if self._offset == self._failure:
+                            self._expected.append('[ \\t]')
+                        if match3:
+                            address5 = TreeNode(self._input, index5, self._offset)
+                        else:
+                            address5 = FAILURE
                         if address5 is not FAILURE:
                             elements0.append(address5)
-                            address6 = FAILURE
-                            index2 = self._offset
-                            address6 = self._read_value()
+                            index6 = self._offset
+                            index7 = self._offset
+                            match4 = self.REGEX_8.match(self._input, index7)
+                            if match4:
+                                self._offset = match4.end()
+                            if self._offset > self._failure:
+                                self._failure = self._offset
+                                self._expected = []
+                            if self._offset == self._failure:
+                                self._expected.append('[^#\\n]')
+                            if match4:
+                                address6 = TreeNode(self._input, index7, self._offset)
+                            else:
+                                address6 = FAILURE
                             if address6 is FAILURE:
-                                address6 = TreeNode(self._input[index2:index2], index2)
-                                self._offset = index2
+                                address6 = TreeNode(self._input, index6, index6)
+                                self._offset = index6
                             if address6 is not FAILURE:
                                 elements0.append(address6)
-                                address7 = FAILURE
-                                index3 = self._offset
+                                index8 = self._offset
                                 address7 = self._read_comment_text()
                                 if address7 is FAILURE:
-                                    address7 = TreeNode(self._input[index3:index3], index3)
-                                    self._offset = index3
+                                    address7 = TreeNode(self._input, index8, index8)
+                                    self._offset = index8
                                 if address7 is not FAILURE:
                                     elements0.append(address7)
-                                    address8 = FAILURE
-                                    address8 = self._read_line_break()
+                                    match5 = self.REGEX_3.match(self._input, self._offset)
+                                    if match5:
+                                        address8 = TreeNode(self._input, self._offset, self._offset + 1)
+                                        self._offset = self._offset + 1
+                                    else:
+                                        address8 = FAILURE
+                                        if self._offset > self._failure:
+                                            self._failure = self._offset
+                                            self._expected = []
+                                        if self._offset == self._failure:
+                                            self._expected.append('[\\n]')
                                     if address8 is not FAILURE:
                                         elements0.append(address8)
                                     else:
@@ -986,8 +1463,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = BackendHeader(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['backend_header'](self._input, index1, self._offset, elements0)
         self._cache['backend_header'][index0] = (address0, self._offset)
         return address0
 
@@ -999,48 +1475,28 @@ class Grammar(object):
             return cached[0]
         remaining0, index1, elements0, address1 = 0, self._offset, [], True
         while address1 is not FAILURE:
-            index2 = self._offset
-            address1 = self._read_server_line()
-            if address1 is FAILURE:
-                self._offset = index2
-                address1 = self._read_option_line()
-                if address1 is FAILURE:
-                    self._offset = index2
-                    address1 = self._read_bind_line()
-                    if address1 is FAILURE:
-                        self._offset = index2
-                        address1 = self._read_acl_line()
-                        if address1 is FAILURE:
-                            self._offset = index2
-                            address1 = self._read_backend_line()
-                            if address1 is FAILURE:
-                                self._offset = index2
-                                address1 = self._read_group_line()
-                                if address1 is FAILURE:
-                                    self._offset = index2
-                                    address1 = self._read_user_line()
-                                    if address1 is FAILURE:
-                                        self._offset = index2
-                                        address1 = self._read_config_line()
-                                        if address1 is FAILURE:
-                                            self._offset = index2
-                                            address1 = self._read_comment_line()
-                                            if address1 is FAILURE:
-                                                self._offset = index2
-                                                address1 = self._read_blank_line()
-                                                if address1 is FAILURE:
-                                                    self._offset = index2
+            address1 = self._read_block_line()
             if address1 is not FAILURE:
                 elements0.append(address1)
                 remaining0 -= 1
         if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['config_block'](self._input, index1, self._offset, elements0)
         else:
             address0 = FAILURE
+            self._offset = index1
         self._cache['config_block'][index0] = (address0, self._offset)
         return address0
 
+    def _read_block_line(self):
+        address0, index0 = FAILURE, self._offset
+        cached = self._cache['block_line'].get(index0)
+        if cached:
+            self._offset = cached[1]
+            return cached[0]
+        address0 = self._read_dispatched(self.REGEX_1, BLOCK_LINE_DISPATCH)
+        self._cache['block_line'][index0] = (address0, self._offset)
+        return address0
+
     def _read_server_line(self):
         address0, index0 = FAILURE, self._offset
         cached = self._cache['server_line'].get(index0)
@@ -1048,60 +1504,118 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 7]
-            if chunk0 == 'server ':
-                address2 = TreeNode(self._input[self._offset:self._offset + 6], self._offset)
-                self._offset = self._offset + 6
+            if self.REGEX_11.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 7)
+                self._offset = self._offset + 7
             else:
                 address2 = FAILURE
                 if self._offset > self._failure:
                     self._failure = self._offset
                     self._expected = []
                 if self._offset == self._failure:
-                    self._expected.append('"server"')
+                    self._expected.append('"server "')
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_whitespace()
+                index3 = self._offset
+                match1 = self.REGEX_1.match(self._input, index3)
+                if match1:
+                    self._offset = match1.end()
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[ \\t]')
+                if match1:
+                    address3 = TreeNode(self._input, index3, self._offset)
+                else:
+                    address3 = FAILURE
                 if address3 is not FAILURE:
                     elements0.append(address3)
-                    address4 = FAILURE
-                    address4 = self._read_server_name()
+                    index4 = self._offset
+                    match2 = self.REGEX_12.match(self._input, index4)
+                    if match2:
+                        self._offset = match2.end()
+                    if self._offset > self._failure:
+                        self._failure = self._offset
+                        self._expected = []
+                    if self._offset == self._failure:
+                        self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
+                    if match2:
+                        address4 = TreeNode(self._input, index4, self._offset)
+                    else:
+                        address4 = FAILURE
                     if address4 is not FAILURE:
                         elements0.append(address4)
-                        address5 = FAILURE
-                        address5 = self._read_whitespace()
+                        index5 = self._offset
+                        match3 = self.REGEX_1.match(self._input, index5)
+                        if match3:
+                            self._offset = match3.end()
+                        if self._offset > self._failure:
+                            self._failure = self._offset
+                            self._expected = []
+                        if self._offset == self._failure:
+                            self._expected.append('[ \\t]')
+                        if match3:
+                            address5 = TreeNode(self._input, index5, self._offset)
+                        else:
+                            address5 = FAILURE
                         if address5 is not FAILURE:
                             elements0.append(address5)
-                            address6 = FAILURE
                             address6 = self._read_service_address()
                             if address6 is not FAILURE:
                                 elements0.append(address6)
-                                address7 = FAILURE
-                                index2 = self._offset
-                                address7 = self._read_value()
+                                index6 = self._offset
+                                index7 = self._offset
+                                match4 = self.REGEX_8.match(self._input, index7)
+                                if match4:
+                                    self._offset = match4.end()
+                                if self._offset > self._failure:
+                                    self._failure = self._offset
+                                    self._expected = []
+                                if self._offset == self._failure:
+                                    self._expected.append('[^#\\n]')
+                                if match4:
+                                    address7 = TreeNode(self._input, index7, self._offset)
+                                else:
+                                    address7 = FAILURE
                                 if address7 is FAILURE:
-                                    address7 = TreeNode(self._input[index2:index2], index2)
-                                    self._offset = index2
+                                    address7 = TreeNode(self._input, index6, index6)
+                                    self._offset = index6
                                 if address7 is not FAILURE:
                                     elements0.append(address7)
-                                    address8 = FAILURE
-                                    index3 = self._offset
+                                    index8 = self._offset
                                     address8 = self._read_comment_text()
                                     if address8 is FAILURE:
-                                        address8 = TreeNode(self._input[index3:index3], index3)
-                                        self._offset = index3
+                                        address8 = TreeNode(self._input, index8, index8)
+                                        self._offset = index8
                                     if address8 is not FAILURE:
                                         elements0.append(address8)
-                                        address9 = FAILURE
-                                        address9 = self._read_line_break()
+                                        match5 = self.REGEX_3.match(self._input, self._offset)
+                                        if match5:
+                                            address9 = TreeNode(self._input, self._offset, self._offset + 1)
+                                            self._offset = self._offset + 1
+                                        else:
+                                            address9 = FAILURE
+                                            if self._offset > self._failure:
+                                                self._failure = self._offset
+                                                self._expected = []
+                                            if self._offset == self._failure:
+                                                self._expected.append('[\\n]')
                                         if address9 is not FAILURE:
                                             elements0.append(address9)
                                         else:
@@ -1134,8 +1648,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = ServerLine(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['server_line'](self._input, index1, self._offset, elements0)
         self._cache['server_line'][index0] = (address0, self._offset)
         return address0
 
@@ -1146,16 +1659,23 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 6]
-            if chunk0 == 'option':
-                address2 = TreeNode(self._input[self._offset:self._offset + 6], self._offset)
+            if self.REGEX_13.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 6)
                 self._offset = self._offset + 6
             else:
                 address2 = FAILURE
@@ -1166,36 +1686,76 @@ class Grammar(object):
                     self._expected.append('"option"')
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_whitespace()
+                index3 = self._offset
+                match1 = self.REGEX_1.match(self._input, index3)
+                if match1:
+                    self._offset = match1.end()
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[ \\t]')
+                if match1:
+                    address3 = TreeNode(self._input, index3, self._offset)
+                else:
+                    address3 = FAILURE
                 if address3 is not FAILURE:
                     elements0.append(address3)
-                    address4 = FAILURE
                     address4 = self._read_keyword()
                     if address4 is not FAILURE:
                         elements0.append(address4)
-                        address5 = FAILURE
-                        address5 = self._read_whitespace()
+                        index4 = self._offset
+                        match2 = self.REGEX_1.match(self._input, index4)
+                        if match2:
+                            self._offset = match2.end()
+                        if self._offset > self._failure:
+                            self._failure = self._offset
+                            self._expected = []
+                        if self._offset == self._failure:
+                            self._expected.append('[ \\t]')
+                        if match2:
+                            address5 = TreeNode(self._input, index4, self._offset)
+                        else:
+                            address5 = FAILURE
                         if address5 is not FAILURE:
                             elements0.append(address5)
-                            address6 = FAILURE
-                            index2 = self._offset
-                            address6 = self._read_value()
+                            index5 = self._offset
+                            index6 = self._offset
+                            match3 = self.REGEX_8.match(self._input, index6)
+                            if match3:
+                                self._offset = match3.end()
+                            if self._offset > self._failure:
+                                self._failure = self._offset
+                                self._expected = []
+                            if self._offset == self._failure:
+                                self._expected.append('[^#\\n]')
+                            if match3:
+                                address6 = TreeNode(self._input, index6, self._offset)
+                            else:
+                                address6 = FAILURE
                             if address6 is FAILURE:
-                                address6 = TreeNode(self._input[index2:index2], index2)
-                                self._offset = index2
+                                address6 = TreeNode(self._input, index5, index5)
+                                self._offset = index5
                             if address6 is not FAILURE:
                                 elements0.append(address6)
-                                address7 = FAILURE
-                                index3 = self._offset
+                                index7 = self._offset
                                 address7 = self._read_comment_text()
                                 if address7 is FAILURE:
-                                    address7 = TreeNode(self._input[index3:index3], index3)
-                                    self._offset = index3
+                                    address7 = TreeNode(self._input, index7, index7)
+                                    self._offset = index7
                                 if address7 is not FAILURE:
                                     elements0.append(address7)
-                                    address8 = FAILURE
-                                    address8 = self._read_line_break()
+                                    match4 = self.REGEX_3.match(self._input, self._offset)
+                                    if match4:
+                                        address8 = TreeNode(self._input, self._offset, self._offset + 1)
+                                        self._offset = self._offset + 1
+                                    else:
+                                        address8 = FAILURE
+                                        if self._offset > self._failure:
+                                            self._failure = self._offset
+                                            self._expected = []
+                                        if self._offset == self._failure:
+                                            self._expected.append('[\\n]')
                                     if address8 is not FAILURE:
                                         elements0.append(address8)
                                     else:
@@ -1225,8 +1785,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = OptionLine(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['option_line'](self._input, index1, self._offset, elements0)
         self._cache['option_line'][index0] = (address0, self._offset)
         return address0
 
@@ -1237,16 +1796,23 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 4]
-            if chunk0 == 'bind':
-                address2 = TreeNode(self._input[self._offset:self._offset + 4], self._offset)
+            if self.REGEX_14.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 4)
                 self._offset = self._offset + 4
             else:
                 address2 = FAILURE
@@ -1257,36 +1823,76 @@ class Grammar(object):
                     self._expected.append('"bind"')
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_whitespaceplus()
+                index3 = self._offset
+                match1 = self.REGEX_15.match(self._input, index3)
+                if match1:
+                    self._offset = match1.end()
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[ \\t]')
+                if match1:
+                    address3 = TreeNode(self._input, index3, self._offset)
+                else:
+                    address3 = FAILURE
                 if address3 is not FAILURE:
                     elements0.append(address3)
-                    address4 = FAILURE
                     address4 = self._read_service_address()
                     if address4 is not FAILURE:
                         elements0.append(address4)
-                        address5 = FAILURE
-                        address5 = self._read_whitespace()
+                        index4 = self._offset
+                        match2 = self.REGEX_1.match(self._input, index4)
+                        if match2:
+                            self._offset = match2.end()
+                        if self._offset > self._failure:
+                            self._failure = self._offset
+                            self._expected = []
+                        if self._offset == self._failure:
+                            self._expected.append('[ \\t]')
+                        if match2:
+                            address5 = TreeNode(self._input, index4, self._offset)
+                        else:
+                            address5 = FAILURE
                         if address5 is not FAILURE:
                             elements0.append(address5)
-                            address6 = FAILURE
-                            index2 = self._offset
-                            address6 = self._read_value()
+                            index5 = self._offset
+                            index6 = self._offset
+                            match3 = self.REGEX_8.match(self._input, index6)
+                            if match3:
+                                self._offset = match3.end()
+                            if self._offset > self._failure:
+                                self._failure = self._offset
+                                self._expected = []
+                            if self._offset == self._failure:
+                                self._expected.append('[^#\\n]')
+                            if match3:
+                                address6 = TreeNode(self._input, index6, self._offset)
+                            else:
+                                address6 = FAILURE
                             if address6 is FAILURE:
-                                address6 = TreeNode(self._input[index2:index2], index2)
-                                self._offset = index2
+                                address6 = TreeNode(self._input, index5, index5)
+                                self._offset = index5
                             if address6 is not FAILURE:
                                 elements0.append(address6)
-                                address7 = FAILURE
-                                index3 = self._offset
+                                index7 = self._offset
                                 address7 = self._read_comment_text()
                                 if address7 is FAILURE:
-                                    address7 = TreeNode(self._input[index3:index3], index3)
-                                    self._offset = index3
+                                    address7 = TreeNode(self._input, index7, index7)
+                                    self._offset = index7
                                 if address7 is not FAILURE:
                                     elements0.append(address7)
-                                    address8 = FAILURE
-                                    address8 = self._read_line_break()
+                                    match4 = self.REGEX_3.match(self._input, self._offset)
+                                    if match4:
+                                        address8 = TreeNode(self._input, self._offset, self._offset + 1)
+                                        self._offset = self._offset + 1
+                                    else:
+                                        address8 = FAILURE
+                                        if self._offset > self._failure:
+                                            self._failure = self._offset
+                                            self._expected = []
+                                        if self._offset == self._failure:
+                                            self._expected.append('[\\n]')
                                     if address8 is not FAILURE:
                                         elements0.append(address8)
                                     else:
@@ -1316,8 +1922,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = BindLine(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['bind_line'](self._input, index1, self._offset, elements0)
         self._cache['bind_line'][index0] = (address0, self._offset)
         return address0
 
@@ -1328,16 +1933,23 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 3]
-            if chunk0 == 'acl':
-                address2 = TreeNode(self._input[self._offset:self._offset + 3], self._offset)
+            if self.REGEX_16.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 3)
                 self._offset = self._offset + 3
             else:
                 address2 = FAILURE
@@ -1348,36 +1960,88 @@ class Grammar(object):
                     self._expected.append('"acl"')
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_whitespace()
+                index3 = self._offset
+                match1 = self.REGEX_1.match(self._input, index3)
+                if match1:
+                    self._offset = match1.end()
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[ \\t]')
+                if match1:
+                    address3 = TreeNode(self._input, index3, self._offset)
+                else:
+                    address3 = FAILURE
                 if address3 is not FAILURE:
                     elements0.append(address3)
-                    address4 = FAILURE
-                    address4 = self._read_acl_name()
+                    index4 = self._offset
+                    match2 = self.REGEX_12.match(self._input, index4)
+                    if match2:
+                        self._offset = match2.end()
+                    if self._offset > self._failure:
+                        self._failure = self._offset
+                        self._expected = []
+                    if self._offset == self._failure:
+                        self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
+                    if match2:
+                        address4 = TreeNode(self._input, index4, self._offset)
+                    else:
+                        address4 = FAILURE
                     if address4 is not FAILURE:
                         elements0.append(address4)
-                        address5 = FAILURE
-                        address5 = self._read_whitespace()
+                        index5 = self._offset
+                        match3 = self.REGEX_1.match(self._input, index5)
+                        if match3:
+                            self._offset = match3.end()
+                        if self._offset > self._failure:
+                            self._failure = self._offset
+                            self._expected = []
+                        if self._offset == self._failure:
+                            self._expected.append('[ \\t]')
+                        if match3:
+                            address5 = TreeNode(self._input, index5, self._offset)
+                        else:
+                            address5 = FAILURE
                         if address5 is not FAILURE:
                             elements0.append(address5)
-                            address6 = FAILURE
-                            index2 = self._offset
-                            address6 = self._read_value()
+                            index6 = self._offset
+                            index7 = self._offset
+                            match4 = self.REGEX_8.match(self._input, index7)
+                            if match4:
+                                self._offset = match4.end()
+                            if self._offset > self._failure:
+                                self._failure = self._offset
+                                self._expected = []
+                            if self._offset == self._failure:
+                                self._expected.append('[^#\\n]')
+                            if match4:
+                                address6 = TreeNode(self._input, index7, self._offset)
+                            else:
+                                address6 = FAILURE
                             if address6 is FAILURE:
-                                address6 = TreeNode(self._input[index2:index2], index2)
-                                self._offset = index2
+                                address6 = TreeNode(self._input, index6, index6)
+                                self._offset = index6
                             if address6 is not FAILURE:
                                 elements0.append(address6)
-                                address7 = FAILURE
-                                index3 = self._offset
+                                index8 = self._offset
                                 address7 = self._read_comment_text()
                                 if address7 is FAILURE:
-                                    address7 = TreeNode(self._input[index3:index3], index3)
-                                    self._offset = index3
+                                    address7 = TreeNode(self._input, index8, index8)
+                                    self._offset = index8
                                 if address7 is not FAILURE:
                                     elements0.append(address7)
-                                    address8 = FAILURE
-                                    address8 = self._read_line_break()
+                                    match5 = self.REGEX_3.match(self._input, self._offset)
+                                    if match5:
+                                        address8 = TreeNode(self._input, self._offset, self._offset + 1)
+                                        self._offset = self._offset + 1
+                                    else:
+                                        address8 = FAILURE
+                                        if self._offset > self._failure:
+                                            self._failure = self._offset
+                                            self._expected = []
+                                        if self._offset == self._failure:
+                                            self._expected.append('[\\n]')
                                     if address8 is not FAILURE:
                                         elements0.append(address8)
                                     else:
@@ -1407,8 +2071,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = AclLine(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['acl_line'](self._input, index1, self._offset, elements0)
         self._cache['acl_line'][index0] = (address0, self._offset)
         return address0
 
@@ -1419,17 +2082,24 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            index2 = self._offset
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 11]
-            if chunk0 == 'use_backend':
-                address2 = TreeNode(self._input[self._offset:self._offset + 11], self._offset)
+            index3 = self._offset
+            if self.REGEX_17.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 11)
                 self._offset = self._offset + 11
             else:
                 address2 = FAILURE
@@ -1439,12 +2109,9 @@ class Grammar(object):
                 if self._offset == self._failure:
                     self._expected.append('"use_backend"')
             if address2 is FAILURE:
-                self._offset = index2
-                chunk1 = None
-                if self._offset < self._input_size:
-                    chunk1 = self._input[self._offset:self._offset + 15]
-                if chunk1 == 'default_backend':
-                    address2 = TreeNode(self._input[self._offset:self._offset + 15], self._offset)
+                self._offset = index3
+                if self.REGEX_18.match(self._input, self._offset):
+                    address2 = TreeNode(self._input, self._offset, self._offset + 15)
                     self._offset = self._offset + 15
                 else:
                     address2 = FAILURE
@@ -1454,29 +2121,58 @@ class Grammar(object):
                     if self._offset == self._failure:
                         self._expected.append('"default_backend"')
                 if address2 is FAILURE:
-                    self._offset = index2
+                    self._offset = index3
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_whitespace()
+                index4 = self._offset
+                match1 = self.REGEX_1.match(self._input, index4)
+                if match1:
+                    self._offset = match1.end()
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[ \\t]')
+                if match1:
+                    address3 = TreeNode(self._input, index4, self._offset)
+                else:
+                    address3 = FAILURE
                 if address3 is not FAILURE:
                     elements0.append(address3)
-                    address4 = FAILURE
-                    address4 = self._read_backend_name()
+                    index5 = self._offset
+                    match2 = self.REGEX_12.match(self._input, index5)
+                    if match2:
+                        self._offset = match2.end()
+                    if self._offset > self._failure:
+                        self._failure = self._offset
+                        self._expected = []
+                    if self._offset == self._failure:
+                        self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
+                    if match2:
+                        address4 = TreeNode(self._input, index5, self._offset)
+                    else:
+                        address4 = FAILURE
                     if address4 is not FAILURE:
                         elements0.append(address4)
-                        address5 = FAILURE
-                        address5 = self._read_whitespace()
+                        index6 = self._offset
+                        match3 = self.REGEX_1.match(self._input, index6)
+                        if match3:
+                            self._offset = match3.end()
+                        if self._offset > self._failure:
+                            self._failure = self._offset
+                            self._expected = []
+                        if self._offset == self._failure:
+                            self._expected.append('[ \\t]')
+                        if match3:
+                            address5 = TreeNode(self._input, index6, self._offset)
+                        else:
+                            address5 = FAILURE
                         if address5 is not FAILURE:
                             elements0.append(address5)
-                            address6 = FAILURE
-                            index3 = self._offset
-                            index4 = self._offset
-                            chunk2 = None
-                            if self._offset < self._input_size:
-                                chunk2 = self._input[self._offset:self._offset + 2]
-                            if chunk2 == 'if':
-                                address6 = TreeNode(self._input[self._offset:self._offset + 2], self._offset)
+                            index7 = self._offset
+                            index8 = self._offset
+                            if self.REGEX_19.match(self._input, self._offset):
+                                address6 = TreeNode(self._input, self._offset, self._offset + 2)
                                 self._offset = self._offset + 2
                             else:
                                 address6 = FAILURE
@@ -1486,12 +2182,9 @@ class Grammar(object):
                                 if self._offset == self._failure:
                                     self._expected.append('"if"')
                             if address6 is FAILURE:
-                                self._offset = index4
-                                chunk3 = None
-                                if self._offset < self._input_size:
-                                    chunk3 = self._input[self._offset:self._offset + 6]
-                                if chunk3 == 'unless':
-                                    address6 = TreeNode(self._input[self._offset:self._offset + 6], self._offset)
+                                self._offset = index8
+                                if self.REGEX_20.match(self._input, self._offset):
+                                    address6 = TreeNode(self._input, self._offset, self._offset + 6)
                                     self._offset = self._offset + 6
                                 else:
                                     address6 = FAILURE
@@ -1501,34 +2194,64 @@ class Grammar(object):
                                     if self._offset == self._failure:
                                         self._expected.append('"unless"')
                                 if address6 is FAILURE:
-                                    self._offset = index4
+                                    self._offset = index8
                             if address6 is FAILURE:
-                                address6 = TreeNode(self._input[index3:index3], index3)
-                                self._offset = index3
+                                address6 = TreeNode(self._input, index7, index7)
+                                self._offset = index7
                             if address6 is not FAILURE:
                                 elements0.append(address6)
-                                address7 = FAILURE
-                                address7 = self._read_whitespace()
+                                index9 = self._offset
+                                match4 = self.REGEX_1.match(self._input, index9)
+                                if match4:
+                                    self._offset = match4.end()
+                                if self._offset > self._failure:
+                                    self._failure = self._offset
+                                    self._expected = []
+                                if self._offset == self._failure:
+                                    self._expected.append('[ \\t]')
+                                if match4:
+                                    address7 = TreeNode(self._input, index9, self._offset)
+                                else:
+                                    address7 = FAILURE
                                 if address7 is not FAILURE:
                                     elements0.append(address7)
-                                    address8 = FAILURE
-                                    index5 = self._offset
-                                    address8 = self._read_backend_condition()
+                                    index10 = self._offset
+                                    index11 = self._offset
+                                    match5 = self.REGEX_8.match(self._input, index11)
+                                    if match5:
+                                        self._offset = match5.end()
+                                    if self._offset > self._failure:
+                                        self._failure = self._offset
+                                        self._expected = []
+                                    if self._offset == self._failure:
+                                        self._expected.append('[^#\\n]')
+                                    if match5:
+                                        address8 = TreeNode(self._input, index11, self._offset)
+                                    else:
+                                        address8 = FAILURE
                                     if address8 is FAILURE:
-                                        address8 = TreeNode(self._input[index5:index5], index5)
-                                        self._offset = index5
+                                        address8 = TreeNode(self._input, index10, index10)
+                                        self._offset = index10
                                     if address8 is not FAILURE:
                                         elements0.append(address8)
-                                        address9 = FAILURE
-                                        index6 = self._offset
+                                        index12 = self._offset
                                         address9 = self._read_comment_text()
                                         if address9 is FAILURE:
-                                            address9 = TreeNode(self._input[index6:index6], index6)
-                                            self._offset = index6
+                                            address9 = TreeNode(self._input, index12, index12)
+                                            self._offset = index12
                                         if address9 is not FAILURE:
                                             elements0.append(address9)
-                                            address10 = FAILURE
-                                            address10 = self._read_line_break()
+                                            match6 = self.REGEX_3.match(self._input, self._offset)
+                                            if match6:
+                                                address10 = TreeNode(self._input, self._offset, self._offset + 1)
+                                                self._offset = self._offset + 1
+                                            else:
+                                                address10 = FAILURE
+                                                if self._offset > self._failure:
+                                                    self._failure = self._offset
+                                                    self._expected = []
+                                                if self._offset == self._failure:
+                                                    self._expected.append('[\\n]')
                                             if address10 is not FAILURE:
                                                 elements0.append(address10)
                                             else:
@@ -1564,8 +2287,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = BackendLine(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['backend_line'](self._input, index1, self._offset, elements0)
         self._cache['backend_line'][index0] = (address0, self._offset)
         return address0
 
@@ -1576,16 +2298,23 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 5]
-            if chunk0 == 'group':
-                address2 = TreeNode(self._input[self._offset:self._offset + 5], self._offset)
+            if self.REGEX_21.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 5)
                 self._offset = self._offset + 5
             else:
                 address2 = FAILURE
@@ -1596,27 +2325,55 @@ class Grammar(object):
                     self._expected.append('"group"')
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_whitespace()
-                if address3 is not FAILURE:
-                    elements0.append(address3)
-                    address4 = FAILURE
-                    address4 = self._read_group_name()
+                index3 = self._offset
+                match1 = self.REGEX_1.match(self._input, index3)
+                if match1:
+                    self._offset = match1.end()
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[ \\t]')
+                if match1:
+                    address3 = TreeNode(self._input, index3, self._offset)
+                else:
+                    address3 = FAILURE
+                if address3 is not FAILURE:
+                    elements0.append(address3)
+                    index4 = self._offset
+                    match2 = self.REGEX_12.match(self._input, index4)
+                    if match2:
+                        self._offset = match2.end()
+                    if self._offset > self._failure:
+                        self._failure = self._offset
+                        self._expected = []
+                    if self._offset == self._failure:
+                        self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
+                    if match2:
+                        address4 = TreeNode(self._input, index4, self._offset)
+                    else:
+                        address4 = FAILURE
                     if address4 is not FAILURE:
                         elements0.append(address4)
-                        address5 = FAILURE
-                        address5 = self._read_whitespace()
+                        index5 = self._offset
+                        match3 = self.REGEX_1.match(self._input, index5)
+                        if match3:
+                            self._offset = match3.end()
+                        if self._offset > self._failure:
+                            self._failure = self._offset
+                            self._expected = []
+                        if self._offset == self._failure:
+                            self._expected.append('[ \\t]')
+                        if match3:
+                            address5 = TreeNode(self._input, index5, self._offset)
+                        else:
+                            address5 = FAILURE
                         if address5 is not FAILURE:
                             elements0.append(address5)
-                            address6 = FAILURE
-                            index2 = self._offset
-                            index3, elements1 = self._offset, []
-                            address7 = FAILURE
-                            chunk1 = None
-                            if self._offset < self._input_size:
-                                chunk1 = self._input[self._offset:self._offset + 5]
-                            if chunk1 == 'users':
-                                address7 = TreeNode(self._input[self._offset:self._offset + 5], self._offset)
+                            index6 = self._offset
+                            index7, elements1 = self._offset, []
+                            if self.REGEX_22.match(self._input, self._offset):
+                                address7 = TreeNode(self._input, self._offset, self._offset + 5)
                                 self._offset = self._offset + 5
                             else:
                                 address7 = FAILURE
@@ -1627,44 +2384,73 @@ class Grammar(object):
                                     self._expected.append('"users"')
                             if address7 is not FAILURE:
                                 elements1.append(address7)
-                                address8 = FAILURE
-                                address8 = self._read_whitespace()
+                                index8 = self._offset
+                                match4 = self.REGEX_1.match(self._input, index8)
+                                if match4:
+                                    self._offset = match4.end()
+                                if self._offset > self._failure:
+                                    self._failure = self._offset
+                                    self._expected = []
+                                if self._offset == self._failure:
+                                    self._expected.append('[ \\t]')
+                                if match4:
+                                    address8 = TreeNode(self._input, index8, self._offset)
+                                else:
+                                    address8 = FAILURE
                                 if address8 is not FAILURE:
                                     elements1.append(address8)
                                 else:
                                     elements1 = None
-                                    self._offset = index3
+                                    self._offset = index7
                             else:
                                 elements1 = None
-                                self._offset = index3
+                                self._offset = index7
                             if elements1 is None:
                                 address6 = FAILURE
                             else:
-                                address6 = TreeNode19(self._input[index3:self._offset], index3, elements1)
-                                self._offset = self._offset
+                                address6 = TreeNode19(self._input, index7, self._offset, elements1)
                             if address6 is FAILURE:
-                                address6 = TreeNode(self._input[index2:index2], index2)
-                                self._offset = index2
+                                address6 = TreeNode(self._input, index6, index6)
+                                self._offset = index6
                             if address6 is not FAILURE:
                                 elements0.append(address6)
-                                address9 = FAILURE
-                                index4 = self._offset
-                                address9 = self._read_value()
+                                index9 = self._offset
+                                index10 = self._offset
+                                match5 = self.REGEX_8.match(self._input, index10)
+                                if match5:
+                                    self._offset = match5.end()
+                                if self._offset > self._failure:
+                                    self._failure = self._offset
+                                    self._expected = []
+                                if self._offset == self._failure:
+                                    self._expected.append('[^#\\n]')
+                                if match5:
+                                    address9 = TreeNode(self._input, index10, self._offset)
+                                else:
+                                    address9 = FAILURE
                                 if address9 is FAILURE:
-                                    address9 = TreeNode(self._input[index4:index4], index4)
-                                    self._offset = index4
+                                    address9 = TreeNode(self._input, index9, index9)
+                                    self._offset = index9
                                 if address9 is not FAILURE:
                                     elements0.append(address9)
-                                    address10 = FAILURE
-                                    index5 = self._offset
+                                    index11 = self._offset
                                     address10 = self._read_comment_text()
                                     if address10 is FAILURE:
-                                        address10 = TreeNode(self._input[index5:index5], index5)
-                                        self._offset = index5
+                                        address10 = TreeNode(self._input, index11, index11)
+                                        self._offset = index11
                                     if address10 is not FAILURE:
                                         elements0.append(address10)
-                                        address11 = FAILURE
-                                        address11 = self._read_line_break()
+                                        match6 = self.REGEX_3.match(self._input, self._offset)
+                                        if match6:
+                                            address11 = TreeNode(self._input, self._offset, self._offset + 1)
+                                            self._offset = self._offset + 1
+                                        else:
+                                            address11 = FAILURE
+                                            if self._offset > self._failure:
+                                                self._failure = self._offset
+                                                self._expected = []
+                                            if self._offset == self._failure:
+                                                self._expected.append('[\\n]')
                                         if address11 is not FAILURE:
                                             elements0.append(address11)
                                         else:
@@ -1697,8 +2483,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = GroupLine(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['group_line'](self._input, index1, self._offset, elements0)
         self._cache['group_line'][index0] = (address0, self._offset)
         return address0
 
@@ -1709,16 +2494,23 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 4]
-            if chunk0 == 'user':
-                address2 = TreeNode(self._input[self._offset:self._offset + 4], self._offset)
+            if self.REGEX_23.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 4)
                 self._offset = self._offset + 4
             else:
                 address2 = FAILURE
@@ -1729,25 +2521,54 @@ class Grammar(object):
                     self._expected.append('"user"')
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_whitespace()
+                index3 = self._offset
+                match1 = self.REGEX_1.match(self._input, index3)
+                if match1:
+                    self._offset = match1.end()
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[ \\t]')
+                if match1:
+                    address3 = TreeNode(self._input, index3, self._offset)
+                else:
+                    address3 = FAILURE
                 if address3 is not FAILURE:
                     elements0.append(address3)
-                    address4 = FAILURE
-                    address4 = self._read_user_name()
+                    index4 = self._offset
+                    match2 = self.REGEX_12.match(self._input, index4)
+                    if match2:
+                        self._offset = match2.end()
+                    if self._offset > self._failure:
+                        self._failure = self._offset
+                        self._expected = []
+                    if self._offset == self._failure:
+                        self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
+                    if match2:
+                        address4 = TreeNode(self._input, index4, self._offset)
+                    else:
+                        address4 = FAILURE
                     if address4 is not FAILURE:
                         elements0.append(address4)
-                        address5 = FAILURE
-                        address5 = self._read_whitespace()
+                        index5 = self._offset
+                        match3 = self.REGEX_1.match(self._input, index5)
+                        if match3:
+                            self._offset = match3.end()
+                        if self._offset > self._failure:
+                            self._failure = self._offset
+                            self._expected = []
+                        if self._offset == self._failure:
+                            self._expected.append('[ \\t]')
+                        if match3:
+                            address5 = TreeNode(self._input, index5, self._offset)
+                        else:
+                            address5 = FAILURE
                         if address5 is not FAILURE:
                             elements0.append(address5)
-                            address6 = FAILURE
-                            index2 = self._offset
-                            chunk1 = None
-                            if self._offset < self._input_size:
-                                chunk1 = self._input[self._offset:self._offset + 8]
-                            if chunk1 == 'password':
-                                address6 = TreeNode(self._input[self._offset:self._offset + 8], self._offset)
+                            index6 = self._offset
+                            if self.REGEX_24.match(self._input, self._offset):
+                                address6 = TreeNode(self._input, self._offset, self._offset + 8)
                                 self._offset = self._offset + 8
                             else:
                                 address6 = FAILURE
@@ -1757,12 +2578,9 @@ class Grammar(object):
                                 if self._offset == self._failure:
                                     self._expected.append('"password"')
                             if address6 is FAILURE:
-                                self._offset = index2
-                                chunk2 = None
-                                if self._offset < self._input_size:
-                                    chunk2 = self._input[self._offset:self._offset + 17]
-                                if chunk2 == 'insecure-password':
-                                    address6 = TreeNode(self._input[self._offset:self._offset + 17], self._offset)
+                                self._offset = index6
+                                if self.REGEX_25.match(self._input, self._offset):
+                                    address6 = TreeNode(self._input, self._offset, self._offset + 17)
                                     self._offset = self._offset + 17
                                 else:
                                     address6 = FAILURE
@@ -1772,30 +2590,58 @@ class Grammar(object):
                                     if self._offset == self._failure:
                                         self._expected.append('"insecure-password"')
                                 if address6 is FAILURE:
-                                    self._offset = index2
+                                    self._offset = index6
                             if address6 is not FAILURE:
                                 elements0.append(address6)
-                                address7 = FAILURE
-                                address7 = self._read_whitespace()
+                                index7 = self._offset
+                                match4 = self.REGEX_1.match(self._input, index7)
+                                if match4:
+                                    self._offset = match4.end()
+                                if self._offset > self._failure:
+                                    self._failure = self._offset
+                                    self._expected = []
+                                if self._offset == self._failure:
+                                    self._expected.append('[ \\t]')
+                                if match4:
+                                    address7 = TreeNode(self._input, index7, self._offset)
+                                else:
+                                    address7 = FAILURE
                                 if address7 is not FAILURE:
                                     elements0.append(address7)
-                                    address8 = FAILURE
-                                    address8 = self._read_password()
+                                    index8 = self._offset
+                                    match5 = self.REGEX_26.match(self._input, index8)
+                                    if match5:
+                                        self._offset = match5.end()
+                                    if self._offset > self._failure:
+                                        self._failure = self._offset
+                                        self._expected = []
+                                    if self._offset == self._failure:
+                                        self._expected.append('[^#\\n ]')
+                                    if match5:
+                                        address8 = TreeNode(self._input, index8, self._offset)
+                                    else:
+                                        address8 = FAILURE
                                     if address8 is not FAILURE:
                                         elements0.append(address8)
-                                        address9 = FAILURE
-                                        address9 = self._read_whitespace()
+                                        index9 = self._offset
+                                        match6 = self.REGEX_1.match(self._input, index9)
+                                        if match6:
+                                            self._offset = match6.end()
+                                        if self._offset > self._failure:
+                                            self._failure = self._offset
+                                            self._expected = []
+                                        if self._offset == self._failure:
+                                            self._expected.append('[ \\t]')
+                                        if match6:
+                                            address9 = TreeNode(self._input, index9, self._offset)
+                                        else:
+                                            address9 = FAILURE
                                         if address9 is not FAILURE:
                                             elements0.append(address9)
-                                            address10 = FAILURE
-                                            index3 = self._offset
-                                            index4, elements1 = self._offset, []
-                                            address11 = FAILURE
-                                            chunk3 = None
-                                            if self._offset < self._input_size:
-                                                chunk3 = self._input[self._offset:self._offset + 6]
-                                            if chunk3 == 'groups':
-                                                address11 = TreeNode(self._input[self._offset:self._offset + 6], self._offset)
+                                            index10 = self._offset
+                                            index11, elements1 = self._offset, []
+                                            if self.REGEX_27.match(self._input, self._offset):
+                                                address11 = TreeNode(self._input, self._offset, self._offset + 6)
                                                 self._offset = self._offset + 6
                                             else:
                                                 address11 = FAILURE
@@ -1806,44 +2652,73 @@ class Grammar(object):
                                                     self._expected.append('"groups"')
                                             if address11 is not FAILURE:
                                                 elements1.append(address11)
-                                                address12 = FAILURE
-                                                address12 = self._read_whitespace()
+                                                index12 = self._offset
+                                                match7 = self.REGEX_1.match(self._input, index12)
+                                                if match7:
+                                                    self._offset = match7.end()
+                                                if self._offset > self._failure:
+                                                    self._failure = self._offset
+                                                    self._expected = []
+                                                if self._offset == self._failure:
+                                                    self._expected.append('[ \\t]')
+                                                if match7:
+                                                    address12 = TreeNode(self._input, index12, self._offset)
+                                                else:
+                                                    address12 = FAILURE
                                                 if address12 is not FAILURE:
                                                     elements1.append(address12)
                                                 else:
                                                     elements1 = None
-                                                    self._offset = index4
+                                                    self._offset = index11
                                             else:
                                                 elements1 = None
-                                                self._offset = index4
+                                                self._offset = index11
                                             if elements1 is None:
                                                 address10 = FAILURE
                                             else:
-                                                address10 = TreeNode21(self._input[index4:self._offset], index4, elements1)
-                                                self._offset = self._offset
+                                                address10 = TreeNode21(self._input, index11, self._offset, elements1)
                                             if address10 is FAILURE:
-                                                address10 = TreeNode(self._input[index3:index3], index3)
-                                                self._offset = index3
+                                                address10 = TreeNode(self._input, index10, index10)
+                                                self._offset = index10
                                             if address10 is not FAILURE:
                                                 elements0.append(address10)
-                                                address13 = FAILURE
-                                                index5 = self._offset
-                                                address13 = self._read_value()
+                                                index13 = self._offset
+                                                index14 = self._offset
+                                                match8 = self.REGEX_8.match(self._input, index14)
+                                                if match8:
+                                                    self._offset = match8.end()
+                                                if self._offset > self._failure:
+                                                    self._failure = self._offset
+                                                    self._expected = []
+                                                if self._offset == self._failure:
+                                                    self._expected.append('[^#\\n]')
+                                                if match8:
+                                                    address13 = TreeNode(self._input, index14, self._offset)
+                                                else:
+                                                    address13 = FAILURE
                                                 if address13 is FAILURE:
-                                                    address13 = TreeNode(self._input[index5:index5], index5)
-                                                    self._offset = index5
+                                                    address13 = TreeNode(self._input, index13, index13)
+                                                    self._offset = index13
                                                 if address13 is not FAILURE:
                                                     elements0.append(address13)
-                                                    address14 = FAILURE
-                                                    index6 = self._offset
+                                                    index15 = self._offset
                                                     address14 = self._read_comment_text()
                                                     if address14 is FAILURE:
-                                                        address14 = TreeNode(self._input[index6:index6], index6)
-                                                        self._offset = index6
+                                                        address14 = TreeNode(self._input, index15, index15)
+                                                        self._offset = index15
                                                     if address14 is not FAILURE:
                                                         elements0.append(address14)
-                                                        address15 = FAILURE
-                                                        address15 = self._read_line_break()
+                                                        match9 = self.REGEX_3.match(self._input, self._offset)
+                                                        if match9:
+                                                            address15 = TreeNode(self._input, self._offset, self._offset + 1)
+                                                            self._offset = self._offset + 1
+                                                        else:
+                                                            address15 = FAILURE
+                                                            if self._offset > self._failure:
+                                                                self._failure = self._offset
+                                                                self._expected = []
+                                                            if self._offset == self._failure:
+                                                                self._expected.append('[\\n]')
                                                         if address15 is not FAILURE:
                                                             elements0.append(address15)
                                                         else:
@@ -1888,8 +2763,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = UserLine(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['user_line'](self._input, index1, self._offset, elements0)
         self._cache['user_line'][index0] = (address0, self._offset)
         return address0
 
@@ -1900,139 +2774,159 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            index2 = self._offset
             index3 = self._offset
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 8]
-            if chunk0 == 'defaults':
-                address2 = TreeNode(self._input[self._offset:self._offset + 8], self._offset)
+            index4 = self._offset
+            if self.REGEX_6.match(self._input, self._offset):
+                address3 = TreeNode(self._input, self._offset, self._offset + 8)
                 self._offset = self._offset + 8
             else:
-                address2 = FAILURE
+                address3 = FAILURE
                 if self._offset > self._failure:
                     self._failure = self._offset
                     self._expected = []
                 if self._offset == self._failure:
                     self._expected.append('"defaults"')
-            if address2 is FAILURE:
-                self._offset = index3
-                chunk1 = None
-                if self._offset < self._input_size:
-                    chunk1 = self._input[self._offset:self._offset + 6]
-                if chunk1 == 'global':
-                    address2 = TreeNode(self._input[self._offset:self._offset + 6], self._offset)
+            if address3 is FAILURE:
+                self._offset = index4
+                if self.REGEX_2.match(self._input, self._offset):
+                    address3 = TreeNode(self._input, self._offset, self._offset + 6)
                     self._offset = self._offset + 6
                 else:
-                    address2 = FAILURE
+                    address3 = FAILURE
                     if self._offset > self._failure:
                         self._failure = self._offset
                         self._expected = []
                     if self._offset == self._failure:
                         self._expected.append('"global"')
-                if address2 is FAILURE:
-                    self._offset = index3
-                    chunk2 = None
-                    if self._offset < self._input_size:
-                        chunk2 = self._input[self._offset:self._offset + 8]
-                    if chunk2 == 'userlist':
-                        address2 = TreeNode(self._input[self._offset:self._offset + 8], self._offset)
+                if address3 is FAILURE:
+                    self._offset = index4
+                    if self.REGEX_4.match(self._input, self._offset):
+                        address3 = TreeNode(self._input, self._offset, self._offset + 8)
                         self._offset = self._offset + 8
                     else:
-                        address2 = FAILURE
+                        address3 = FAILURE
                         if self._offset > self._failure:
                             self._failure = self._offset
                             self._expected = []
                         if self._offset == self._failure:
                             self._expected.append('"userlist"')
-                    if address2 is FAILURE:
-                        self._offset = index3
-                        chunk3 = None
-                        if self._offset < self._input_size:
-                            chunk3 = self._input[self._offset:self._offset + 6]
-                        if chunk3 == 'listen':
-                            address2 = TreeNode(self._input[self._offset:self._offset + 6], self._offset)
+                    if address3 is FAILURE:
+                        self._offset = index4
+                        if self.REGEX_7.match(self._input, self._offset):
+                            address3 = TreeNode(self._input, self._offset, self._offset + 6)
                             self._offset = self._offset + 6
                         else:
-                            address2 = FAILURE
+                            address3 = FAILURE
                             if self._offset > self._failure:
                                 self._failure = self._offset
                                 self._expected = []
                             if self._offset == self._failure:
                                 self._expected.append('"listen"')
-                        if address2 is FAILURE:
-                            self._offset = index3
-                            chunk4 = None
-                            if self._offset < self._input_size:
-                                chunk4 = self._input[self._offset:self._offset + 8]
-                            if chunk4 == 'frontend':
-                                address2 = TreeNode(self._input[self._offset:self._offset + 8], self._offset)
+                        if address3 is FAILURE:
+                            self._offset = index4
+                            if self.REGEX_9.match(self._input, self._offset):
+                                address3 = TreeNode(self._input, self._offset, self._offset + 8)
                                 self._offset = self._offset + 8
                             else:
-                                address2 = FAILURE
+                                address3 = FAILURE
                                 if self._offset > self._failure:
                                     self._failure = self._offset
                                     self._expected = []
                                 if self._offset == self._failure:
                                     self._expected.append('"frontend"')
-                            if address2 is FAILURE:
-                                self._offset = index3
-                                chunk5 = None
-                                if self._offset < self._input_size:
-                                    chunk5 = self._input[self._offset:self._offset + 7]
-                                if chunk5 == 'backend':
-                                    address2 = TreeNode(self._input[self._offset:self._offset + 7], self._offset)
+                            if address3 is FAILURE:
+                                self._offset = index4
+                                if self.REGEX_10.match(self._input, self._offset):
+                                    address3 = TreeNode(self._input, self._offset, self._offset + 7)
                                     self._offset = self._offset + 7
                                 else:
-                                    address2 = FAILURE
+                                    address3 = FAILURE
                                     if self._offset > self._failure:
                                         self._failure = self._offset
                                         self._expected = []
                                     if self._offset == self._failure:
                                         self._expected.append('"backend"')
-                                if address2 is FAILURE:
-                                    self._offset = index3
-            self._offset = index2
-            if address2 is FAILURE:
-                address2 = TreeNode(self._input[self._offset:self._offset], self._offset)
-                self._offset = self._offset
+                                if address3 is FAILURE:
+                                    self._offset = index4
+            self._offset = index3
+            if address3 is FAILURE:
+                address2 = TreeNode(self._input, self._offset, self._offset)
             else:
                 address2 = FAILURE
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_keyword()
-                if address3 is not FAILURE:
-                    elements0.append(address3)
-                    address4 = FAILURE
-                    address4 = self._read_whitespace()
-                    if address4 is not FAILURE:
-                        elements0.append(address4)
+                address4 = self._read_keyword()
+                if address4 is not FAILURE:
+                    elements0.append(address4)
+                    index5 = self._offset
+                    match1 = self.REGEX_1.match(self._input, index5)
+                    if match1:
+                        self._offset = match1.end()
+                    if self._offset > self._failure:
+                        self._failure = self._offset
+                        self._expected = []
+                    if self._offset == self._failure:
+                        self._expected.append('[ \\t]')
+                    if match1:
+                        address5 = TreeNode(self._input, index5, self._offset)
+                    else:
                         address5 = FAILURE
-                        index4 = self._offset
-                        address5 = self._read_value()
-                        if address5 is FAILURE:
-                            address5 = TreeNode(self._input[index4:index4], index4)
-                            self._offset = index4
-                        if address5 is not FAILURE:
-                            elements0.append(address5)
+                    if address5 is not FAILURE:
+                        elements0.append(address5)
+                        index6 = self._offset
+                        index7 = self._offset
+                        match2 = self.REGEX_8.match(self._input, index7)
+                        if match2:
+                            self._offset = match2.end()
+                        if self._offset > self._failure:
+                            self._failure = self._offset
+                            self._expected = []
+                        if self._offset == self._failure:
+                            self._expected.append('[^#\\n]')
+                        if match2:
+                            address6 = TreeNode(self._input, index7, self._offset)
+                        else:
                             address6 = FAILURE
-                            index5 = self._offset
-                            address6 = self._read_comment_text()
-                            if address6 is FAILURE:
-                                address6 = TreeNode(self._input[index5:index5], index5)
-                                self._offset = index5
-                            if address6 is not FAILURE:
-                                elements0.append(address6)
-                                address7 = FAILURE
-                                address7 = self._read_line_break()
-                                if address7 is not FAILURE:
-                                    elements0.append(address7)
+                        if address6 is FAILURE:
+                            address6 = TreeNode(self._input, index6, index6)
+                            self._offset = index6
+                        if address6 is not FAILURE:
+                            elements0.append(address6)
+                            index8 = self._offset
+                            address7 = self._read_comment_text()
+                            if address7 is FAILURE:
+                                address7 = TreeNode(self._input, index8, index8)
+                                self._offset = index8
+                            if address7 is not FAILURE:
+                                elements0.append(address7)
+                                match3 = self.REGEX_3.match(self._input, self._offset)
+                                if match3:
+                                    address8 = TreeNode(self._input, self._offset, self._offset + 1)
+                                    self._offset = self._offset + 1
+                                else:
+                                    address8 = FAILURE
+                                    if self._offset > self._failure:
+                                        self._failure = self._offset
+                                        self._expected = []
+                                    if self._offset == self._failure:
+                                        self._expected.append('[\\n]')
+                                if address8 is not FAILURE:
+                                    elements0.append(address8)
                                 else:
                                     elements0 = None
                                     self._offset = index1
@@ -2057,8 +2951,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = ConfigLine(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['config_line'](self._input, index1, self._offset, elements0)
         self._cache['config_line'][index0] = (address0, self._offset)
         return address0
 
@@ -2069,16 +2962,35 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
             address2 = self._read_comment_text()
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_line_break()
+                match1 = self.REGEX_3.match(self._input, self._offset)
+                if match1:
+                    address3 = TreeNode(self._input, self._offset, self._offset + 1)
+                    self._offset = self._offset + 1
+                else:
+                    address3 = FAILURE
+                    if self._offset > self._failure:
+                        self._failure = self._offset
+                        self._expected = []
+                    if self._offset == self._failure:
+                        self._expected.append('[\\n]')
                 if address3 is not FAILURE:
                     elements0.append(address3)
                 else:
@@ -2093,8 +3005,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = CommentLine(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['comment_line'](self._input, index1, self._offset, elements0)
         self._cache['comment_line'][index0] = (address0, self._offset)
         return address0
 
@@ -2105,12 +3016,32 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        address1 = self._read_whitespace()
+        index2 = self._offset
+        match0 = self.REGEX_1.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            address2 = self._read_line_break()
+            match1 = self.REGEX_3.match(self._input, self._offset)
+            if match1:
+                address2 = TreeNode(self._input, self._offset, self._offset + 1)
+                self._offset = self._offset + 1
+            else:
+                address2 = FAILURE
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[\\n]')
             if address2 is not FAILURE:
                 elements0.append(address2)
             else:
@@ -2122,8 +3053,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = BlankLine(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['blank_line'](self._input, index1, self._offset, elements0)
         self._cache['blank_line'][index0] = (address0, self._offset)
         return address0
 
@@ -2134,12 +3064,8 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        chunk0 = None
-        if self._offset < self._input_size:
-            chunk0 = self._input[self._offset:self._offset + 1]
-        if chunk0 == '#':
-            address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
+        if self.REGEX_28.match(self._input, self._offset):
+            address1 = TreeNode(self._input, self._offset, self._offset + 1)
             self._offset = self._offset + 1
         else:
             address1 = FAILURE
@@ -2150,31 +3076,30 @@ class Grammar(object):
                 self._expected.append('"#"')
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
-            remaining0, index2, elements1, address3 = 0, self._offset, [], True
-            while address3 is not FAILURE:
-                address3 = self._read_char()
-                if address3 is not FAILURE:
-                    elements1.append(address3)
-                    remaining0 -= 1
-            if remaining0 <= 0:
-                address2 = TreeNode(self._input[index2:self._offset], index2, elements1)
-                self._offset = self._offset
-            else:
-                address2 = FAILURE
+            index2 = self._offset
+            self._offset = self.REGEX_29.match(self._input, index2).end()
+            address2 = TreeNode(self._input, index2, self._offset)
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address4 = FAILURE
                 index3 = self._offset
-                address4 = self._read_line_break()
-                self._offset = index3
-                if address4 is not FAILURE:
-                    address4 = TreeNode(self._input[self._offset:self._offset], self._offset)
-                    self._offset = self._offset
+                match1 = self.REGEX_3.match(self._input, self._offset)
+                if match1:
+                    address4 = TreeNode(self._input, self._offset, self._offset + 1)
+                    self._offset = self._offset + 1
                 else:
                     address4 = FAILURE
+                    if self._offset > self._failure:
+                        self._failure = self._offset
+                        self._expected = []
+                    if self._offset == self._failure:
+                        self._expected.append('[\\n]')
+                self._offset = index3
                 if address4 is not FAILURE:
-                    elements0.append(address4)
+                    address3 = TreeNode(self._input, self._offset, self._offset)
+                else:
+                    address3 = FAILURE
+                if address3 is not FAILURE:
+                    elements0.append(address3)
                 else:
                     elements0 = None
                     self._offset = index1
@@ -2187,8 +3112,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['comment_text'](self._input, index1, self._offset, elements0)
         self._cache['comment_text'][index0] = (address0, self._offset)
         return address0
 
@@ -2198,11 +3122,9 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        chunk0 = None
-        if self._offset < self._input_size:
-            chunk0 = self._input[self._offset:self._offset + 1]
-        if chunk0 is not None and Grammar.REGEX_1.search(chunk0):
-            address0 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
+        match0 = self.REGEX_3.match(self._input, self._offset)
+        if match0:
+            address0 = TreeNode(self._input, self._offset, self._offset + 1)
             self._offset = self._offset + 1
         else:
             address0 = FAILURE
@@ -2221,16 +3143,11 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
         index2 = self._offset
         index3, elements1 = self._offset, []
-        address2 = FAILURE
         index4 = self._offset
-        chunk0 = None
-        if self._offset < self._input_size:
-            chunk0 = self._input[self._offset:self._offset + 9]
-        if chunk0 == 'errorfile':
-            address2 = TreeNode(self._input[self._offset:self._offset + 9], self._offset)
+        if self.REGEX_30.match(self._input, self._offset):
+            address2 = TreeNode(self._input, self._offset, self._offset + 9)
             self._offset = self._offset + 9
         else:
             address2 = FAILURE
@@ -2241,11 +3158,8 @@ class Grammar(object):
                 self._expected.append('"errorfile"')
         if address2 is FAILURE:
             self._offset = index4
-            chunk1 = None
-            if self._offset < self._input_size:
-                chunk1 = self._input[self._offset:self._offset + 7]
-            if chunk1 == 'timeout':
-                address2 = TreeNode(self._input[self._offset:self._offset + 7], self._offset)
+            if self.REGEX_31.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 7)
                 self._offset = self._offset + 7
             else:
                 address2 = FAILURE
@@ -2258,8 +3172,19 @@ class Grammar(object):
                 self._offset = index4
         if address2 is not FAILURE:
             elements1.append(address2)
-            address3 = FAILURE
-            address3 = self._read_whitespace()
+            index5 = self._offset
+            match0 = self.REGEX_1.match(self._input, index5)
+            if match0:
+                self._offset = match0.end()
+            if self._offset > self._failure:
+                self._failure = self._offset
+                self._expected = []
+            if self._offset == self._failure:
+                self._expected.append('[ \\t]')
+            if match0:
+                address3 = TreeNode(self._input, index5, self._offset)
+            else:
+                address3 = FAILURE
             if address3 is not FAILURE:
                 elements1.append(address3)
             else:
@@ -2271,35 +3196,23 @@ class Grammar(object):
         if elements1 is None:
             address1 = FAILURE
         else:
-            address1 = Keyword(self._input[index3:self._offset], index3, elements1)
-            self._offset = self._offset
+            address1 = TreeNode25(self._input, index3, self._offset, elements1)
         if address1 is FAILURE:
-            address1 = TreeNode(self._input[index2:index2], index2)
+            address1 = TreeNode(self._input, index2, index2)
             self._offset = index2
         if address1 is not FAILURE:
             elements0.append(address1)
-            address4 = FAILURE
-            remaining0, index5, elements2, address5 = 1, self._offset, [], True
-            while address5 is not FAILURE:
-                chunk2 = None
-                if self._offset < self._input_size:
-                    chunk2 = self._input[self._offset:self._offset + 1]
-                if chunk2 is not None and Grammar.REGEX_2.search(chunk2):
-                    address5 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                    self._offset = self._offset + 1
-                else:
-                    address5 = FAILURE
-                    if self._offset > self._failure:
-                        self._failure = self._offset
-                        self._expected = []
-                    if self._offset == self._failure:
-                        self._expected.append('[a-z0-9\\-\\_\\.]')
-                if address5 is not FAILURE:
-                    elements2.append(address5)
-                    remaining0 -= 1
-            if remaining0 <= 0:
-                address4 = TreeNode(self._input[index5:self._offset], index5, elements2)
-                self._offset = self._offset
+            index6 = self._offset
+            match1 = self.REGEX_32.match(self._input, index6)
+            if match1:
+                self._offset = match1.end()
+            if self._offset > self._failure:
+                self._failure = self._offset
+                self._expected = []
+            if self._offset == self._failure:
+                self._expected.append('[a-z0-9\\-\\_\\.]')
+            if match1:
+                address4 = TreeNode(self._input, index6, self._offset)
             else:
                 address4 = FAILURE
             if address4 is not FAILURE:
@@ -2313,8 +3226,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['keyword'](self._input, index1, self._offset, elements0)
         self._cache['keyword'][index0] = (address0, self._offset)
         return address0
 
@@ -2324,27 +3236,17 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        remaining0, index1, elements0, address1 = 1, self._offset, [], True
-        while address1 is not FAILURE:
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_3.search(chunk0):
-                address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address1 = FAILURE
-                if self._offset > self._failure:
-                    self._failure = self._offset
-                    self._expected = []
-                if self._offset == self._failure:
-                    self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
-            if address1 is not FAILURE:
-                elements0.append(address1)
-                remaining0 -= 1
-        if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+        index1 = self._offset
+        match0 = self.REGEX_12.match(self._input, index1)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
+        if match0:
+            address0 = TreeNode(self._input, index1, self._offset)
         else:
             address0 = FAILURE
         self._cache['server_name'][index0] = (address0, self._offset)
@@ -2356,27 +3258,17 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        remaining0, index1, elements0, address1 = 1, self._offset, [], True
-        while address1 is not FAILURE:
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_4.search(chunk0):
-                address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address1 = FAILURE
-                if self._offset > self._failure:
-                    self._failure = self._offset
-                    self._expected = []
-                if self._offset == self._failure:
-                    self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
-            if address1 is not FAILURE:
-                elements0.append(address1)
-                remaining0 -= 1
-        if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+        index1 = self._offset
+        match0 = self.REGEX_12.match(self._input, index1)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
+        if match0:
+            address0 = TreeNode(self._input, index1, self._offset)
         else:
             address0 = FAILURE
         self._cache['acl_name'][index0] = (address0, self._offset)
@@ -2388,27 +3280,17 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        remaining0, index1, elements0, address1 = 1, self._offset, [], True
-        while address1 is not FAILURE:
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_5.search(chunk0):
-                address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address1 = FAILURE
-                if self._offset > self._failure:
-                    self._failure = self._offset
-                    self._expected = []
-                if self._offset == self._failure:
-                    self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
-            if address1 is not FAILURE:
-                elements0.append(address1)
-                remaining0 -= 1
-        if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+        index1 = self._offset
+        match0 = self.REGEX_12.match(self._input, index1)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
+        if match0:
+            address0 = TreeNode(self._input, index1, self._offset)
         else:
             address0 = FAILURE
         self._cache['backend_name'][index0] = (address0, self._offset)
@@ -2420,27 +3302,17 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        remaining0, index1, elements0, address1 = 1, self._offset, [], True
-        while address1 is not FAILURE:
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_6.search(chunk0):
-                address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address1 = FAILURE
-                if self._offset > self._failure:
-                    self._failure = self._offset
-                    self._expected = []
-                if self._offset == self._failure:
-                    self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
-            if address1 is not FAILURE:
-                elements0.append(address1)
-                remaining0 -= 1
-        if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+        index1 = self._offset
+        match0 = self.REGEX_12.match(self._input, index1)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
+        if match0:
+            address0 = TreeNode(self._input, index1, self._offset)
         else:
             address0 = FAILURE
         self._cache['group_name'][index0] = (address0, self._offset)
@@ -2452,27 +3324,17 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        remaining0, index1, elements0, address1 = 1, self._offset, [], True
-        while address1 is not FAILURE:
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_7.search(chunk0):
-                address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address1 = FAILURE
-                if self._offset > self._failure:
-                    self._failure = self._offset
-                    self._expected = []
-                if self._offset == self._failure:
-                    self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
-            if address1 is not FAILURE:
-                elements0.append(address1)
-                remaining0 -= 1
-        if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+        index1 = self._offset
+        match0 = self.REGEX_12.match(self._input, index1)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[a-zA-z0-9\\-\\_\\.:]')
+        if match0:
+            address0 = TreeNode(self._input, index1, self._offset)
         else:
             address0 = FAILURE
         self._cache['user_name'][index0] = (address0, self._offset)
@@ -2484,27 +3346,17 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        remaining0, index1, elements0, address1 = 1, self._offset, [], True
-        while address1 is not FAILURE:
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_8.search(chunk0):
-                address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address1 = FAILURE
-                if self._offset > self._failure:
-                    self._failure = self._offset
-                    self._expected = []
-                if self._offset == self._failure:
-                    self._expected.append('[^#\\n]')
-            if address1 is not FAILURE:
-                elements0.append(address1)
-                remaining0 -= 1
-        if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+        index1 = self._offset
+        match0 = self.REGEX_26.match(self._input, index1)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[^#\\n ]')
+        if match0:
+            address0 = TreeNode(self._input, index1, self._offset)
         else:
             address0 = FAILURE
         self._cache['password'][index0] = (address0, self._offset)
@@ -2516,27 +3368,17 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        remaining0, index1, elements0, address1 = 1, self._offset, [], True
-        while address1 is not FAILURE:
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_9.search(chunk0):
-                address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address1 = FAILURE
-                if self._offset > self._failure:
-                    self._failure = self._offset
-                    self._expected = []
-                if self._offset == self._failure:
-                    self._expected.append('[^#\\n]')
-            if address1 is not FAILURE:
-                elements0.append(address1)
-                remaining0 -= 1
-        if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+        index1 = self._offset
+        match0 = self.REGEX_8.match(self._input, index1)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[^#\\n]')
+        if match0:
+            address0 = TreeNode(self._input, index1, self._offset)
         else:
             address0 = FAILURE
         self._cache['backend_condition'][index0] = (address0, self._offset)
@@ -2549,17 +3391,13 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
         address1 = self._read_host()
         if address1 is not FAILURE:
             elements0.append(address1)
-            address2 = FAILURE
             index2 = self._offset
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_10.search(chunk0):
-                address2 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
+            match0 = self.REGEX_33.match(self._input, self._offset)
+            if match0:
+                address2 = TreeNode(self._input, self._offset, self._offset + 1)
                 self._offset = self._offset + 1
             else:
                 address2 = FAILURE
@@ -2569,12 +3407,23 @@ class Grammar(object):
                 if self._offset == self._failure:
                     self._expected.append('[:]')
             if address2 is FAILURE:
-                address2 = TreeNode(self._input[index2:index2], index2)
+                address2 = TreeNode(self._input, index2, index2)
                 self._offset = index2
             if address2 is not FAILURE:
                 elements0.append(address2)
-                address3 = FAILURE
-                address3 = self._read_port()
+                index3 = self._offset
+                match1 = self.REGEX_34.match(self._input, index3)
+                if match1:
+                    self._offset = match1.end()
+                if self._offset > self._failure:
+                    self._failure = self._offset
+                    self._expected = []
+                if self._offset == self._failure:
+                    self._expected.append('[\\d]')
+                if match1:
+                    address3 = TreeNode(self._input, index3, self._offset)
+                else:
+                    address3 = FAILURE
                 if address3 is not FAILURE:
                     elements0.append(address3)
                 else:
@@ -2589,8 +3438,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = ServiceAddress(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['service_address'](self._input, index1, self._offset, elements0)
         self._cache['service_address'][index0] = (address0, self._offset)
         return address0
 
@@ -2600,16 +3448,7 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        index1 = self._offset
-        address0 = self._read_ipv4_host()
-        if address0 is FAILURE:
-            self._offset = index1
-            address0 = self._read_dns_host()
-            if address0 is FAILURE:
-                self._offset = index1
-                address0 = self._read_wildcard_host()
-                if address0 is FAILURE:
-                    self._offset = index1
+        address0 = self._read_dispatched(None, HOST_DISPATCH)
         self._cache['host'][index0] = (address0, self._offset)
         return address0
 
@@ -2619,27 +3458,17 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        remaining0, index1, elements0, address1 = 0, self._offset, [], True
-        while address1 is not FAILURE:
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_11.search(chunk0):
-                address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address1 = FAILURE
-                if self._offset > self._failure:
-                    self._failure = self._offset
-                    self._expected = []
-                if self._offset == self._failure:
-                    self._expected.append('[\\d]')
-            if address1 is not FAILURE:
-                elements0.append(address1)
-                remaining0 -= 1
-        if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+        index1 = self._offset
+        match0 = self.REGEX_34.match(self._input, index1)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[\\d]')
+        if match0:
+            address0 = TreeNode(self._input, index1, self._offset)
         else:
             address0 = FAILURE
         self._cache['port'][index0] = (address0, self._offset)
@@ -2652,14 +3481,23 @@ class Grammar(object):
             self._offset = cached[1]
             return cached[0]
         index1, elements0 = self._offset, []
-        address1 = FAILURE
-        remaining0, index2, elements1, address2 = 1, self._offset, [], True
-        while address2 is not FAILURE:
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_12.search(chunk0):
-                address2 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
+        index2 = self._offset
+        match0 = self.REGEX_35.match(self._input, index2)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[\\d]')
+        if match0:
+            address1 = TreeNode(self._input, index2, self._offset)
+        else:
+            address1 = FAILURE
+        if address1 is not FAILURE:
+            elements0.append(address1)
+            if self.REGEX_36.match(self._input, self._offset):
+                address2 = TreeNode(self._input, self._offset, self._offset + 1)
                 self._offset = self._offset + 1
             else:
                 address2 = FAILURE
@@ -2667,143 +3505,78 @@ class Grammar(object):
                     self._failure = self._offset
                     self._expected = []
                 if self._offset == self._failure:
-                    self._expected.append('[\\d]')
+                    self._expected.append('"."')
             if address2 is not FAILURE:
-                elements1.append(address2)
-                remaining0 -= 1
-        if remaining0 <= 0:
-            address1 = TreeNode(self._input[index2:self._offset], index2, elements1)
-            self._offset = self._offset
-        else:
-            address1 = FAILURE
-        if address1 is not FAILURE:
-            elements0.append(address1)
-            address3 = FAILURE
-            chunk1 = None
-            if self._offset < self._input_size:
-                chunk1 = self._input[self._offset:self._offset + 1]
-            if chunk1 == '.':
-                address3 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address3 = FAILURE
+                elements0.append(address2)
+                index3 = self._offset
+                match1 = self.REGEX_35.match(self._input, index3)
+                if match1:
+                    self._offset = match1.end()
                 if self._offset > self._failure:
                     self._failure = self._offset
                     self._expected = []
                 if self._offset == self._failure:
-                    self._expected.append('"."')
-            if address3 is not FAILURE:
-                elements0.append(address3)
-                address4 = FAILURE
-                remaining1, index3, elements2, address5 = 1, self._offset, [], True
-                while address5 is not FAILURE:
-                    chunk2 = None
-                    if self._offset < self._input_size:
-                        chunk2 = self._input[self._offset:self._offset + 1]
-                    if chunk2 is not None and Grammar.REGEX_13.search(chunk2):
-                        address5 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
+                    self._expected.append('[\\d]')
+                if match1:
+                    address3 = TreeNode(self._input, index3, self._offset)
+                else:
+                    address3 = FAILURE
+                if address3 is not FAILURE:
+                    elements0.append(address3)
+                    if self.REGEX_36.match(self._input, self._offset):
+                        address4 = TreeNode(self._input, self._offset, self._offset + 1)
                         self._offset = self._offset + 1
                     else:
-                        address5 = FAILURE
+                        address4 = FAILURE
                         if self._offset > self._failure:
                             self._failure = self._offset
                             self._expected = []
                         if self._offset == self._failure:
-                            self._expected.append('[\\d]')
-                    if address5 is not FAILURE:
-                        elements2.append(address5)
-                        remaining1 -= 1
-                if remaining1 <= 0:
-                    address4 = TreeNode(self._input[index3:self._offset], index3, elements2)
-                    self._offset = self._offset
-                else:
-                    address4 = FAILURE
-                if address4 is not FAILURE:
-                    elements0.append(address4)
-                    address6 = FAILURE
-                    chunk3 = None
-                    if self._offset < self._input_size:
-                        chunk3 = self._input[self._offset:self._offset + 1]
-                    if chunk3 == '.':
-                        address6 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                        self._offset = self._offset + 1
-                    else:
-                        address6 = FAILURE
+                            self._expected.append('"."')
+                    if address4 is not FAILURE:
+                        elements0.append(address4)
+                        index4 = self._offset
+                        match2 = self.REGEX_35.match(self._input, index4)
+                        if match2:
+                            self._offset = match2.end()
                         if self._offset > self._failure:
                             self._failure = self._offset
                             self._expected = []
                         if self._offset == self._failure:
-                            self._expected.append('"."')
-                    if address6 is not FAILURE:
-                        elements0.append(address6)
-                        address7 = FAILURE
-                        remaining2, index4, elements3, address8 = 1, self._offset, [], True
-                        while address8 is not FAILURE:
-                            chunk4 = None
-                            if self._offset < self._input_size:
-                                chunk4 = self._input[self._offset:self._offset + 1]
-                            if chunk4 is not None and Grammar.REGEX_14.search(chunk4):
-                                address8 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
+                            self._expected.append('[\\d]')
+                        if match2:
+                            address5 = TreeNode(self._input, index4, self._offset)
+                        else:
+                            address5 = FAILURE
+                        if address5 is not FAILURE:
+                            elements0.append(address5)
+                            if self.REGEX_36.match(self._input, self._offset):
+                                address6 = TreeNode(self._input, self._offset, self._offset + 1)
                                 self._offset = self._offset + 1
                             else:
-                                address8 = FAILURE
+                                address6 = FAILURE
                                 if self._offset > self._failure:
                                     self._failure = self._offset
                                     self._expected = []
                                 if self._offset == self._failure:
-                                    self._expected.append('[\\d]')
-                            if address8 is not FAILURE:
-                                elements3.append(address8)
-                                remaining2 -= 1
-                        if remaining2 <= 0:
-                            address7 = TreeNode(self._input[index4:self._offset], index4, elements3)
-                            self._offset = self._offset
-                        else:
-                            address7 = FAILURE
-                        if address7 is not FAILURE:
-                            elements0.append(address7)
-                            address9 = FAILURE
-                            chunk5 = None
-                            if self._offset < self._input_size:
-                                chunk5 = self._input[self._offset:self._offset + 1]
-                            if chunk5 == '.':
-                                address9 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                                self._offset = self._offset + 1
-                            else:
-                                address9 = FAILURE
+                                    self._expected.append('"."')
+                            if address6 is not FAILURE:
+                                elements0.append(address6)
+                                index5 = self._offset
+                                match3 = self.REGEX_35.match(self._input, index5)
+                                if match3:
+                                    self._offset = match3.end()
                                 if self._offset > self._failure:
                                     self._failure = self._offset
                                     self._expected = []
                                 if self._offset == self._failure:
-                                    self._expected.append('"."')
-                            if address9 is not FAILURE:
-                                elements0.append(address9)
-                                address10 = FAILURE
-                                remaining3, index5, elements4, address11 = 1, self._offset, [], True
-                                while address11 is not FAILURE:
-                                    chunk6 = None
-                                    if self._offset < self._input_size:
-                                        chunk6 = self._input[self._offset:self._offset + 1]
-                                    if chunk6 is not None and Grammar.REGEX_15.search(chunk6):
-                                        address11 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                                        self._offset = self._offset + 1
-                                    else:
-                                        address11 = FAILURE
-                                        if self._offset > self._failure:
-                                            self._failure = self._offset
-                                            self._expected = []
-                                        if self._offset == self._failure:
-                                            self._expected.append('[\\d]')
-                                    if address11 is not FAILURE:
-                                        elements4.append(address11)
-                                        remaining3 -= 1
-                                if remaining3 <= 0:
-                                    address10 = TreeNode(self._input[index5:self._offset], index5, elements4)
-                                    self._offset = self._offset
+                                    self._expected.append('[\\d]')
+                                if match3:
+                                    address7 = TreeNode(self._input, index5, self._offset)
                                 else:
-                                    address10 = FAILURE
-                                if address10 is not FAILURE:
-                                    elements0.append(address10)
+                                    address7 = FAILURE
+                                if address7 is not FAILURE:
+                                    elements0.append(address7)
                                 else:
                                     elements0 = None
                                     self._offset = index1
@@ -2828,8 +3601,7 @@ class Grammar(object):
         if elements0 is None:
             address0 = FAILURE
         else:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+            address0 = self._nodes['ipv4_host'](self._input, index1, self._offset, elements0)
         self._cache['ipv4_host'][index0] = (address0, self._offset)
         return address0
 
@@ -2839,27 +3611,17 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        remaining0, index1, elements0, address1 = 1, self._offset, [], True
-        while address1 is not FAILURE:
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_16.search(chunk0):
-                address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address1 = FAILURE
-                if self._offset > self._failure:
-                    self._failure = self._offset
-                    self._expected = []
-                if self._offset == self._failure:
-                    self._expected.append('[a-zA-Z\\-\\.\\d]')
-            if address1 is not FAILURE:
-                elements0.append(address1)
-                remaining0 -= 1
-        if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+        index1 = self._offset
+        match0 = self.REGEX_37.match(self._input, index1)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[a-zA-Z\\-\\.\\d]')
+        if match0:
+            address0 = TreeNode(self._input, index1, self._offset)
         else:
             address0 = FAILURE
         self._cache['dns_host'][index0] = (address0, self._offset)
@@ -2871,11 +3633,8 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        chunk0 = None
-        if self._offset < self._input_size:
-            chunk0 = self._input[self._offset:self._offset + 1]
-        if chunk0 == '*':
-            address0 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
+        if self.REGEX_38.match(self._input, self._offset):
+            address0 = TreeNode(self._input, self._offset, self._offset + 1)
             self._offset = self._offset + 1
         else:
             address0 = FAILURE
@@ -2893,27 +3652,17 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        remaining0, index1, elements0, address1 = 1, self._offset, [], True
-        while address1 is not FAILURE:
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_17.search(chunk0):
-                address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address1 = FAILURE
-                if self._offset > self._failure:
-                    self._failure = self._offset
-                    self._expected = []
-                if self._offset == self._failure:
-                    self._expected.append('[a-zA-Z0-9\\-\\_\\.:]')
-            if address1 is not FAILURE:
-                elements0.append(address1)
-                remaining0 -= 1
-        if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+        index1 = self._offset
+        match0 = self.REGEX_5.match(self._input, index1)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[a-zA-Z0-9\\-\\_\\.:]')
+        if match0:
+            address0 = TreeNode(self._input, index1, self._offset)
         else:
             address0 = FAILURE
         self._cache['proxy_name'][index0] = (address0, self._offset)
@@ -2925,27 +3674,17 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        remaining0, index1, elements0, address1 = 1, self._offset, [], True
-        while address1 is not FAILURE:
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_18.search(chunk0):
-                address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address1 = FAILURE
-                if self._offset > self._failure:
-                    self._failure = self._offset
-                    self._expected = []
-                if self._offset == self._failure:
-                    self._expected.append('[^#\\n]')
-            if address1 is not FAILURE:
-                elements0.append(address1)
-                remaining0 -= 1
-        if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+        index1 = self._offset
+        match0 = self.REGEX_8.match(self._input, index1)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[^#\\n]')
+        if match0:
+            address0 = TreeNode(self._input, index1, self._offset)
         else:
             address0 = FAILURE
         self._cache['value'][index0] = (address0, self._offset)
@@ -2957,54 +3696,17 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        index1, elements0 = self._offset, []
-        address1 = FAILURE
-        index2 = self._offset
-        chunk0 = None
-        if self._offset < self._input_size:
-            chunk0 = self._input[self._offset:self._offset + 1]
-        if chunk0 is not None and Grammar.REGEX_19.search(chunk0):
-            address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
+        match0 = self.REGEX_39.match(self._input, self._offset)
+        if match0:
+            address0 = TreeNode(self._input, self._offset, self._offset + 1)
             self._offset = self._offset + 1
         else:
-            address1 = FAILURE
+            address0 = FAILURE
             if self._offset > self._failure:
                 self._failure = self._offset
                 self._expected = []
             if self._offset == self._failure:
-                self._expected.append('[\\n]')
-        self._offset = index2
-        if address1 is FAILURE:
-            address1 = TreeNode(self._input[self._offset:self._offset], self._offset)
-            self._offset = self._offset
-        else:
-            address1 = FAILURE
-        if address1 is not FAILURE:
-            elements0.append(address1)
-            address2 = FAILURE
-            if self._offset < self._input_size:
-                address2 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address2 = FAILURE
-                if self._offset > self._failure:
-                    self._failure = self._offset
-                    self._expected = []
-                if self._offset == self._failure:
-                    self._expected.append('<any char>')
-            if address2 is not FAILURE:
-                elements0.append(address2)
-            else:
-                elements0 = None
-                self._offset = index1
-        else:
-            elements0 = None
-            self._offset = index1
-        if elements0 is None:
-            address0 = FAILURE
-        else:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+                self._expected.append('<any char>')
         self._cache['char'][index0] = (address0, self._offset)
         return address0
 
@@ -3014,27 +3716,17 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        remaining0, index1, elements0, address1 = 0, self._offset, [], True
-        while address1 is not FAILURE:
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_20.search(chunk0):
-                address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address1 = FAILURE
-                if self._offset > self._failure:
-                    self._failure = self._offset
-                    self._expected = []
-                if self._offset == self._failure:
-                    self._expected.append('[ \\t]')
-            if address1 is not FAILURE:
-                elements0.append(address1)
-                remaining0 -= 1
-        if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+        index1 = self._offset
+        match0 = self.REGEX_1.match(self._input, index1)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address0 = TreeNode(self._input, index1, self._offset)
         else:
             address0 = FAILURE
         self._cache['whitespace'][index0] = (address0, self._offset)
@@ -3046,27 +3738,17 @@ class Grammar(object):
         if cached:
             self._offset = cached[1]
             return cached[0]
-        remaining0, index1, elements0, address1 = 1, self._offset, [], True
-        while address1 is not FAILURE:
-            chunk0 = None
-            if self._offset < self._input_size:
-                chunk0 = self._input[self._offset:self._offset + 1]
-            if chunk0 is not None and Grammar.REGEX_21.search(chunk0):
-                address1 = TreeNode(self._input[self._offset:self._offset + 1], self._offset)
-                self._offset = self._offset + 1
-            else:
-                address1 = FAILURE
-                if self._offset > self._failure:
-                    self._failure = self._offset
-                    self._expected = []
-                if self._offset == self._failure:
-                    self._expected.append('[ \\t]')
-            if address1 is not FAILURE:
-                elements0.append(address1)
-                remaining0 -= 1
-        if remaining0 <= 0:
-            address0 = TreeNode(self._input[index1:self._offset], index1, elements0)
-            self._offset = self._offset
+        index1 = self._offset
+        match0 = self.REGEX_15.match(self._input, index1)
+        if match0:
+            self._offset = match0.end()
+        if self._offset > self._failure:
+            self._failure = self._offset
+            self._expected = []
+        if self._offset == self._failure:
+            self._expected.append('[ \\t]')
+        if match0:
+            address0 = TreeNode(self._input, index1, self._offset)
         else:
             address0 = FAILURE
         self._cache['whitespaceplus'][index0] = (address0, self._offset)
@@ -3074,38 +3756,359 @@ class Grammar(object):
 
 
 
+class DispatchTable(dict):
+    """Map the first char of the input (after the leading whitespace) to the
+    alternatives of an ordered choice which may match it, the char is keyed
+    both as a str and as the int that indexing a bytes-like input gives
+
+    The alternatives are the names of their `_read_<rule>` methods, which
+    are looked up on the parser, so a subclass can wrap them.
+
+    Attributes:
+        reads (['_read_<rule>', ...]): all the alternatives, in order
+    """
+    def __init__(self, reads):
+        super(DispatchTable, self).__init__()
+        self.reads = reads
+
+
+def dispatch_table(alternatives):
+    """Args:
+        alternatives ([(rule, [(first_chars, literals), ...]), ...]): in the
+            order of the choice, `literals` is the tuple the input starts
+            with, None when any input starting with `first_chars` may match
+
+    Returns:
+        DispatchTable: {char: [(literals regex, '_read_<rule>'), ...]}
+    """
+    table = DispatchTable([])
+    for rule, groups in alternatives:
+        read = '_read_' + rule
+        table.reads.append(read)
+        for chars, literals in groups:
+            text_literals = bytes_literals = None
+            if literals is not None:
+                pattern = '|'.join(re.escape(literal) for literal in literals)
+                text_literals = re.compile(pattern)
+                bytes_literals = re.compile(pattern.encode('utf-8'))
+            for char in chars:
+                table.setdefault(char, []).append((text_literals, read))
+                table.setdefault(ord(char), []).append(
+                    (bytes_literals, read))
+    return table
+
+
+CONFIGURATION_DISPATCH = dispatch_table([
+    ('comment_line', [('#', ('#',))]),
+    ('blank_line', [('\n', None)]),
+    ('global_section', [('g', ('global',))]),
+    ('defaults_section', [('d', ('defaults',))]),
+    ('userlist_section', [('u', ('userlist',))]),
+    ('listen_section', [('l', ('listen',))]),
+    ('frontend_section', [('f', ('frontend',))]),
+    ('backend_section', [('b', ('backend',))]),
+])
+
+BLOCK_LINE_DISPATCH = dispatch_table([
+    ('server_line', [('s', ('server ',))]),
+    ('option_line', [('o', ('option',))]),
+    ('bind_line', [('b', ('bind',))]),
+    ('acl_line', [('a', ('acl',))]),
+    ('backend_line', [('d', ('default_backend',)), ('u', ('use_backend',))]),
+    ('group_line', [('g', ('group',))]),
+    ('user_line', [('u', ('user',))]),
+    ('config_line', [('-.0123456789_abcdefghijklmnopqrstuvwxyz', None)]),
+    ('comment_line', [('#', ('#',))]),
+    ('blank_line', [('\n', None)]),
+])
+
+HOST_DISPATCH = dispatch_table([
+    ('ipv4_host', [('0123456789', None)]),
+    ('dns_host', [
+        ('-.0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz', None),
+    ]),
+    ('wildcard_host', [('*', ('*',))]),
+])
+
+
+BYTES_REGEXES = {}
+
+
+def bytes_regexes():
+    """Returns:
+        dict: {'REGEX_<n>': the Grammar regex compiled for bytes-like inputs}
+    """
+    if not BYTES_REGEXES:
+        for name, regex in vars(Grammar).items():
+            if name.startswith('REGEX_'):
+                BYTES_REGEXES[name] = re.compile(
+                    regex.pattern.encode('utf-8'))
+    return BYTES_REGEXES
+
+
 class Parser(Grammar):
-    def __init__(self, input, actions, types):
+    """The `input` is a str, or a bytes-like object (bytes, bytearray, mmap
+    or memoryview) of utf-8 text, which is matched in place by the regexes
+    compiled for bytes, and only the text of the nodes which are read is
+    decoded. On Python 2, bytes is str and parsed as text, the other
+    bytes-like objects raise TypeError
+
+    The `memo` policy tells which rule results are kept in the packrat cache:
+        'all': every rule at every offset, until the parser is dropped
+        'selective': only the rules in MEMO_RULES, and the entries before
+            the end of the last parsed section are dropped
+        'none': nothing, alternatives are parsed again after a failure
+
+    The line numbers of the errors count from `first_lineno`, for an input
+    which is a part of a bigger file.
+    """
+    def __init__(self, input, actions, types, memo='selective',
+                 first_lineno=1):
+        if memo not in MEMO_POLICIES:
+            raise ValueError('unsupported memo policy: %s' % memo)
         self._input = input
         self._input_size = len(input)
+        if not isinstance(input, TEXT_TYPES):
+            if bytes is str:
+                # bytes is str on Python 2, which is parsed as the text
+                raise TypeError('bytes-like input is only supported on '
+                                'Python 3, got %s' % type(input).__name__)
+            self.__dict__.update(bytes_regexes())
         self._actions = actions
         self._types = types
         self._offset = 0
-        self._cache = defaultdict(dict)
+        self._nodes = dict(NODE_TYPES)
+        if actions is not None:
+            for rule in NODE_TYPES:
+                if hasattr(actions, rule):
+                    self._nodes[rule] = getattr(actions, rule)
+        self._memo = memo
+        if memo == 'all':
+            self._cache = defaultdict(dict)
+        else:
+            self._cache = defaultdict(NoCache)
+        if memo == 'selective':
+            for rule in MEMO_RULES:
+                self._cache[rule] = {}
         self._failure = 0
         self._expected = []
+        self._first_lineno = first_lineno
+        self._line_index = None
 
     def parse(self):
         tree = self._read_configuration()
         if tree is not FAILURE and self._offset == self._input_size:
             return tree
+        raise self.error()
+
+    def read(self, rule, offset):
+        """Read a single `rule` at `offset` of the input
+
+        Unlike `parse`, the rest of the input is left alone, so callers can
+        parse fragments (eg: one section header) of a bigger config.
+
+        Returns:
+            (TreeNode, int): the node and the offset it ends at, the node is
+                None when the rule does not match
+        """
+        self._offset = offset
+        node = getattr(self, '_read_' + rule)()
+        if node is FAILURE:
+            return None, offset
+        return node, self._offset
+
+    def error(self):
         if not self._expected:
             self._failure = self._offset
             self._expected.append('<EOF>')
-        raise ParseError(format_error(self._input, self._failure, self._expected))
-
-
-def format_error(input, offset, expected):
-    lines, line_no, position = input.split('\n'), 0, 0
-    while position <= offset:
-        position += len(lines[line_no]) + 1
-        line_no += 1
-    message, line = 'Line ' + str(line_no) + ': expected ' + ', '.join(expected) + '\n', lines[line_no - 1]
-    message += line + '\n'
-    position -= len(line) + 1
-    message += ' ' * (offset - position)
-    return message + '^'
-
-def parse(input, actions=None, types=None):
-    parser = Parser(input, actions, types)
+        # rules which are not memoized record their failures once per try
+        expected = []
+        for item in self._expected:
+            if item not in expected:
+                expected.append(item)
+        error = ParseError(format_error(
+            self._input, self._failure, expected, self.line_index))
+        error.position = self.line_index.position(self._failure)
+        return error
+
+    def reset_failure(self):
+        """Forget the failures recorded so far, so that the next error only
+        reports the ones after
+        """
+        self._failure = 0
+        self._expected = []
+
+    @property
+    def line_index(self):
+        """LineIndex: the line starts of the input, built on first access
+        """
+        if self._line_index is None:
+            self._line_index = LineIndex(self._input, self._first_lineno)
+        return self._line_index
+
+    def _forget(self, offset):
+        """Drop the cached results before `offset`, the input up to there
+        is committed and never parsed again
+        """
+        for rule_cache in self._cache.values():
+            for index in [index for index in rule_cache if index < offset]:
+                del rule_cache[index]
+
+
+LINE_BREAK_REGEXES = (re.compile('\n'), re.compile(b'\n'))
+
+
+class LineIndex(object):
+    """The offsets where the lines of an input start, built in one pass, to
+    turn an offset into its line and column by a binary search
+
+    Attributes:
+        input (str or bytes-like): the indexed input
+        first_lineno (int): the line number of the first line of `input`,
+            for an input which is a part of a bigger file
+        starts ([int, ...]): the offset of each line
+    """
+    __slots__ = ('input', 'first_lineno', 'starts')
+
+    def __init__(self, input, first_lineno=1):
+        self.input = input
+        self.first_lineno = first_lineno
+        regex = LINE_BREAK_REGEXES[not isinstance(input, TEXT_TYPES)]
+        self.starts = [0]
+        self.starts.extend(match.end() for match in regex.finditer(input))
+
+    def lineno(self, offset):
+        """Returns:
+            int: the line number of `offset`
+        """
+        return bisect.bisect_right(self.starts, offset) + self.first_lineno - 1
+
+    def position(self, offset):
+        """Returns:
+            (int, int): the line number of `offset` and its column, from 0,
+                in chars for a str input and in bytes for a bytes-like one
+        """
+        index = bisect.bisect_right(self.starts, offset) - 1
+        return index + self.first_lineno, offset - self.starts[index]
+
+    def line(self, lineno):
+        """Returns:
+            str or bytes-like: the text of the line, without its line break
+        """
+        index = lineno - self.first_lineno
+        end = len(self.input)
+        if index + 1 < len(self.starts):
+            end = self.starts[index + 1] - 1
+        return self.input[self.starts[index]:end]
+
+
+class RuleProfile(object):
+    """The counters of a rule in a profiled parse
+
+    Attributes:
+        calls (int): the calls of `_read_<rule>`
+        hits (int): the calls answered by the memo cache
+        misses (int): the calls which parsed the input
+        failures (int): the calls which didn't match
+        time (float): the seconds spent in the rule, with the rules it reads
+        nodes (int): the nodes built by the node type or action of the rule
+    """
+    __slots__ = ('calls', 'hits', 'misses', 'failures', 'time', 'nodes')
+
+    def __init__(self):
+        self.calls = self.hits = self.misses = self.failures = self.nodes = 0
+        self.time = 0.0
+
+    def as_dict(self):
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+
+class ProfilingParser(Parser):
+    """A Parser which profiles each rule, the `_read_<rule>` methods and the
+    node types are wrapped on the instance, so the plain Parser pays nothing
+
+    Attributes:
+        profile ({rule: RuleProfile}): the counters of every rule
+    """
+    timer = getattr(time, 'perf_counter', time.time)
+
+    def __init__(self, input, actions, types, memo='selective',
+                 first_lineno=1):
+        super(ProfilingParser, self).__init__(
+            input, actions, types, memo, first_lineno)
+        self.profile = {}
+        for name in dir(Grammar):
+            if name.startswith('_read_') and name != '_read_dispatched':
+                rule = name[len('_read_'):]
+                self.profile[rule] = RuleProfile()
+                setattr(self, name, self._profiled_read(
+                    rule, getattr(self, name)))
+        for rule, node_type in list(self._nodes.items()):
+            self._nodes[rule] = self._profiled_node_type(
+                self.profile[rule], node_type)
+
+    def _profiled_read(self, rule, read):
+        profile, timer = self.profile[rule], self.timer
+
+        def profiled_read():
+            profile.calls += 1
+            if self._offset in self._cache[rule]:
+                profile.hits += 1
+            else:
+                profile.misses += 1
+            start = timer()
+            try:
+                address = read()
+            finally:
+                profile.time += timer() - start
+            if address is FAILURE:
+                profile.failures += 1
+            return address
+        return profiled_read
+
+    def _profiled_node_type(self, profile, node_type):
+        def profiled_node_type(input, offset, end, elements):
+            profile.nodes += 1
+            return node_type(input, offset, end, elements)
+        return profiled_node_type
+
+    def report(self):
+        """Returns:
+            {rule: {'calls': int, 'hits': int, 'misses': int, 'failures':
+                int, 'time': float, 'nodes': int}}: the rules which were
+                called
+        """
+        return dict((rule, profile.as_dict())
+                    for rule, profile in self.profile.items()
+                    if profile.calls)
+
+
+def format_error(input, offset, expected, line_index=None):
+    """Returns:
+        str: the message of the error at `offset`, the line number and the
+            line of the input, with a caret under the offset
+    """
+    line_index = line_index or LineIndex(input)
+    lineno, column = line_index.position(offset)
+    line = line_index.line(lineno)
+    if not isinstance(line, TEXT_TYPES):
+        # only the line of the error is decoded, the column counts chars
+        column = len(bytes(line[:column]).decode('utf-8', 'replace'))
+        line = bytes(line).decode('utf-8', 'replace')
+    return 'Line %d: expected %s\n%s\n%s^' % (
+        lineno, ', '.join(expected), line, ' ' * column)
+
+
+def parse(input, actions=None, types=None, memo='selective', profile=False,
+          first_lineno=1):
+    """The line numbers of the errors count from `first_lineno`
+
+    Returns:
+        TreeNode: the tree of the input, or the value of the `configuration`
+            action, and with `profile`, (tree, ProfilingParser.report())
+    """
+    if profile:
+        parser = ProfilingParser(input, actions, types, memo, first_lineno)
+        return parser.parse(), parser.report()
+    parser = Parser(input, actions, types, memo, first_lineno)
     return parser.parse()
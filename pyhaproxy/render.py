@@ -109,28 +109,25 @@ backend %s
         Returns:
             str: config block str
         """
-        config_block_str = ''
+        line_renderers = self.line_renderers
+        line_strs = []
         for line in config_block:
-            if isinstance(line, config.Option):
-                line_str = self.__render_option(line)
-            elif isinstance(line, config.Config):
-                line_str = self.__render_config(line)
-            elif isinstance(line, config.Server):
-                line_str = self.__render_server(line)
-            elif isinstance(line, config.Bind):
-                line_str = self.__render_bind(line)
-            elif isinstance(line, config.Acl):
-                line_str = self.__render_acl(line)
-            elif isinstance(line, config.UseBackend):
-                line_str = self.__render_usebackend(line)
-            elif isinstance(line, config.User):
-                line_str = self.__render_user(line)
-            elif isinstance(line, config.Group):
-                line_str = self.__render_group(line)
-            # append line str
-            config_block_str = config_block_str + line_str
-
-        return config_block_str
+            renderer = line_renderers.get(type(line))
+            if renderer is None:
+                renderer = self.__find_line_renderer(type(line))
+            line_strs.append(renderer(self, line))
+        return ''.join(line_strs)
+
+    def __find_line_renderer(self, line_type):
+        """Find the renderer of the nearest base class of `line_type`
+
+        Raises:
+            Exception: when there is no renderer of it
+        """
+        for base in line_type.__mro__:
+            if base in self.line_renderers:
+                return self.line_renderers[base]
+        raise Exception('unsupported config line: %s' % line_type.__name__)
 
     def __render_usebackend(self, usebackend):
         usebackend_line = '    %s %s %s %s\n'
@@ -159,8 +156,11 @@ backend %s
 
     def __render_server(self, server):
         server_line = '    server %s %s:%s %s\n'
+        # the shared tuple of the attributes, rather than a list-like view
+        # of it for each server
         return server_line % (
-            server.name, server.host, server.port, ' '.join(server.attributes))
+            server.name, server.host, server.port,
+            ' '.join(server._attributes))
 
     def __render_acl(self, acl):
         acl_line = '    acl %s %s\n'
@@ -178,3 +178,28 @@ backend %s
     def __render_config(self, config):
         config_line = '    %s %s\n'
         return config_line % (config.keyword, config.value)
+
+    # the renderers of the config lines, by type: renderer(render, line)
+    # returns the line, with its indent and line break
+    line_renderers = {
+        config.Option: __render_option,
+        config.Config: __render_config,
+        config.Server: __render_server,
+        config.Bind: __render_bind,
+        config.Acl: __render_acl,
+        config.UseBackend: __render_usebackend,
+        config.User: __render_user,
+        config.Group: __render_group,
+    }
+
+    @classmethod
+    def register_line_renderer(cls, line_type, renderer):
+        """Render the config lines of `line_type`, and of its subclasses, by
+        `renderer(render, line)`
+
+        The registry is copied to `cls` first, so registering on a subclass
+        leaves the ones of its bases alone.
+        """
+        if 'line_renderers' not in vars(cls):
+            cls.line_renderers = dict(cls.line_renderers)
+        cls.line_renderers[line_type] = renderer
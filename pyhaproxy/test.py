@@ -2,23 +2,26 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, print_function, unicode_literals
 
+import copy
+import io
+import json
+import mmap
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
 import pyhaproxy.parse as parse
+import pyhaproxy.pegcompile as pegcompile
+import pyhaproxy.pegnode as pegnode
 import pyhaproxy.render as render
 import pyhaproxy.config as config
 
 
-class TestParse(object):
-
-    @classmethod
-    def setup_class(cls):
-        pass
-
-    @classmethod
-    def teardown_class(cls):
-        pass
-
-    def setup(self):
-        filestring = r"""
+FILESTRING = r"""
 global
       maxconn     4096
       nbproc      1
@@ -147,7 +150,55 @@ backend swiftnifty
       server      server1     localhost:3007 weight 1 maxconn 1024 check
 
 """
-        self.parser = parse.Parser(filestring=filestring)
+
+# lines the `fast` engine leaves to the PEG grammar
+FALLBACK_FILESTRING = r"""
+  global  # tuned
+    maxconn 4096
+
+frontend  fe
+    bind	*:80
+    bind :443 ssl
+    aclfoo src 10.0.0.0/8
+    use_backend	be if foo
+
+backend be
+    server s1 localhost:80 check
+    server	s2 localhost:81
+    server s3
+    userlist password x
+    user admin password secret groups
+"""
+
+
+class WorkerConfig(config.Config):
+    pass
+
+
+class WorkerParser(parse.Parser):
+    pass
+
+
+WorkerParser.register_line_builder(
+    pegnode.ConfigLine,
+    lambda parser, node: WorkerConfig(node.keyword.text, node.value.text))
+WorkerParser.register_line_builder(
+    pegnode.OptionLine,
+    lambda parser, node: WorkerConfig(node.keyword.text, node.value.text))
+
+
+class TestParse(object):
+
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def setup(self):
+        self.parser = parse.Parser(filestring=FILESTRING)
         self.configration = self.parser.build_configuration()
 
     def teardown(self):
@@ -205,3 +256,865 @@ backend swiftnifty
         backend.add_config(config.Config('conf_key_1', 'conf_key_2'))
         self.render = render.Render(self.configration)
         self.render.dumps_to('./hatest.cfg')
+
+
+class TestEngines(object):
+
+    @classmethod
+    def setup_class(cls):
+        with open(os.path.join(
+                os.path.dirname(__file__), 'haproxy.cfg')) as f:
+            cls.filestrings = [FILESTRING, FALLBACK_FILESTRING, f.read()]
+
+    def test_engines_build_same_configuration(self):
+        for filestring in self.filestrings:
+            parser = parse.Parser(filestring=filestring)
+            peg_configuration = parser.build_configuration(engine='peg')
+            for engine in ('actions', 'fast'):
+                configuration = parser.build_configuration(engine=engine)
+                assert (
+                    render.Render(peg_configuration).render_configuration() ==
+                    render.Render(configuration).render_configuration())
+
+    def test_fast_engine_falls_back_line_by_line(self):
+        reads = []
+        read = pegnode.Parser.read
+
+        def recording_read(peg_parser, rule, offset):
+            reads.append(rule)
+            return read(peg_parser, rule, offset)
+
+        pegnode.Parser.read = recording_read
+        try:
+            configuration = parse.Parser(filestring=(
+                'backend b\n'
+                '    server\tbad\n'
+                '    server s1 10.0.0.1:80 check\n'
+                '    server s2 10.0.0.2:80 check\n'
+            )).build_configuration(engine='fast')
+        finally:
+            pegnode.Parser.read = read
+        # only the odd line is read by the PEG grammar
+        assert reads == ['block_line']
+        assert [server.name for server in configuration.backend(
+            'b').servers()] == ['s1', 's2']
+
+
+class TestMemo(object):
+
+    def test_memo_policies_build_same_tree(self):
+        section_texts = [
+            [section_node.text for section_node in pegnode.parse(
+                FILESTRING, memo=memo)]
+            for memo in pegnode.MEMO_POLICIES]
+        for texts in section_texts[1:]:
+            assert texts == section_texts[0]
+
+
+class TestDispatch(object):
+
+    def test_dispatch_falls_back_to_next_alternative(self):
+        # not a `server_line`, so it's read as a `config_line`
+        config_block = pegnode.parse(
+            'backend b\n    server s1\n').elements[0].config_block
+        assert [type(line_node) for line_node in config_block] == [
+            pegnode.ConfigLine]
+
+    def test_dispatch_reports_all_alternatives(self):
+        try:
+            pegnode.parse('backend b\n    ??\n')
+        except pegnode.ParseError as e:
+            for expected in ('"option"', '"user"', '"backend"', '"#"'):
+                assert expected in str(e)
+        else:
+            assert False, 'ParseError is not raised'
+
+
+class TestPegCompile(object):
+
+    def test_pegnode_is_up_to_date(self):
+        assert pegcompile.main(['--check']) == 0
+
+
+class TestIterSections(object):
+
+    def test_iter_sections_in_chunks(self):
+        renderer = render.Render(None)
+        render_section = {
+            config.Global: renderer.render_global,
+            config.Defaults: renderer.render_defaults,
+            config.Userlist: renderer.render_userlist,
+            config.Listen: renderer.render_listen,
+            config.Frontend: renderer.render_frontend,
+            config.Backend: renderer.render_backend,
+        }
+        for filestring in (FILESTRING, FALLBACK_FILESTRING):
+            parser = parse.Parser(filestring=filestring)
+            configuration = parser.build_configuration()
+            for engine in ('peg', 'fast'):
+                sections = parser.iter_sections(
+                    io.StringIO(filestring), engine=engine, chunk_size=16)
+                assert ''.join(
+                    render_section[type(section)](section)
+                    for section in sections) == render.Render(
+                        configuration).render_configuration()
+
+    def test_iter_sections_of_file(self):
+        fd, filepath = tempfile.mkstemp()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(FILESTRING.encode('utf-8'))
+        try:
+            parser = parse.Parser(filepath)
+            sections = list(parser.iter_sections())
+            assert [type(section) for section in sections] == [
+                type(section) for section in parse.Parser(
+                    filestring=FILESTRING).iter_sections()]
+        finally:
+            os.remove(filepath)
+
+
+class TestSectionIndex(object):
+
+    def test_section_index(self):
+        parser = parse.Parser(filestring=FILESTRING)
+        configuration = parser.build_configuration()
+        section_index = parser.section_index()
+        assert [name for section_type, name, _, _ in section_index
+                if section_type == 'backend'] == [
+                    backend.name for backend in configuration.backends]
+        for section_type, name, start, end in section_index:
+            assert parser.filestring[start:end].startswith(section_type)
+        assert section_index[-1][3] == len(FILESTRING)
+
+
+class TestLazy(object):
+
+    def test_lazy_builds_same_configuration(self):
+        for engine in ('peg', 'fast'):
+            parser = parse.Parser(filestring=FILESTRING)
+            assert (render.Render(parser.build_configuration(
+                engine=engine)).render_configuration() ==
+                render.Render(parser.build_configuration(
+                    engine=engine, lazy=True)).render_configuration())
+
+    def test_lazy_defers_config_block(self):
+        parser = parse.Parser(filestring=(
+            'frontend f1 *:80\n    default_backend b1\n'
+            'backend b1\n    server s1 1.1.1.1:80\n    ??\n'))
+        configuration = parser.build_configuration(lazy=True)
+        frontend = configuration.frontend('f1')
+        assert (frontend.host, frontend.port) == ('*', '80')
+        assert frontend.usebackend('b1').is_default
+        backend = configuration.backend('b1')
+        try:
+            backend.config_block
+        except pegnode.ParseError:
+            pass
+        else:
+            assert False, 'ParseError is not raised'
+
+
+class TestWorkers(object):
+
+    def test_workers_build_same_configuration(self):
+        try:
+            import concurrent.futures  # noqa
+        except ImportError:
+            raise unittest.SkipTest('concurrent.futures is not available')
+        parser = parse.Parser(filestring=FILESTRING)
+        for engine in ('peg', 'fast'):
+            assert (render.Render(parser.build_configuration(
+                engine=engine)).render_configuration() ==
+                render.Render(parser.build_configuration(
+                    engine=engine, workers=2)).render_configuration())
+
+
+class TestReparse(object):
+
+    def test_reparse_keeps_untouched_sections(self):
+        parser = parse.Parser(filestring=FILESTRING)
+        configuration = parser.build_configuration()
+        backends = list(configuration.backends)
+        offset = FILESTRING.index('localhost:3001')
+        parser.reparse(configuration, offset, offset + len('localhost:3001'),
+                       'localhost:4001')
+        assert configuration.backend('chatleap').server('server1').port == (
+            '4001')
+        for old_backend, backend in zip(backends, configuration.backends):
+            assert (old_backend is backend) == (backend.name != 'chatleap')
+        assert (render.Render(configuration).render_configuration() ==
+                render.Render(parse.Parser(
+                    filestring=parser.filestring).build_configuration()
+                ).render_configuration())
+
+    def test_reparse_edited_header(self):
+        parser = parse.Parser(filestring=FILESTRING)
+        configuration = parser.build_configuration()
+        offset = FILESTRING.index('\nbackend chatleap') + 1
+        parser.reparse(configuration, offset, offset + len('backend'),
+                       '    #')
+        assert configuration.backend('chatleap') is None
+        assert (render.Render(configuration).render_configuration() ==
+                render.Render(parse.Parser(
+                    filestring=parser.filestring).build_configuration()
+                ).render_configuration())
+
+    def test_reparse_parses_only_the_edited_section(self):
+        parser = parse.Parser(filestring=FILESTRING)
+        configuration = parser.build_configuration(lazy=True)
+        offset = FILESTRING.index('\n', FILESTRING.index(
+            '\nbackend chatleap') + 1) + 1
+        inputs = []
+        peg_parse = pegnode.Parser.parse
+
+        def recording_parse(peg_parser):
+            inputs.append(peg_parser._input)
+            return peg_parse(peg_parser)
+
+        pegnode.Parser.parse = recording_parse
+        try:
+            parser.reparse(configuration, offset, offset, '    # added\n\n')
+        finally:
+            pegnode.Parser.parse = peg_parse
+        # the lazy sections after it are shifted, not parsed
+        assert len(inputs) == 1
+        assert inputs[0].startswith('backend chatleap')
+        expected = parse.Parser(
+            filestring=parser.filestring).build_configuration()
+        for backend, expected_backend in zip(
+                configuration.backends, expected.backends):
+            assert backend.lineno == expected_backend.lineno
+            assert [line.lineno for line in backend.config_block] == [
+                line.lineno for line in expected_backend.config_block]
+
+
+class TestCache(object):
+
+    def setup(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def teardown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_cache_loads_same_configuration(self):
+        parser = parse.Parser(filestring=FILESTRING, cache_dir=self.cache_dir)
+        configuration = parser.build_configuration()
+        assert len(os.listdir(self.cache_dir)) == 1
+        cached_configuration = parse.Parser(
+            filestring=FILESTRING,
+            cache_dir=self.cache_dir).build_configuration()
+        assert cached_configuration is not configuration
+        assert (render.Render(configuration).render_configuration() ==
+                render.Render(cached_configuration).render_configuration())
+
+    def test_cache_evicts_least_recently_used(self):
+        filestrings = [FILESTRING, FALLBACK_FILESTRING]
+        for filestring in filestrings:
+            parse.Parser(filestring=filestring,
+                         cache_dir=self.cache_dir).build_configuration()
+        filenames = os.listdir(self.cache_dir)
+        assert len(filenames) == 2
+        max_size = max(
+            os.path.getsize(os.path.join(self.cache_dir, filename))
+            for filename in filenames)
+        parse.Parser(filestring=FILESTRING, cache_dir=self.cache_dir,
+                     cache_size=max_size).build_configuration(engine='fast')
+        assert len(os.listdir(self.cache_dir)) == 1
+
+    def test_cache_keeps_parser_types_apart(self):
+        for parser_type in (parse.Parser, WorkerParser, parse.Parser,
+                            WorkerParser):
+            configuration = parser_type(
+                filestring=FILESTRING,
+                cache_dir=self.cache_dir).build_configuration()
+            lines = configuration.globall.config_block
+            assert isinstance(lines[0], WorkerConfig) == (
+                parser_type is WorkerParser)
+        assert len(os.listdir(self.cache_dir)) == 2
+
+    def test_cache_unreadable_entry_is_a_miss(self):
+        parser = parse.Parser(filestring=FILESTRING, cache_dir=self.cache_dir)
+        key = parser.cache.key(FILESTRING, 'peg')
+        for content in (b'', b'garbage', pickle.dumps(
+                'garbage', pickle.HIGHEST_PROTOCOL)[:-1]):
+            with open(os.path.join(self.cache_dir, key + '.pickle'),
+                      'wb') as f:
+                f.write(content)
+            assert parser.cache.load(key) is None
+        assert parser.build_configuration().backends
+
+
+class TestBytesInput(object):
+
+    @unittest.skipIf(sys.version_info[0] < 3, 'bytes is str on Python 2')
+    def test_bytes_like_inputs_build_same_tree(self):
+        section_texts = [section_node.text
+                         for section_node in pegnode.parse(FILESTRING)]
+        data = FILESTRING.encode('utf-8')
+        with tempfile.TemporaryFile() as f:
+            f.write(data)
+            f.flush()
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for input in (data, bytearray(data), memoryview(data),
+                              mapping):
+                    assert [section_node.text for section_node in
+                            pegnode.parse(input)] == section_texts
+            finally:
+                mapping.close()
+
+    @unittest.skipIf(sys.version_info[0] < 3, 'bytes is str on Python 2')
+    def test_bytes_filestring_builds_same_configuration(self):
+        expected = render.Render(parse.Parser(
+            filestring=FILESTRING).build_configuration()
+        ).render_configuration()
+        parser = parse.Parser(filestring=FILESTRING.encode('utf-8'))
+        for engine in ('peg', 'actions'):
+            configuration = parser.build_configuration(engine=engine)
+            assert (render.Render(configuration).render_configuration() ==
+                    expected)
+
+    @unittest.skipIf(sys.version_info[0] < 3, 'bytes is str on Python 2')
+    def test_bytes_error_counts_chars(self):
+        try:
+            pegnode.parse('global\n    # é\n    ??é\n'.encode('utf-8'))
+        except pegnode.ParseError as e:
+            assert str(e).startswith('Line 3: expected')
+            assert str(e).endswith('\n    ^')
+        else:
+            assert False, 'ParseError is not raised'
+
+    @unittest.skipIf(sys.version_info[0] > 2, 'bytes-like input is parsed')
+    def test_bytes_like_input_is_rejected_on_python2(self):
+        data = FILESTRING.encode('utf-8')
+        for input in (bytearray(data), memoryview(data)):
+            try:
+                pegnode.parse(input)
+            except TypeError as e:
+                assert 'Python 3' in str(e)
+            else:
+                assert False, 'TypeError is not raised'
+
+
+class TestMmap(object):
+
+    def setup(self):
+        fd, self.filepath = tempfile.mkstemp()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(FILESTRING.encode('utf-8'))
+
+    def teardown(self):
+        os.remove(self.filepath)
+
+    @unittest.skipIf(sys.version_info[0] < 3, 'mmap is Python 3 only')
+    def test_mmap_builds_same_configuration(self):
+        expected = render.Render(parse.Parser(
+            filestring=FILESTRING).build_configuration()
+        ).render_configuration()
+        parser = parse.Parser(self.filepath, use_mmap=True)
+        configuration = parser.build_configuration()
+        assert isinstance(parser.filestring, mmap.mmap)
+        assert render.Render(configuration).render_configuration() == expected
+        assert [type(section) for section in parser.iter_sections()] == [
+            type(section) for section in parse.Parser(
+                filestring=FILESTRING).iter_sections()]
+        parser.close()
+        assert isinstance(parser.filestring, mmap.mmap)
+        parser.close()
+
+    @unittest.skipIf(sys.version_info[0] < 3, 'mmap is Python 3 only')
+    def test_mmap_iter_sections_in_chunks(self):
+        renderer = render.Render(None)
+        render_section = {
+            config.Global: renderer.render_global,
+            config.Defaults: renderer.render_defaults,
+            config.Userlist: renderer.render_userlist,
+            config.Listen: renderer.render_listen,
+            config.Frontend: renderer.render_frontend,
+            config.Backend: renderer.render_backend,
+        }
+        expected = render.Render(parse.Parser(
+            filestring=FILESTRING).build_configuration()
+        ).render_configuration()
+        parser = parse.Parser(self.filepath, use_mmap=True)
+        try:
+            # the small chunks split the multi-byte chars
+            for chunk_size in (1, 7, parse.STREAM_CHUNK_SIZE):
+                assert ''.join(
+                    render_section[type(section)](section)
+                    for section in parser.iter_sections(
+                        chunk_size=chunk_size)) == expected
+        finally:
+            parser.close()
+
+
+class TestLineno(object):
+
+    def test_config_objects_have_lineno(self):
+        parser = parse.Parser(filestring=FILESTRING)
+        for engine in ('peg', 'actions', 'fast'):
+            configuration = parser.build_configuration(engine=engine)
+            defaults = configuration.defaults[0]
+            assert defaults.lineno == 9
+            assert [line.lineno for line in defaults.config_block] == [
+                10, 11, 12]
+            userlist = configuration.userlist('L1')
+            assert userlist.lineno == 14
+            assert [line.lineno for line in userlist.config_block] == [
+                15, 16, 18, 19, 20]
+
+    def test_line_index_position(self):
+        line_index = pegnode.LineIndex('ab\ncd\n')
+        assert line_index.position(0) == (1, 0)
+        assert line_index.position(2) == (1, 2)
+        assert line_index.position(4) == (2, 1)
+        assert line_index.position(6) == (3, 0)
+        assert line_index.line(2) == 'cd'
+        assert pegnode.LineIndex('ab\ncd\n', first_lineno=10).lineno(4) == 11
+
+    def test_reparse_shifts_lineno(self):
+        parser = parse.Parser(filestring=FILESTRING)
+        configuration = parser.reparse(
+            parser.build_configuration(), 0, 0, '\n\n')
+        defaults = configuration.defaults[0]
+        assert defaults.lineno == 11
+        assert [line.lineno for line in defaults.config_block] == [
+            12, 13, 14]
+
+    def test_errors_count_lines_from_the_file(self):
+        valid = (
+            'global\n'
+            '    daemon\n'
+            '\n'
+            'backend a\n'
+            '    server s1 10.0.0.1:80\n'
+            '\n'
+            'backend b\n'
+            '    mode http\n'
+        )
+        # the bad line is in the last of 16 sections, at line 65
+        valid *= 8
+        filestring = valid + '    ??\n'
+        parser = parse.Parser(filestring=filestring)
+        builds = [
+            lambda: parser.build_configuration(engine='peg'),
+            lambda: parser.build_configuration(engine='actions'),
+            lambda: parser.build_configuration(engine='fast'),
+            lambda: parser.build_configuration(
+                lazy=True).backends[-1].config_block,
+            lambda: list(parser.iter_sections()),
+            lambda: list(parser.iter_sections(engine='fast')),
+            lambda: parse.Parser(filestring=valid).reparse(
+                parse.Parser(filestring=valid).build_configuration(),
+                len(valid), len(valid), '    ??\n'),
+        ]
+        try:
+            import concurrent.futures  # noqa
+        except ImportError:
+            pass
+        else:
+            builds.append(lambda: parse.Parser(
+                filestring=filestring).build_configuration(workers=2))
+        for build in builds:
+            try:
+                build()
+            except pegnode.ParseError as e:
+                assert str(e).startswith('Line 65: expected')
+                assert e.position == (65, 4)
+            else:
+                assert False, 'ParseError is not raised'
+
+    def test_recover_reports_all_errors(self):
+        filestring = ('global\n    maxconn 1\n    ??\n    daemon\n'
+                      'backend\n    server s1 1.1.1.1:80\n'
+                      'backend b\n    ?? x\n    mode http\n')
+        for engine in ('peg', 'actions', 'fast'):
+            configuration, errors = parse.Parser(
+                filestring=filestring).build_configuration(
+                    engine=engine, recover=True)
+            assert [error.position for error in errors] == [
+                (3, 4), (5, 7), (8, 4)]
+            assert [line.keyword for line in
+                    configuration.globall.config_block] == [
+                'maxconn', 'daemon']
+            assert [backend.name for backend in configuration.backends] == [
+                'b']
+            assert configuration.backend('b').config_block[0].lineno == 9
+
+    def test_recover_without_errors(self):
+        configuration, errors = parse.Parser(
+            filestring=FILESTRING).build_configuration(recover=True)
+        assert errors == []
+        assert configuration.globall is not None
+
+
+class TestProfile(object):
+
+    def test_profile_counts_rules(self):
+        tree, report = pegnode.parse(FILESTRING, profile=True)
+        assert len(list(tree)) == len(list(pegnode.parse(FILESTRING)))
+        assert report['configuration']['calls'] == 1
+        server_count = len([
+            line for line in FILESTRING.split('\n')
+            if line.strip().startswith('server ')])
+        assert report['server_line']['nodes'] == server_count
+        for stats in report.values():
+            assert stats['calls'] == stats['hits'] + stats['misses']
+            assert stats['failures'] <= stats['calls']
+
+
+class TestRegistry(object):
+
+    def test_register_line_builder_and_renderer(self):
+
+        class Timeout(config.Config):
+            pass
+
+        class TimeoutParser(parse.Parser):
+            pass
+
+        class TimeoutRender(render.Render):
+            pass
+
+        def build_timeout(parser, node):
+            return Timeout(node.keyword.text, node.value.text)
+
+        def render_timeout(render, line):
+            return '    %s %s  # timeout\n' % (line.keyword, line.value)
+
+        TimeoutParser.register_line_builder(pegnode.ConfigLine, build_timeout)
+        TimeoutRender.register_line_renderer(Timeout, render_timeout)
+        configuration = TimeoutParser(
+            filestring=FILESTRING).build_configuration()
+        line = configuration.globall.config_block[0]
+        assert isinstance(line, Timeout)
+        assert '# timeout' in TimeoutRender(
+            configuration).render_configuration()
+        # the base classes keep their own registries
+        assert not isinstance(parse.Parser(
+            filestring=FILESTRING).build_configuration(
+        ).globall.config_block[0], Timeout)
+        assert render.Render.line_renderers.get(Timeout) is None
+        assert render.Render(configuration).render_configuration()
+        # the other engines don't build the lines from the peg-tree
+        parser = TimeoutParser(filestring=FILESTRING)
+        for kwargs in ({'engine': 'actions'}, {'engine': 'fast'},
+                       {'recover': True}):
+            try:
+                parser.build_configuration(**kwargs)
+            except Exception as e:
+                assert 'line builders' in str(e)
+            else:
+                assert False, 'Exception is not raised'
+
+    def test_workers_use_registered_line_builders(self):
+        try:
+            import concurrent.futures  # noqa
+        except ImportError:
+            raise unittest.SkipTest('concurrent.futures is not available')
+        configuration = WorkerParser(
+            filestring=FILESTRING).build_configuration(workers=2)
+        lines = [line for backend in configuration.backends
+                 for line in backend.config_block]
+        assert [line for line in lines if isinstance(line, WorkerConfig)]
+        assert not [line for line in lines
+                    if type(line) in (config.Config, config.Option)]
+
+
+class TestLazyImport(object):
+
+    def test_grammar_is_not_imported_by_cached_build(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            parse.Parser(filestring=FILESTRING,
+                         cache_dir=cache_dir).build_configuration()
+            # a new interpreter, in which the grammar is not imported yet
+            process = subprocess.Popen([
+                sys.executable, '-c',
+                'import sys\n'
+                'import pyhaproxy.parse as parse\n'
+                'print("pyhaproxy.pegnode" in sys.modules)\n'
+                'parse.Parser(filestring=sys.stdin.read(), cache_dir=%r)'
+                '.build_configuration()\n'
+                'print("pyhaproxy.pegnode" in sys.modules)\n' % cache_dir,
+            ], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                cwd=os.path.dirname(
+                    os.path.dirname(os.path.abspath(parse.__file__))))
+            output, _ = process.communicate(FILESTRING.encode('utf-8'))
+            assert process.returncode == 0
+            assert output.split() == [b'False', b'False']
+        finally:
+            shutil.rmtree(cache_dir)
+
+
+class TestConfigurationIndex(object):
+
+    def setup(self):
+        self.configuration = parse.Parser(
+            filestring=FILESTRING).build_configuration()
+
+    def test_add_and_remove_backend(self):
+        backend = config.Backend('new_backend', [])
+        self.configuration.add_backend(backend)
+        assert self.configuration.backend('new_backend') is backend
+        assert self.configuration.backends[-1] is backend
+        self.configuration.remove_backend('new_backend')
+        assert self.configuration.backend('new_backend') is None
+        assert backend not in self.configuration.backends
+        try:
+            self.configuration.add_backend(config.Frontend('f', '', '', []))
+        except Exception:
+            pass
+        else:
+            raise AssertionError('only config.Backend can be added')
+
+    def test_rename(self):
+        backend = self.configuration.backends[0]
+        old_name = backend.name
+        backend.name = 'renamed_backend'
+        assert self.configuration.backend('renamed_backend') is backend
+        assert self.configuration.backend(old_name) is None
+
+    def test_first_of_the_same_name(self):
+        first = config.Frontend('twin', '*', '80', [])
+        second = config.Frontend('twin', '*', '81', [])
+        self.configuration.add_frontend(first)
+        self.configuration.add_frontend(second)
+        assert self.configuration.frontend('twin') is first
+        self.configuration.remove_frontend('twin')
+        assert self.configuration.frontend('twin') is second
+
+    def test_lists_changed_in_place(self):
+        userlist = config.Userlist('appended_userlist', [])
+        self.configuration.userlists.append(userlist)
+        assert self.configuration.userlist('appended_userlist') is userlist
+        replaced = self.configuration.userlists[0]
+        self.configuration.userlists[0] = config.Userlist('L9', [])
+        assert self.configuration.userlist('L9') is not None
+        assert self.configuration.userlist(replaced.name) is None
+
+    def test_lists_changed_in_place_at_the_same_length(self):
+        backends = self.configuration.backends
+        removed = backends[0]
+        assert self.configuration.backend(removed.name) is removed
+        backends.pop(0)
+        backend = config.Backend('appended_backend', [])
+        backends.append(backend)
+        assert self.configuration.backend(removed.name) is None
+        assert self.configuration.backend('appended_backend') is backend
+        backends[-1] = removed
+        assert self.configuration.backend(removed.name) is removed
+        assert self.configuration.backend('appended_backend') is None
+        configuration = pickle.loads(
+            pickle.dumps(self.configuration, pickle.HIGHEST_PROTOCOL))
+        configuration.backends.reverse()
+        configuration.backends[0] = backend
+        assert configuration.backend('appended_backend') is not None
+        assert configuration.backend(removed.name) is None
+
+
+class TestConfigBlockIndex(object):
+
+    def setup(self):
+        self.frontend = parse.Parser(
+            filestring=FILESTRING).build_configuration().frontend('secured')
+
+    def test_lookups_follow_add_and_remove(self):
+        acl_count = len(self.frontend.acls())
+        self.frontend.add_acl(config.Acl('host_new', 'hdr(host) -i new.com'))
+        assert self.frontend.acl('host_new').value == 'hdr(host) -i new.com'
+        assert len(self.frontend.acls()) == acl_count + 1
+        self.frontend.remove_acl('host_new')
+        assert self.frontend.acl('host_new') is None
+        assert len(self.frontend.acls()) == acl_count
+        bind = self.frontend.binds()[0]
+        assert self.frontend.bind(bind.host, bind.port) is bind
+
+    def test_lookups_follow_direct_list_edits(self):
+        config_block = self.frontend.config_block
+        assert self.frontend.acl('host_www2') is not None
+        position = config_block.index(self.frontend.acl('host_www2'))
+        config_block[position] = config.Acl('host_www3', 'hdr_beg(host) -i')
+        assert self.frontend.acl('host_www2') is None
+        assert self.frontend.acl('host_www3') is config_block[position]
+        del config_block[position]
+        assert self.frontend.acl('host_www3') is None
+        config_block.insert(0, config.Acl('host_first', 'path_beg /first/'))
+        assert self.frontend.acls()[0].name == 'host_first'
+
+    def test_key_changed_in_place(self):
+        acl = self.frontend.acl('host_www2')
+        acl.name = 'host_www4'
+        assert self.frontend.acl('host_www2') is None
+        self.frontend.config_block.reindex()
+        assert self.frontend.acl('host_www4') is acl
+
+    def test_typed_lines_keep_order(self):
+        config_block = config.ConfigBlock([
+            config.Config('maxconn', '10'), config.Option('httplog', ''),
+            config.Config('daemon', '')])
+        section = config.Global(config_block)
+        assert [line.keyword for line in section.configs()] == [
+            'maxconn', 'daemon']
+        section.add_config(config.Config('nbproc', '2'))
+        assert section.configs()[-1].keyword == 'nbproc'
+        assert section.config('nbproc', '2') is section.configs()[-1]
+
+    def test_remove_repeated_line(self):
+        first = config.Acl('host_dup', 'hdr(host) -i first.com')
+        second = config.Acl('host_dup', 'hdr(host) -i second.com')
+        config_block = config.ConfigBlock([first, second])
+        section = config.Frontend('f', '*', '80', config_block)
+        assert section.acl('host_dup') is first
+        config_block.append(first)
+        # the last occurrence goes, the first one is still found first
+        config_block.pop()
+        assert section.acl('host_dup') is first
+        config_block.remove(first)
+        assert section.acl('host_dup') is second
+
+
+class TestConfigBlockRemoval(object):
+
+    def setup(self):
+        self.backend = config.Backend('b', [
+            config.Server('s%d' % index, '10.0.0.1', '80', ['check'])
+            for index in range(100)])
+
+    def test_remove_keeps_order(self):
+        for index in range(0, 100, 2):
+            self.backend.remove_server('s%d' % index)
+        assert [server.name for server in self.backend.servers()] == [
+            's%d' % index for index in range(1, 100, 2)]
+        assert self.backend.server('s2') is None
+        assert self.backend.server('s3').name == 's3'
+        assert 'server s3 ' in render.Render(config.Configuration()
+                                             ).render_backend(self.backend)
+
+    def test_remove_servers(self):
+        self.backend.add_server(config.Server('s5', '10.0.0.2', '80'))
+        self.backend.remove_servers(['s%d' % index for index in range(50)])
+        assert [server.name for server in self.backend.servers()] == [
+            's%d' % index for index in range(50, 100)] + ['s5']
+
+    def test_list_operations(self):
+        config_block = self.backend.config_block
+        last = config_block.pop()
+        assert last.name == 's99' and len(config_block) == 99
+        del config_block[0]
+        assert config_block[0].name == 's1'
+        config_block.insert(1, last)
+        assert config_block.index(last) == 1
+        assert [server.name for server in config_block[:3]] == [
+            's1', 's99', 's2']
+        for server in config_block:
+            config_block.remove(server)
+        assert not config_block
+
+    def test_lines_are_copied(self):
+        lines = [config.Server('s0', '10.0.0.1', '80')]
+        backend = config.Backend('copied', lines)
+        lines.append(config.Server('s1', '10.0.0.1', '80'))
+        assert backend.server('s1') is None
+        backend.config_block.append(lines[-1])
+        assert backend.server('s1') is lines[-1]
+        assert len(lines) == 2
+
+    def test_concatenation(self):
+        config_block = self.backend.config_block
+        servers = list(config_block)
+        extra = config.Server('extra', '10.0.0.2', '80')
+        assert config_block + [extra] == servers + [extra]
+        assert [extra] + config_block == [extra] + servers
+        assert type(config_block + config_block) is list
+        assert config_block * 2 == 2 * config_block == servers * 2
+        config_block *= 2
+        assert len(config_block) == 200
+        assert self.backend.server('s1') is servers[1]
+        try:
+            config_block + (extra,)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError('only a list is concatenated')
+
+
+class TestSlots(object):
+
+    def test_config_lines_have_no_dict(self):
+        configuration = parse.Parser(
+            filestring=FILESTRING).build_configuration()
+        sections = ([configuration.globall] + configuration.defaults +
+                    configuration.userlists + configuration.listens +
+                    configuration.frontends + configuration.backends)
+        line_types = set()
+        for section in sections:
+            for line in section.config_block:
+                assert not hasattr(line, '__dict__')
+                line_types.add(type(line))
+        assert len(line_types) == 8
+
+    def test_pickle(self):
+        server = config.Server('s1', '10.0.0.1', '80', ['check'], lineno=3)
+        server = pickle.loads(pickle.dumps(server, pickle.HIGHEST_PROTOCOL))
+        assert (server.name, server.host, server.port, server.attributes,
+                server.lineno) == ('s1', '10.0.0.1', '80', ['check'], 3)
+
+
+class TestSharedAttributes(object):
+
+    def test_equal_attributes_are_shared(self):
+        configuration = parse.Parser(filestring=(
+            'backend b\n'
+            '    server s1 10.0.0.1:80 check inter 2000\n'
+            '    server s2 10.0.0.2:80 check inter 2000\n'
+        )).build_configuration(engine='fast')
+        s1, s2 = configuration.backend('b').servers()
+        assert s1._attributes is s2._attributes
+        assert s1.attributes == s2.attributes == ['check inter 2000']
+
+    def test_copy_on_write(self):
+        s1 = config.Server('s1', '10.0.0.1', '80', ['check', 'backup '])
+        s2 = config.Server('s2', '10.0.0.2', '80', ['check', 'backup'])
+        assert s1._attributes is s2._attributes
+        s1.attributes.append('weight 3')
+        assert s1.attributes == ['check', 'backup', 'weight 3']
+        assert s2.attributes == ['check', 'backup']
+        del s1.attributes[0]
+        s1.attributes[0] = 'disabled'
+        assert list(s1.attributes) == ['disabled', 'weight 3']
+        s2.attributes = ['maxconn 10']
+        assert repr(s2.attributes) == repr(['maxconn 10'])
+
+    def test_list_api(self):
+        s1 = config.Server('s1', '10.0.0.1', '80', ['check', 'backup'])
+        s2 = config.Server('s2', '10.0.0.2', '80', ['check', 'backup'])
+        assert s1.attributes + ['weight 3'] == ['check', 'backup', 'weight 3']
+        assert ['weight 3'] + s1.attributes == ['weight 3', 'check', 'backup']
+        assert json.dumps(s1.attributes) == '["check", "backup"]'
+        copied = copy.copy(s1.attributes)
+        assert type(copied) is list and copied == ['check', 'backup']
+        copied.append('weight 3')
+        assert type(copy.deepcopy(s1.attributes)) is list
+        assert s1.attributes == ['check', 'backup']
+        attributes = s1.attributes
+        attributes.sort()
+        attributes += ['weight 3']
+        assert s1.attributes == ['backup', 'check', 'weight 3']
+        assert s2.attributes == ['check', 'backup']
+        s1.attributes.reverse()
+        s1.attributes[1:] = ['disabled']
+        assert s1.attributes == ['weight 3', 'disabled']
+        s1.attributes.clear()
+        assert s1.attributes == []
+
+    def test_changes_are_not_kept_for_sharing(self):
+        server = config.Server('s1', '10.0.0.1', '80', ['check'])
+        shared_count = len(config._shared_attributes)
+        for index in range(10):
+            server.attributes.append('weight %d' % index)
+        assert len(config._shared_attributes) == shared_count
+        # equal to kept attributes, they're shared again
+        other = config.Server('s2', '10.0.0.2', '80', ['check'])
+        server.attributes[:] = ['check']
+        assert server._attributes is other._attributes
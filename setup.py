@@ -6,7 +6,10 @@ setup(
     keywords=('haproxy', 'parse'),
     description='A Python library to parse haproxy configuration file',
     license='MIT License',
-    install_requires=[],
+    install_requires=[
+        # concurrent.futures of `build_configuration(workers=N)`
+        'futures; python_version < "3"',
+    ],
 
     include_package_data=True,
     package_data={